@@ -1,37 +1,74 @@
 from typing import List
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 
 from app.schemas.predictions import (
     BacktestMetricSchema,
     CandidateDetailSchema,
     PredictionSchema,
     ProvenanceResponse,
+    ScoreRequest,
+    ScoreResponse,
 )
-from app.services.prediction_service import PredictionService
+from app.services.prediction_service import MAX_SHORTLIST_LIMIT, SHORTLIST_LIMIT, PredictionService
+from app.services.shortlist_store import shortlist_store
 
 router = APIRouter()
 service = PredictionService()
 
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
 @router.get("/shortlist", response_model=List[PredictionSchema])
-def shortlist(field: str = Query(...), horizon: str = Query("one_year")):
-    return service.get_shortlist(field=field, horizon=horizon)
+async def shortlist(
+    response: Response,
+    field: str = Query(...),
+    horizon: str = Query("one_year"),
+    limit: int = Query(SHORTLIST_LIMIT, ge=1, le=MAX_SHORTLIST_LIMIT),
+    cursor: str | None = Query(None),
+    if_none_match: str | None = Header(None),
+):
+    """Rank a field's candidates; the cursor for the next page is returned in ``X-Next-Cursor``."""
+    published = None
+    if limit == SHORTLIST_LIMIT and cursor is None:
+        published = await shortlist_store.get_async(field, horizon)
+    if published is None:
+        try:
+            page = await service.get_shortlist_async(field=field, horizon=horizon, limit=limit, cursor=cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        if page.next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+        return page.items
+
+    headers = {"ETag": f'"{published.version}"'}
+    if published.next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = published.next_cursor
+    if if_none_match is not None and headers["ETag"] in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+    return Response(content=published.payload, media_type="application/json", headers=headers)
 
 
 @router.get("/candidates/{candidate_id}", response_model=CandidateDetailSchema)
-def candidate_detail(candidate_id: int):
-    detail = service.get_candidate_detail(candidate_id)
+async def candidate_detail(candidate_id: int):
+    detail = await service.get_candidate_detail_async(candidate_id)
     if not detail:
         raise HTTPException(status_code=404, detail="Candidate not found")
     return detail
 
 
 @router.get("/backtests", response_model=List[BacktestMetricSchema])
-def backtests(field: str | None = None):
-    return service.get_backtests(field=field)
+async def backtests(field: str | None = None):
+    return await service.get_backtests_async(field=field)
 
 
 @router.get("/provenance/{candidate_id}", response_model=ProvenanceResponse)
-def provenance(candidate_id: int):
-    return service.get_provenance(candidate_id)
+async def provenance(candidate_id: int):
+    return await service.get_provenance_async(candidate_id)
+
+
+@router.post("/score", response_model=ScoreResponse)
+async def score(request: ScoreRequest):
+    """Score a batch of what-if feature rows with a field's current model."""
+    return await service.score_async(field=request.field, rows=request.rows)
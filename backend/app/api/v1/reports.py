@@ -1,18 +1,37 @@
+from urllib.parse import quote
+
 from fastapi import APIRouter
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 
-from app.reports.generators import generate_csv_report, generate_pdf_report
+from app.core.concurrency import iterate_blocking, run_blocking
+from app.reports.generators import report_artifact, stream_csv_report, write_pdf_report
 
 router = APIRouter()
 
 
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
 @router.get("/shortlist.csv")
-def shortlist_csv(field: str, horizon: str = "one_year"):
-    file_path = generate_csv_report(field=field, horizon=horizon)
-    return FileResponse(path=file_path, media_type="text/csv", filename=file_path.name)
+async def shortlist_csv(field: str, horizon: str = "one_year"):
+    """Serve the cached CSV for the live version, or stream it from the cursor while caching it."""
+    artifact = await run_blocking(report_artifact, field, horizon, "csv")
+    if artifact.cached:
+        return FileResponse(path=artifact.path, media_type=artifact.media_type, filename=artifact.filename)
+    return StreamingResponse(
+        iterate_blocking(stream_csv_report(artifact)),
+        media_type=artifact.media_type,
+        headers={"Content-Disposition": _content_disposition(artifact.filename)},
+    )
 
 
 @router.get("/shortlist.pdf")
-def shortlist_pdf(field: str, horizon: str = "one_year"):
-    file_path = generate_pdf_report(field=field, horizon=horizon)
-    return FileResponse(path=file_path, media_type="application/pdf", filename=file_path.name)
+async def shortlist_pdf(field: str, horizon: str = "one_year"):
+    artifact = await run_blocking(report_artifact, field, horizon, "pdf")
+    if not artifact.cached:
+        await run_blocking(write_pdf_report, artifact)
+    return FileResponse(path=artifact.path, media_type=artifact.media_type, filename=artifact.filename)
@@ -1,6 +1,6 @@
-from typing import Dict, TypedDict
+from typing import Any, Dict, List, Optional, TypedDict
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query, status
 
 from app.services.training_service import TrainingService
 
@@ -8,24 +8,84 @@ router = APIRouter()
 service = TrainingService()
 
 
-class ModelTrainingDetails(TypedDict):
-    model_paths: Dict[str, str]
-    prediction_count: int
-    run_id: str
+class JobAccepted(TypedDict):
+    job_id: str
+    status: str
+    deduplicated: bool
 
 
-class TrainModelResponse(TypedDict):
+class TrainingJobSummary(TypedDict):
+    job_id: str
+    kind: str
+    params: Dict[str, Any]
     status: str
-    details: ModelTrainingDetails
+    progress: Dict[str, Dict[str, Any]]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    created_at: str
+    started_at: Optional[str]
+    finished_at: Optional[str]
+    queued_seconds: Optional[float]
+    run_seconds: Optional[float]
+
+
+class TaskRunSummary(TypedDict):
+    task_run_id: str
+    task_name: str
+    parent_task_run_id: Optional[str]
+    started_at: str
+    inputs: Dict[str, Any]
+    output: Any
+    wall_seconds: float
+    cpu_seconds: float
+    peak_memory_bytes: Optional[int]
+    cached: bool
+    state: str
+    error: Optional[str]
+
+
+class FlowRunSummary(TypedDict, total=False):
+    run_id: str
+    flow_name: str
+    started_at: str
+    finished_at: str
+    state: str
+    error: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_memory_bytes: Optional[int]
+    tasks: List[TaskRunSummary]
+
+
+def _accepted(job: dict, deduplicated: bool) -> JobAccepted:
+    return {"job_id": job["job_id"], "status": job["status"], "deduplicated": deduplicated}
+
+
+@router.post("/etl", status_code=status.HTTP_202_ACCEPTED)
+def run_etl() -> JobAccepted:
+    return _accepted(*service.enqueue_etl())
+
+
+@router.post("/model", status_code=status.HTTP_202_ACCEPTED)
+def train_model(force: bool = False) -> JobAccepted:
+    return _accepted(*service.enqueue_training(force=force))
+
+
+@router.post("/backtest", status_code=status.HTTP_202_ACCEPTED)
+def run_backtest() -> JobAccepted:
+    return _accepted(*service.enqueue_backtest())
 
 
-@router.post("/etl")
-def run_etl() -> dict[str, str]:
-    run_id = service.run_etl()
-    return {"status": "completed", "run_id": run_id}
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str) -> TrainingJobSummary:
+    job = service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Training job not found")
+    return job
 
 
-@router.post("/model")
-def train_model() -> TrainModelResponse:
-    model_info = service.train_models()
-    return {"status": "trained", "details": model_info}
+@router.get("/runs")
+def list_runs(
+    limit: int = Query(20, ge=1, le=200), flow_name: Optional[str] = None
+) -> List[FlowRunSummary]:
+    return service.list_runs(limit=limit, flow_name=flow_name)
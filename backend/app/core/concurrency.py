@@ -0,0 +1,70 @@
+"""Bounded executor for blocking work called from async routes.
+
+Report rendering and file reads run here instead of on the event loop or
+Starlette's shared thread pool, so a burst of slow exports can occupy at most
+``blocking_executor_workers`` threads while shortlist requests keep flowing.
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, TypeVar
+
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_settings().blocking_executor_workers, thread_name_prefix="blocking"
+            )
+        return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``func`` on the bounded executor and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), partial(func, *args, **kwargs))
+
+
+async def iterate_blocking(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """Yield from a blocking iterator, advancing it one item at a time on the bounded executor.
+
+    If the consumer stops early (a client disconnecting from a stream), the
+    iterator is closed on the executor once any step still running there has
+    finished, so generator cleanup never runs on the event loop.
+    """
+    executor = _get_executor()
+    exhausted = object()
+    step = None
+    try:
+        while True:
+            step = executor.submit(next, iterator, exhausted)
+            item = await asyncio.wrap_future(step)
+            if item is exhausted:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            if step is not None and not step.done():
+                step.add_done_callback(lambda _: executor.submit(close))
+            else:
+                executor.submit(close)
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -1,6 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseSettings, Field
 
@@ -11,8 +11,40 @@ class Settings(BaseSettings):
     database_url: str = Field(
         default_factory=lambda: f"sqlite:///{Path(__file__).resolve().parents[2] / 'storage' / 'nobel.db'}"
     )
+    storage_profile: str = "tuned"
+    sqlite_busy_timeout_ms: int = 5_000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64_000  # negative values are KiB: 64 MB per connection
+    read_pool_size: int = 8
+    # Serve reads through aiosqlite.  Its per-call thread hops cost more than
+    # running the sync query on the blocking executor, so it is off by default.
+    async_reads_enabled: bool = False
+    blocking_executor_workers: int = 8
     data_dir: Path = Field(default_factory=lambda: Path(__file__).resolve().parents[2] / "storage" / "data")
     model_dir: Path = Field(default_factory=lambda: Path(__file__).resolve().parents[2] / "storage" / "models")
+    staging_format: str = "columnar"
+    task_cache_enabled: bool = True
+    task_cache_dir: Path = Field(
+        default_factory=lambda: Path(__file__).resolve().parents[2] / "storage" / "cache" / "tasks"
+    )
+    task_cache_max_bytes: int = 512 * 1024 * 1024
+    # "sequential", "thread" or "process".  The ETL mostly waits on files and the
+    # database, so threads suit it; per-field training is pure-Python gradient
+    # descent, which only runs in parallel across processes.
+    etl_task_runner: str = "thread"
+    training_task_runner: str = "process"
+    backtest_task_runner: str = "process"
+    task_runner_max_workers: Optional[int] = None
+    run_log_enabled: bool = True
+    run_log_path: Path = Field(
+        default_factory=lambda: Path(__file__).resolve().parents[2] / "storage" / "runs" / "flow_runs.jsonl"
+    )
+    run_log_max_bytes: int = 16 * 1024 * 1024
+    # tracemalloc slows every allocation in a traced flow; enable it when profiling.
+    run_log_trace_memory: bool = False
+    prediction_horizons: List[str] = Field(default_factory=lambda: ["one_year", "three_year", "five_year"])
+    job_worker_enabled: bool = True
+    job_poll_interval_seconds: float = 2.0
 
     class Config:
         env_file = ".env"
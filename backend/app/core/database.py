@@ -1,14 +1,124 @@
-from contextlib import contextmanager
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Optional
+from weakref import WeakKeyDictionary
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 
 settings = get_settings()
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
+
+
+def sqlite_pragmas(settings: Settings, read_only: bool = False) -> dict[str, str]:
+    """Return the PRAGMAs applied to each new SQLite connection for the configured storage profile.
+
+    The ``tuned`` profile runs the database in WAL mode, so readers keep
+    serving the last committed snapshot while a writer is active, and trades
+    fsyncs per commit (``synchronous=NORMAL``) for throughput.  ``default``
+    leaves SQLite's own settings untouched apart from the busy timeout.
+    """
+    pragmas = {"busy_timeout": str(settings.sqlite_busy_timeout_ms)}
+    if settings.storage_profile == "default":
+        return pragmas
+    if settings.storage_profile != "tuned":
+        raise ValueError(f"Unknown storage profile {settings.storage_profile!r}; expected 'tuned' or 'default'")
+    pragmas.update(
+        mmap_size=str(settings.sqlite_mmap_size),
+        cache_size=str(settings.sqlite_cache_size),
+        temp_store="MEMORY",
+    )
+    if read_only:
+        pragmas["query_only"] = "ON"
+    else:
+        # journal_mode is persistent in the database file, so only the writer sets it.
+        pragmas.update(journal_mode="WAL", synchronous="NORMAL")
+    return pragmas
+
+
+def build_engine(database_url: str, settings: Settings = settings, read_only: bool = False) -> Engine:
+    """Create an engine; SQLite connections get the storage profile's PRAGMAs on connect.
+
+    ``read_only`` opens file databases with ``mode=ro`` so the pool can never
+    write, and sizes it with ``read_pool_size``.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return create_engine(url)
+
+    options = {}
+    if read_only and not _is_in_memory(url):
+        url = _read_only_url(url)
+        options.update(pool_size=settings.read_pool_size, max_overflow=settings.read_pool_size)
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **options)
+    _apply_pragmas_on_connect(engine, sqlite_pragmas(settings, read_only=read_only), _is_in_memory(url))
+    return engine
+
+
+def build_async_read_engine(database_url: str, settings: Settings = settings) -> Optional[AsyncEngine]:
+    """Create a read-only ``aiosqlite`` engine for SQLite files, or ``None`` where none is used.
+
+    The engine is only built when ``async_reads_enabled`` is set.  Other
+    databases (and in-memory SQLite, which is private to one connection) have
+    no async driver configured; without an engine, async callers run the sync
+    engine on the blocking executor.
+    """
+    url = make_url(database_url)
+    if not settings.async_reads_enabled or url.get_backend_name() != "sqlite" or _is_in_memory(url):
+        return None
+    url = _read_only_url(url).set(drivername="sqlite+aiosqlite")
+    engine = create_async_engine(
+        url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.read_pool_size,
+        max_overflow=settings.read_pool_size,
+    )
+    _apply_pragmas_on_connect(engine.sync_engine, sqlite_pragmas(settings, read_only=True), in_memory=False)
+    return engine
+
+
+def _is_in_memory(url: URL) -> bool:
+    return url.database in (None, "", ":memory:")
+
+
+def _read_only_url(url: URL) -> URL:
+    return url.set(database=f"file:{url.database}", query={**url.query, "mode": "ro", "uri": "true"})
+
+
+def _apply_pragmas_on_connect(engine: Engine, pragmas: dict[str, str], in_memory: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                if name == "journal_mode" and in_memory:
+                    continue
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+engine = build_engine(settings.database_url)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+# In-memory SQLite databases are private to their connection, so reads share the writer there.
+_in_memory = _is_in_memory(make_url(settings.database_url))
+read_engine = engine if _in_memory else build_engine(settings.database_url, read_only=True)
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False)
+
+async_read_engine = build_async_read_engine(settings.database_url)
+AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine) if async_read_engine is not None else None
+
 
 @contextmanager
 def db_session():
@@ -21,3 +131,43 @@ def db_session():
         raise
     finally:
         session.close()
+
+
+@contextmanager
+def db_read_session():
+    """Session on the read-only pool; it sees the last committed snapshot and never commits."""
+    session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+_read_gates: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = WeakKeyDictionary()
+
+
+def _read_gate() -> asyncio.Semaphore:
+    """FIFO gate sized to the async pool, so waiters queue in arrival order instead of contending in the pool."""
+    loop = asyncio.get_running_loop()
+    gate = _read_gates.get(loop)
+    if gate is None:
+        gate = _read_gates[loop] = asyncio.Semaphore(2 * settings.read_pool_size)
+    return gate
+
+
+@asynccontextmanager
+async def async_db_read_connection() -> AsyncIterator[AsyncConnection]:
+    """Core connection on the async read-only pool; requires ``async_read_engine``."""
+    if async_read_engine is None:
+        raise RuntimeError("No async driver is configured for this database")
+    async with _read_gate(), async_read_engine.connect() as connection:
+        yield connection
+
+
+@asynccontextmanager
+async def async_db_read_session() -> AsyncIterator[AsyncSession]:
+    """Async counterpart of :func:`db_read_session`; requires ``async_read_engine``."""
+    if AsyncReadSessionLocal is None:
+        raise RuntimeError("No async driver is configured for this database")
+    async with _read_gate(), AsyncReadSessionLocal() as session:
+        yield session
@@ -0,0 +1,163 @@
+"""Rolling-origin backtest of the field models on historical feature snapshots.
+
+For every held-out year ``T``, each field's model is fitted on the snapshots
+taken before ``T``, whose outcomes were known by then, and scored on the
+snapshots as of ``T``.  A snapshot is a positive when the candidate won in its
+``as_of_year``; snapshots taken after a candidate's award are left out.
+
+Years are independent, so they are mapped across the configured task runner
+(worker processes by default), each receiving only the history up to its
+year.  The per-year metrics replace the ``backtest_metrics`` table in one
+transaction, and ``GET /predictions/backtests`` aggregates them per field.
+"""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import groupby
+from typing import List
+
+from sqlalchemy import Select, and_, delete, insert, or_, select
+
+from app.core.config import get_settings
+from app.core.database import db_read_session, db_session
+from app.flows.modeling import FEATURE_COLUMNS
+from app.flows.progress import ProgressCallback, no_progress
+from app.models.nobel import BacktestMetric, Candidate, FeatureSnapshot
+from app.services.evaluation import ranking_metrics
+from app.services.model_engine import CompiledScorer, TrainingConfig, fit_logistic_regression
+from app.utils.prefect_compat import flow, task, task_runner_for
+
+settings = get_settings()
+
+BACKTEST_TOP_K = 10
+# A field's history is a few thousand rows at most; small batches take several
+# steps per epoch, so a fit converges in tens of epochs rather than running all of them.
+BACKTEST_TRAINING = TrainingConfig(batch_size=256)
+
+
+@dataclass
+class FieldHistory:
+    """A field's eligible snapshots, column-wise and sorted by ``as_of_year``."""
+
+    field: str
+    years: array
+    labels: array
+    features: dict[str, array]
+
+    def until(self, year: int) -> "FieldHistory":
+        """The snapshots taken in ``year`` or earlier."""
+        end = bisect_right(self.years, year)
+        return FieldHistory(
+            field=self.field,
+            years=self.years[:end],
+            labels=self.labels[:end],
+            features={name: column[:end] for name, column in self.features.items()},
+        )
+
+
+def history_statement() -> Select:
+    """Snapshots with a known outcome: never-awarded candidates, and laureates up to their award year."""
+    return (
+        select(
+            Candidate.field,
+            FeatureSnapshot.as_of_year,
+            Candidate.laureate_year,
+            *(getattr(FeatureSnapshot, name) for name in FEATURE_COLUMNS),
+        )
+        .join(Candidate, Candidate.id == FeatureSnapshot.candidate_id)
+        .where(
+            or_(
+                and_(Candidate.laureate_year.is_(None), Candidate.is_laureate.is_(False)),
+                Candidate.laureate_year >= FeatureSnapshot.as_of_year,
+            )
+        )
+        .order_by(Candidate.field, FeatureSnapshot.as_of_year)
+    )
+
+
+@task
+def load_history() -> List[FieldHistory]:
+    histories = []
+    with db_read_session() as session:
+        for field, rows in groupby(session.execute(history_statement()), key=lambda row: row.field):
+            rows = list(rows)
+            histories.append(
+                FieldHistory(
+                    field=field,
+                    years=array("l", (row.as_of_year for row in rows)),
+                    labels=array("d", (row.laureate_year == row.as_of_year for row in rows)),
+                    features={name: array("d", (getattr(row, name) for row in rows)) for name in FEATURE_COLUMNS},
+                )
+            )
+    return histories
+
+
+@task
+def backtest_year(year: int, histories: List[FieldHistory]) -> List[dict]:
+    """Fit every field on the years before ``year`` and evaluate on ``year``; fields lacking either are skipped."""
+    results = []
+    for history in histories:
+        start = bisect_left(history.years, year)
+        if start == 0 or start == len(history.years):
+            continue
+        model = fit_logistic_regression(
+            {name: column[:start] for name, column in history.features.items()},
+            history.labels[:start],
+            BACKTEST_TRAINING,
+        )
+        probabilities = CompiledScorer(model.to_dict()).score(
+            {name: column[start:] for name, column in history.features.items()}
+        )
+        metrics = ranking_metrics(probabilities, history.labels[start:], k=BACKTEST_TOP_K)
+        results.append(
+            {
+                "field": history.field,
+                "as_of_year": year,
+                "training_rows": start,
+                "candidate_count": metrics.candidate_count,
+                "laureate_count": metrics.laureate_count,
+                "hits_at_10": metrics.hits_at_k,
+                "average_precision": metrics.average_precision,
+                "brier_score": metrics.brier_score,
+            }
+        )
+    return results
+
+
+@task
+def persist_backtest_metrics(rows: List[dict]) -> int:
+    """Replace every stored backtest metric in a single transaction."""
+    computed_at = datetime.utcnow()
+    with db_session() as session:
+        session.execute(delete(BacktestMetric))
+        if rows:
+            session.execute(insert(BacktestMetric), [{**row, "computed_at": computed_at} for row in rows])
+    return len(rows)
+
+
+@flow(
+    name="rolling_backtest",
+    task_runner=lambda: task_runner_for(settings.backtest_task_runner, settings.task_runner_max_workers),
+)
+def run_backtest(progress: ProgressCallback = no_progress) -> dict:
+    """Backtest every held-out year in parallel and store the per-year metrics.
+
+    ``progress`` is told how many years were evaluated for each field.
+    """
+    histories = load_history()
+    # The earliest year has no history to train on.
+    years = sorted({year for history in histories for year in history.years})[1:]
+    futures = backtest_year.map(years, [[history.until(year) for history in histories] for year in years])
+    rows = [row for future in futures for row in future.result()]
+    persist_backtest_metrics(rows)
+
+    for history in histories:
+        progress(history.field, "backtested", years=sum(row["field"] == history.field for row in rows))
+    return {
+        "years_covered": [years[0], years[-1]] if years else None,
+        "metric_rows": len(rows),
+        "run_id": f"backtest-{datetime.utcnow().isoformat()}",
+    }
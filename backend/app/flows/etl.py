@@ -1,17 +1,35 @@
 import json
-from datetime import datetime
+import logging
+import time
+from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List
 
 import pandas as pd
-from app.utils.prefect_compat import flow, task
+from sqlalchemy import Select, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.utils.prefect_compat import flow, task, task_input_hash, task_runner_for
 
 from app.core.config import get_settings
 from app.core.database import db_session
+from app.flows.modeling import publish_shortlist_artifacts
+from app.flows.progress import ProgressCallback, no_progress
 from app.models.nobel import Candidate, FeatureSnapshot
 from app.services.data_quality import validate_feature_table
+from app.services.provenance import replace_provenance
+from app.services.shortlist_store import current_version, record_data_version
+from app.services.staging import feature_table_path, write_feature_table
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+UPSERT_BATCH_SIZE = 5_000
+CANDIDATE_COLUMNS = ("full_name", "field", "affiliation", "country", "headshot_url", "is_laureate", "laureate_year")
+SNAPSHOT_COLUMNS = ("total_citations", "h_index", "recent_trend", "seminal_score", "award_count")
+_UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+CACHE_EXPIRATION = timedelta(days=7)
 
 
 @task
@@ -19,54 +37,167 @@ def discover_candidate_seed_files(seed_dir: Path) -> List[Path]:
     return sorted(seed_dir.glob("*_candidates.json"))
 
 
-@task
+@task(cache_key_fn=task_input_hash, cache_expiration=CACHE_EXPIRATION)
 def load_seed_candidates(seed_path: Path) -> List[dict]:
     with seed_path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
 
+def _batched(records: List[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _candidate_values(record: dict) -> dict:
+    return {
+        "openalex_id": record["openalex_id"],
+        "full_name": record["full_name"],
+        "field": record["field"],
+        "affiliation": record["affiliation"],
+        "country": record.get("country"),
+        "headshot_url": record.get("headshot_url"),
+        "is_laureate": record.get("is_laureate", False),
+        "laureate_year": record.get("laureate_year"),
+    }
+
+
+def _snapshot_values(records: Iterable[dict], candidate_ids: dict[str, int]) -> List[dict]:
+    # Later records win when a batch repeats a (candidate, year) pair, matching the row-by-row path.
+    snapshots = {}
+    for record in records:
+        features = record["features"]
+        candidate_id = candidate_ids[record["openalex_id"]]
+        snapshots[(candidate_id, features["as_of_year"])] = {"candidate_id": candidate_id, **features}
+    return list(snapshots.values())
+
+
+def candidate_ids_statement(openalex_ids: Iterable[str]) -> Select:
+    return select(Candidate.openalex_id, Candidate.id).where(Candidate.openalex_id.in_(list(openalex_ids)))
+
+
+def snapshot_ids_statement(keys: Iterable[tuple[int, int]]) -> Select:
+    return select(FeatureSnapshot.id, FeatureSnapshot.candidate_id, FeatureSnapshot.as_of_year).where(
+        tuple_(FeatureSnapshot.candidate_id, FeatureSnapshot.as_of_year).in_(list(keys))
+    )
+
+
+def _upsert_on_conflict(session: Session, batch: List[dict]) -> None:
+    insert = _UPSERT_DIALECTS[session.get_bind().dialect.name]
+    candidates = {record["openalex_id"]: _candidate_values(record) for record in batch}
+    statement = insert(Candidate)
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[Candidate.openalex_id],
+            set_={column: statement.excluded[column] for column in CANDIDATE_COLUMNS},
+        ),
+        list(candidates.values()),
+    )
+    candidate_ids = dict(session.execute(candidate_ids_statement(candidates)).all())
+    statement = insert(FeatureSnapshot)
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[FeatureSnapshot.candidate_id, FeatureSnapshot.as_of_year],
+            set_={column: statement.excluded[column] for column in SNAPSHOT_COLUMNS},
+        ),
+        _snapshot_values(batch, candidate_ids),
+    )
+
+
+def _upsert_prefetched(session: Session, batch: List[dict]) -> None:
+    candidates = {record["openalex_id"]: _candidate_values(record) for record in batch}
+    candidate_ids = dict(session.execute(candidate_ids_statement(candidates)).all())
+    existing_candidates = [
+        {"id": candidate_ids[key], **values} for key, values in candidates.items() if key in candidate_ids
+    ]
+    new_keys = [key for key in candidates if key not in candidate_ids]
+    if existing_candidates:
+        session.execute(update(Candidate), existing_candidates)
+    if new_keys:
+        session.execute(Candidate.__table__.insert(), [candidates[key] for key in new_keys])
+        candidate_ids.update(session.execute(candidate_ids_statement(new_keys)).all())
+
+    snapshots = _snapshot_values(batch, candidate_ids)
+    snapshot_ids = {
+        (candidate_id, as_of_year): snapshot_id
+        for snapshot_id, candidate_id, as_of_year in session.execute(
+            snapshot_ids_statement((values["candidate_id"], values["as_of_year"]) for values in snapshots)
+        )
+    }
+    new_snapshots = []
+    existing_snapshots = []
+    for values in snapshots:
+        snapshot_id = snapshot_ids.get((values["candidate_id"], values["as_of_year"]))
+        if snapshot_id is None:
+            new_snapshots.append(values)
+        else:
+            existing_snapshots.append({"id": snapshot_id, **values})
+    if new_snapshots:
+        session.execute(FeatureSnapshot.__table__.insert(), new_snapshots)
+    if existing_snapshots:
+        session.execute(update(FeatureSnapshot), existing_snapshots)
+
+
+def _upsert_row_by_row(session: Session, records: List[dict]) -> None:
+    for record in records:
+        candidate = session.query(Candidate).filter_by(openalex_id=record["openalex_id"]).one_or_none()
+        if candidate is None:
+            candidate = Candidate(**_candidate_values(record))
+            session.add(candidate)
+            session.flush()
+        else:
+            for column in CANDIDATE_COLUMNS:
+                setattr(candidate, column, _candidate_values(record)[column])
+
+        features = record["features"]
+        snapshot = (
+            session.query(FeatureSnapshot)
+            .filter_by(candidate_id=candidate.id, as_of_year=features["as_of_year"])
+            .one_or_none()
+        )
+        if snapshot is None:
+            snapshot = FeatureSnapshot(candidate_id=candidate.id, **features)
+            session.add(snapshot)
+        else:
+            for column in SNAPSHOT_COLUMNS:
+                setattr(snapshot, column, features[column])
+        session.flush()
+
+
 @task
-def upsert_candidates(records: List[dict]) -> None:
+def upsert_candidates(records: List[dict], mode: str = "bulk") -> dict:
+    """Upsert candidates and their feature snapshots, returning throughput stats.
+
+    ``bulk`` (the default) works set-wise per batch: SQLite and PostgreSQL use
+    ``INSERT ... ON CONFLICT DO UPDATE`` with executemany, other databases
+    prefetch the batch's existing rows in one query per table and then bulk
+    insert/update.  ``row`` keeps the original one-record-at-a-time ORM path.
+    """
+    started = time.perf_counter()
     with db_session() as session:
-        for record in records:
-            candidate = session.query(Candidate).filter_by(openalex_id=record["openalex_id"]).one_or_none()
-            if candidate is None:
-                candidate = Candidate(
-                    openalex_id=record["openalex_id"],
-                    full_name=record["full_name"],
-                    field=record["field"],
-                    affiliation=record["affiliation"],
-                    country=record.get("country"),
-                    headshot_url=record.get("headshot_url"),
-                    is_laureate=record.get("is_laureate", False),
-                )
-                session.add(candidate)
-                session.flush()
-            else:
-                candidate.full_name = record["full_name"]
-                candidate.field = record["field"]
-                candidate.affiliation = record["affiliation"]
-                candidate.country = record.get("country")
-                candidate.headshot_url = record.get("headshot_url")
-                candidate.is_laureate = record.get("is_laureate", False)
-
-            features = record["features"]
-            snapshot = (
-                session.query(FeatureSnapshot)
-                .filter_by(candidate_id=candidate.id, as_of_year=features["as_of_year"])
-                .one_or_none()
+        if mode == "row":
+            _upsert_row_by_row(session, records)
+        elif mode == "bulk":
+            upsert_batch = (
+                _upsert_on_conflict if session.get_bind().dialect.name in _UPSERT_DIALECTS else _upsert_prefetched
             )
-            if snapshot is None:
-                snapshot = FeatureSnapshot(candidate_id=candidate.id, **features)
-                session.add(snapshot)
-            else:
-                snapshot.total_citations = features["total_citations"]
-                snapshot.h_index = features["h_index"]
-                snapshot.recent_trend = features["recent_trend"]
-                snapshot.seminal_score = features["seminal_score"]
-                snapshot.award_count = features["award_count"]
+            for batch in _batched(records, UPSERT_BATCH_SIZE):
+                upsert_batch(session, batch)
+        else:
+            raise ValueError(f"Unknown upsert mode: {mode!r}")
+    elapsed = time.perf_counter() - started
+    stats = {
+        "mode": mode,
+        "rows": len(records),
+        "seconds": round(elapsed, 6),
+        "rows_per_second": round(len(records) / elapsed, 1) if elapsed > 0 else float(len(records)),
+    }
+    logger.info("Upserted %(rows)d candidates in %(seconds).3fs (%(rows_per_second).0f rows/s, %(mode)s)", stats)
+    return stats
 
 
+# Not cached: writing the staged file is the task's effect, so it must run even
+# when the records are unchanged (the file may have been removed since).
 @task
 def persist_feature_table(records: List[dict], output_path: Path) -> Path:
     rows = []
@@ -78,44 +209,73 @@ def persist_feature_table(records: List[dict], output_path: Path) -> Path:
             **record["features"],
         }
         rows.append(entry)
-    df = pd.DataFrame(rows)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
-    return output_path
+    return write_feature_table(pd.DataFrame(rows), output_path)
+
+
+@task(cache_key_fn=task_input_hash, cache_expiration=CACHE_EXPIRATION)
+def run_data_quality(table_path: Path) -> dict:
+    return validate_feature_table(table_path)
+
+
+@task
+def load_provenance(provenance_path: Path) -> int:
+    with db_session() as session:
+        return replace_provenance(session, provenance_path)
 
 
 @task
-def run_data_quality(parquet_path: Path) -> dict:
-    return validate_feature_table(parquet_path)
+def stage_field(records: List[dict], output_path: Path) -> dict:
+    """Write one field's feature table and run its data quality checks."""
+    table_path = persist_feature_table(records, output_path)
+    return run_data_quality(table_path)
+
 
+@flow(name="seed_etl", task_runner=lambda: task_runner_for(settings.etl_task_runner, settings.task_runner_max_workers))
+def run_seed_etl(progress: ProgressCallback = no_progress) -> str:
+    """Load, stage and validate every field concurrently, then upsert all candidates once.
 
-@flow(name="seed_etl")
-def run_seed_etl() -> str:
+    The database is only written after every field has passed its checks, so a
+    failing field leaves the stored candidates untouched.  Feature provenance
+    is then reloaded from the seed directory, and a published shortlist is
+    republished so it shows the new candidate rows.  ``progress`` is told as
+    each field is staged and loaded.
+    """
     seed_dir = settings.data_dir / "seed"
     seed_files = discover_candidate_seed_files(seed_dir)
     if not seed_files:
         raise FileNotFoundError(f"No seed candidate files found in {seed_dir}")
 
-    processed_fields: List[str] = []
-    for seed_path in seed_files:
-        seed_records = load_seed_candidates(seed_path)
+    records_by_field: dict[str, List[dict]] = {}
+    for seed_path, loaded in zip(seed_files, load_seed_candidates.map(seed_files)):
+        seed_records = loaded.result()
         if not seed_records:
             continue
 
         field_name = seed_records[0]["field"]
         if any(record["field"] != field_name for record in seed_records):
             raise ValueError(f"Mixed fields detected in seed file {seed_path}")
+        records_by_field[field_name] = seed_records
 
-        upsert_candidates(seed_records)
-        field_slug = field_name.lower().replace(" ", "_")
-        table_path = persist_feature_table(
-            seed_records,
-            settings.data_dir / "staging" / f"{field_slug}_features.csv",
-        )
-        dq_result = run_data_quality(table_path)
-        if not dq_result["success"]:
+    staged = stage_field.map(
+        list(records_by_field.values()),
+        [feature_table_path(field_name.lower().replace(" ", "_")) for field_name in records_by_field],
+    )
+    for field_name, future in zip(records_by_field, staged):
+        if not future.result()["success"]:
             raise ValueError(f"Data quality checks failed for field {field_name}")
-        processed_fields.append(field_name)
+        progress(field_name, "staged")
+
+    upsert_candidates([record for records in records_by_field.values() for record in records])
+    provenance_path = seed_dir / "provenance.json"
+    if provenance_path.exists():
+        load_provenance(provenance_path)
+    record_data_version()
+    # Names, affiliations and laureate flags are part of the published pages.
+    if current_version() is not None:
+        publish_shortlist_artifacts()
+    processed_fields = list(records_by_field)
+    for field_name, records in records_by_field.items():
+        progress(field_name, "loaded", candidate_count=len(records))
 
     fields_fragment = ",".join(processed_fields)
     return f"seed-etl-{datetime.utcnow().isoformat()}::{fields_fragment}"
@@ -1,15 +1,28 @@
+import hashlib
+import inspect
 import json
-from datetime import datetime
+import os
+from array import array
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Any, Iterable, List, Optional, Sequence
 
-import numpy as np
 import pandas as pd
-from app.utils.prefect_compat import flow, task
+from sqlalchemy import Delete, delete, func, insert, select
+from sqlalchemy.orm import Session
+from app.utils.prefect_compat import TaskRunContext, flow, task, task_input_hash, task_runner_for
 
 from app.core.config import get_settings
-from app.core.database import db_session
+from app.core.database import db_read_session, db_session
+from app.flows.progress import ProgressCallback, no_progress
 from app.models.nobel import Candidate, Prediction, ShapAttribution
+from app.services import model_engine
+from app.services.model_engine import TrainingConfig, fit_logistic_regression
+from app.services.scoring import model_path, scorer_cache
+from app.services.shortlist_store import current_version, new_version, publish_shortlists
+from app.services.staging import FEATURE_TABLE_DTYPES, read_feature_table, staging_suffix
 
 settings = get_settings()
 
@@ -22,156 +35,337 @@ FEATURE_COLUMNS = [
     "award_count",
 ]
 
+PERSIST_BATCH_SIZE = 10_000
+# Bump when training or scoring changes so every field is retrained once.
+TRAINER_VERSION = "logistic-2"
+TRAINING_CONFIG = TrainingConfig()
+# Years covered by each horizon; training fits the one-year probability of a win.
+HORIZON_YEARS = {"one_year": 1, "three_year": 3, "five_year": 5}
+MANIFEST_PATH = settings.model_dir / "training_manifest.json"
+CACHE_EXPIRATION = timedelta(days=7)
+
 
 @task
 def discover_feature_tables(staging_dir: Path) -> List[Path]:
-    return sorted(staging_dir.glob("*_features.csv"))
+    return sorted(staging_dir.glob(f"*_features{staging_suffix()}"))
 
 
 @task
 def load_feature_table(path: Path) -> pd.DataFrame:
-    return pd.read_csv(path)
+    return read_feature_table(path, columns=list(FEATURE_TABLE_DTYPES))
 
 
-@task
-def train_baseline_model(df: pd.DataFrame) -> tuple[dict, pd.DataFrame]:
-    df = df.copy()
-    rng = np.random.default_rng(seed=42)
-    base_score = (
-        0.000012 * df["total_citations"]
-        + 0.002 * df["h_index"]
-        + 0.15 * df["recent_trend"]
-        + 0.08 * df["seminal_score"]
-        + 0.03 * df["award_count"]
-    )
-    noise = rng.normal(scale=0.05, size=len(df))
-    logits = base_score + noise
-    probabilities = 1 / (1 + np.exp(-logits))
-    df["probability_raw"] = probabilities
-    model = {
-        "coefficients": {
-            "total_citations": 0.000012,
-            "h_index": 0.002,
-            "recent_trend": 0.15,
-            "seminal_score": 0.08,
-            "award_count": 0.03,
-        },
-        "intercept": -0.5,
-    }
-    return model, df
+@lru_cache(maxsize=None)
+def _model_engine_digest() -> str:
+    return hashlib.sha256(inspect.getsource(model_engine).encode("utf-8")).hexdigest()[:16]
+
+
+def training_input_hash(context: TaskRunContext, parameters: dict[str, Any]) -> Optional[str]:
+    """Hash the training table together with what the fit depends on outside the task body.
+
+    The task key only covers the task's own source, so the trainer version, the
+    training config and the model engine's source are added here; changing any
+    of them refits instead of returning a model cached by the old trainer.
+    """
+    input_hash = task_input_hash(context, parameters)
+    if input_hash is None:
+        return None
+    trainer = json.dumps([TRAINER_VERSION, asdict(TRAINING_CONFIG), _model_engine_digest()], sort_keys=True)
+    return f"{input_hash}-{hashlib.sha256(trainer.encode('utf-8')).hexdigest()[:16]}"
+
+
+@task(cache_key_fn=training_input_hash, cache_expiration=CACHE_EXPIRATION)
+def train_logistic_model(df: pd.DataFrame) -> dict:
+    """Fit a logistic regression of ``is_laureate`` on the feature columns; returns the serialized model."""
+    columns = {feature: array("d", df[feature]) for feature in FEATURE_COLUMNS}
+    model = fit_logistic_regression(columns, array("d", df["is_laureate"]), TRAINING_CONFIG)
+    return model.to_dict()
 
 
 @task
 def persist_model(model: dict, path: Path) -> str:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
+    # Written aside and renamed, so the scoring API never parses a half-written model.
+    temporary = path.with_suffix(".json.tmp")
+    with temporary.open("w", encoding="utf-8") as f:
         json.dump(model, f)
+    os.replace(temporary, path)
     return str(path)
 
 
+@dataclass
+class FieldPredictions:
+    """One field's scored table, column-wise and row-aligned, ready for the bulk writer.
+
+    ``probabilities`` stacks one column per horizon; the feature values and
+    attributions are shared by every horizon.
+    """
+
+    field: str
+    year: int
+    openalex_ids: List[str]
+    probabilities: dict[str, array]
+    feature_values: dict[str, array]
+    attributions: dict[str, array]
+
+    def __len__(self) -> int:
+        return len(self.openalex_ids) * len(self.probabilities)
+
+
+def horizon_probabilities(one_year: array, horizons: Sequence[str]) -> dict[str, array]:
+    """Probability of a win within each horizon, ``1 - (1 - p) ** years``, from the one-year column."""
+    unknown = [horizon for horizon in horizons if horizon not in HORIZON_YEARS]
+    if unknown:
+        raise ValueError(f"Unknown prediction horizons {unknown}; expected some of {sorted(HORIZON_YEARS)}")
+    stacked: dict[str, array] = {}
+    for horizon in horizons:
+        years = HORIZON_YEARS[horizon]
+        stacked[horizon] = one_year if years == 1 else array("d", (1.0 - (1.0 - p) ** years for p in one_year))
+    return stacked
+
+
 @task
-def generate_predictions(model: dict, df: pd.DataFrame, horizon: str) -> List[dict]:
-    df = df.copy()
-    logits = np.full(len(df), model["intercept"])
-    for feature, coefficient in model["coefficients"].items():
-        if feature in df:
-            logits += coefficient * df[feature]
-    probabilities = 1 / (1 + np.exp(-logits))
-    df["probability"] = probabilities
-    df["horizon"] = horizon
-    df["year"] = datetime.utcnow().year
-    return df.to_dict(orient="records")
+def generate_predictions(field: str, model: dict, df: pd.DataFrame, horizons: Sequence[str]) -> FieldPredictions:
+    """Score and attribute every row of the field's table for every horizon in one pass over its features."""
+    scorer = scorer_cache.get(field, model)
+    values, probabilities, attributions = scorer.explain({feature: df[feature] for feature in scorer.features})
+    return FieldPredictions(
+        field=field,
+        year=datetime.utcnow().year,
+        openalex_ids=list(df["openalex_id"]),
+        probabilities=horizon_probabilities(probabilities, horizons),
+        feature_values=values,
+        attributions=attributions,
+    )
+
+
+def _insert_batches(
+    session: Session, predictions: Iterable[FieldPredictions], batch_size: int = PERSIST_BATCH_SIZE
+) -> dict[str, int]:
+    """Bulk insert predictions and their SHAP rows; returns the predictions written per field.
+
+    Prediction ids are allocated up front from the current maximum (the
+    surrounding transaction holds the write lock), so attribution rows can
+    reference them without a flush per prediction.  Rows go out through
+    executemany in batches of ``batch_size`` predictions.
+    """
+    candidates = {
+        openalex_id: (candidate_id, is_laureate)
+        for openalex_id, candidate_id, is_laureate in session.execute(
+            select(Candidate.openalex_id, Candidate.id, Candidate.is_laureate)
+        )
+    }
+    next_id = (session.scalar(select(func.max(Prediction.id))) or 0) + 1
+    written: dict[str, int] = {}
+    prediction_rows: List[dict] = []
+    shap_rows: List[dict] = []
+
+    def flush_batch() -> None:
+        if prediction_rows:
+            session.execute(insert(Prediction), prediction_rows)
+            prediction_rows.clear()
+        if shap_rows:
+            session.execute(insert(ShapAttribution), shap_rows)
+            shap_rows.clear()
+
+    for batch in predictions:
+        features = [
+            (name, batch.feature_values[name], attributions) for name, attributions in batch.attributions.items()
+        ]
+        for horizon, probabilities in batch.probabilities.items():
+            for index, (openalex_id, probability) in enumerate(zip(batch.openalex_ids, probabilities)):
+                candidate_id, is_laureate = candidates.get(openalex_id, (None, True))
+                if candidate_id is None or is_laureate:
+                    continue
+                prediction_rows.append(
+                    {
+                        "id": next_id,
+                        "candidate_id": candidate_id,
+                        "year": batch.year,
+                        "horizon": horizon,
+                        "probability": probability,
+                    }
+                )
+                shap_rows.extend(
+                    {
+                        "prediction_id": next_id,
+                        "feature_name": name,
+                        "feature_value": values[index],
+                        "shap_value": attributions[index],
+                    }
+                    for name, values, attributions in features
+                )
+                next_id += 1
+                written[batch.field] = written.get(batch.field, 0) + 1
+                if len(prediction_rows) >= batch_size:
+                    flush_batch()
+    flush_batch()
+    return written
+
+
+def prediction_delete_statements(fields: List[str] | None = None) -> List[Delete]:
+    """Delete attributions, then predictions, for ``fields`` (every field when ``None``)."""
+    if fields is None:
+        return [delete(ShapAttribution), delete(Prediction)]
+    field_candidates = select(Candidate.id).where(Candidate.field.in_(fields))
+    field_predictions = select(Prediction.id).where(Prediction.candidate_id.in_(field_candidates))
+    return [
+        delete(ShapAttribution).where(ShapAttribution.prediction_id.in_(field_predictions)),
+        delete(Prediction).where(Prediction.candidate_id.in_(field_candidates)),
+    ]
 
 
 @task
-def persist_predictions(predictions: List[dict]) -> None:
+def persist_predictions(predictions: List[FieldPredictions], fields: List[str] | None = None) -> dict[str, int]:
+    """Replace stored predictions and attributions in a single transaction.
+
+    With ``fields`` only the predictions of candidates in those fields are
+    deleted and rewritten; other fields keep serving their current rows.
+    Returns the number of predictions written per field.
+    """
     with db_session() as session:
-        session.query(ShapAttribution).delete()
-        session.query(Prediction).delete()
-        session.flush()
-
-        candidate_map = {c.openalex_id: c for c in session.query(Candidate).all()}
-        for record in predictions:
-            candidate = candidate_map.get(record["openalex_id"])
-            if candidate is None:
-                continue
-            if candidate.is_laureate:
-                continue
-            prediction = Prediction(
-                candidate_id=candidate.id,
-                year=record["year"],
-                horizon=record["horizon"],
-                probability=float(record["probability"]),
-            )
-            session.add(prediction)
-            session.flush()
-            shap_values = compute_simple_shap(record)
-            for shap_entry in shap_values:
-                session.add(
-                    ShapAttribution(
-                        prediction_id=prediction.id,
-                        feature_name=shap_entry["feature_name"],
-                        feature_value=float(shap_entry["feature_value"]),
-                        shap_value=float(shap_entry["shap_value"]),
-                    )
-                )
+        for statement in prediction_delete_statements(fields):
+            session.execute(statement)
+        return _insert_batches(session, predictions)
 
 
 @task
-def compute_simple_shap(prediction_record: dict) -> List[dict]:
-    feature_contributions = []
-    baseline = 0.02
-    for feature in FEATURE_COLUMNS:
-        weight = {
-            "total_citations": 1e-5,
-            "h_index": 0.002,
-            "recent_trend": 0.2,
-            "seminal_score": 0.15,
-            "award_count": 0.05,
-        }[feature]
-        value = prediction_record[feature]
-        contribution = weight * value
-        feature_contributions.append(
-            {
-                "feature_name": feature,
-                "feature_value": value,
-                "shap_value": contribution,
-            }
+def publish_shortlist_artifacts() -> str:
+    version = new_version()
+    publish_shortlists(version)
+    return version
+
+
+def _table_digest(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def _load_manifest() -> dict[str, dict]:
+    if not MANIFEST_PATH.exists():
+        return {}
+    with MANIFEST_PATH.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest: dict[str, dict]) -> None:
+    MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    temporary = MANIFEST_PATH.with_suffix(".json.tmp")
+    with temporary.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temporary, MANIFEST_PATH)
+
+
+def _stored_prediction_counts() -> dict[str, int]:
+    with db_read_session() as session:
+        return dict(
+            session.execute(
+                select(Candidate.field, func.count(Prediction.id))
+                .join(Prediction, Prediction.candidate_id == Candidate.id)
+                .group_by(Candidate.field)
+            ).all()
         )
-    return feature_contributions
 
 
-@flow(name="baseline_model_training")
-def run_model_training() -> dict:
+def _is_current(entry: dict | None, digest: str, stored_counts: dict[str, int]) -> bool:
+    """A field can be skipped when its table, trainer, horizons and stored predictions all match the manifest."""
+    return (
+        entry is not None
+        and entry["table_hash"] == digest
+        and entry["trainer"] == TRAINER_VERSION
+        and entry.get("horizons") == settings.prediction_horizons
+        and Path(entry["model_path"]).exists()
+        and stored_counts.get(entry["field"], 0) == entry["prediction_count"]
+    )
+
+
+@task
+def train_field(table_path: Path) -> dict | None:
+    """Train and score one feature table; returns ``None`` for an empty table."""
+    df = load_feature_table(table_path)
+    if df.empty:
+        return None
+
+    field_values = df["field"].unique()
+    if len(field_values) != 1:
+        raise ValueError(f"Feature table {table_path} contains multiple fields: {field_values}")
+
+    field_name = field_values[0]
+    model = train_logistic_model(df)
+    return {
+        "field": field_name,
+        "model_path": persist_model(model, model_path(field_name)),
+        "predictions": generate_predictions(field_name, model, df, settings.prediction_horizons),
+    }
+
+
+@flow(
+    name="baseline_model_training",
+    task_runner=lambda: task_runner_for(settings.training_task_runner, settings.task_runner_max_workers),
+)
+def run_model_training(force: bool = False, progress: ProgressCallback = no_progress) -> dict:
+    """Retrain and re-score only the fields whose staging tables changed.
+
+    Each table's content hash is compared with the training manifest; unchanged
+    fields keep their model and stored predictions, unless ``force`` is set.
+    Stale fields are trained in parallel on the configured task runner, and
+    their predictions are replaced in one scoped transaction after the join.
+    A new shortlist version is then published for the API to serve.
+    ``progress`` is told as each field is skipped, trained and persisted.
+    """
     staging_dir = settings.data_dir / "staging"
     feature_tables = discover_feature_tables(staging_dir)
     if not feature_tables:
         raise FileNotFoundError(f"No feature tables found in {staging_dir}")
 
-    all_predictions: List[dict] = []
+    manifest = _load_manifest()
+    stored_counts = _stored_prediction_counts()
+    predictions_by_field: dict[str, FieldPredictions] = {}
     model_paths: dict[str, str] = {}
+    skipped_fields: List[str] = []
+    refreshed: dict[str, dict] = {}
 
+    stale: dict[Path, str] = {}
     for table_path in feature_tables:
-        df = load_feature_table(table_path)
-        if df.empty:
-            continue
-
-        field_values = df["field"].unique()
-        if len(field_values) != 1:
-            raise ValueError(f"Feature table {table_path} contains multiple fields: {field_values}")
+        digest = _table_digest(table_path)
+        entry = manifest.get(table_path.name)
+        if not force and _is_current(entry, digest, stored_counts):
+            model_paths[entry["field"]] = entry["model_path"]
+            skipped_fields.append(entry["field"])
+            progress(entry["field"], "skipped")
+        else:
+            stale[table_path] = digest
 
-        field_name = field_values[0]
-        model, augmented_df = train_baseline_model(df)
-        field_slug = field_name.lower().replace(" ", "_")
-        model_path = settings.model_dir / field_slug / "baseline_model.joblib"
-        model_paths[field_name] = persist_model(model, model_path)
-        predictions = generate_predictions(model, augmented_df, "one_year")
-        all_predictions.extend(predictions)
+    for (table_path, digest), future in zip(stale.items(), train_field.map(list(stale))):
+        trained = future.result()
+        if trained is None:
+            continue
+        field_name = trained["field"]
+        model_paths[field_name] = trained["model_path"]
+        predictions_by_field[field_name] = trained["predictions"]
+        progress(field_name, "trained")
+        refreshed[table_path.name] = {
+            "field": field_name,
+            "table_hash": digest,
+            "trainer": TRAINER_VERSION,
+            "horizons": settings.prediction_horizons,
+            "model_path": trained["model_path"],
+        }
 
-    persist_predictions(all_predictions)
+    if predictions_by_field:
+        written = persist_predictions(list(predictions_by_field.values()), fields=list(predictions_by_field))
+        for name, entry in refreshed.items():
+            entry["prediction_count"] = written.get(entry["field"], 0)
+            manifest[name] = entry
+        _write_manifest(manifest)
+        for field_name in predictions_by_field:
+            progress(field_name, "persisted", prediction_count=written.get(field_name, 0))
+    if predictions_by_field or current_version() is None:
+        publish_shortlist_artifacts()
 
     return {
         "model_paths": model_paths,
-        "prediction_count": len(all_predictions),
+        "prediction_count": sum(map(len, predictions_by_field.values())),
+        "skipped_fields": skipped_fields,
         "run_id": f"model-{datetime.utcnow().isoformat()}",
     }
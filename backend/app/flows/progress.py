@@ -0,0 +1,11 @@
+"""Per-field progress reported by flows to whoever runs them (the training job worker)."""
+from typing import Any, Protocol
+
+
+class ProgressCallback(Protocol):
+    def __call__(self, field: str, status: str, **details: Any) -> None:
+        ...
+
+
+def no_progress(field: str, status: str, **details: Any) -> None:
+    """Default callback for flows run directly rather than as a job."""
@@ -4,8 +4,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import router as api_router
+from app.core.concurrency import shutdown_executor
 from app.core.config import get_settings
+from app.core.database import async_read_engine
 from app.services.bootstrap import bootstrap_state
+from app.services.job_service import job_queue
 
 
 def create_app() -> FastAPI:
@@ -18,6 +21,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "X-Next-Cursor"],
     )
 
     app.include_router(api_router, prefix=settings.api_prefix)
@@ -30,7 +34,20 @@ app = create_app()
 
 @app.on_event("startup")
 def on_startup() -> None:
-    bootstrap_state()
+    refreshed_seeds = bootstrap_state()
+    if get_settings().job_worker_enabled:
+        if refreshed_seeds:
+            # Load the upgraded seed values into the existing candidate rows.
+            job_queue.submit("etl")
+        job_queue.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    job_queue.stop()
+    if async_read_engine is not None:
+        await async_read_engine.dispose()
+    shutdown_executor()
 
 
 @app.get("/health", tags=["system"])
@@ -1,6 +1,7 @@
-from datetime import date
+from datetime import date, datetime
+from typing import Optional
 
-from sqlalchemy import Boolean, Column, Date, Float, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -8,6 +9,7 @@ from app.models.base import Base
 
 class Candidate(Base):
     __tablename__ = "candidates"
+    __table_args__ = (Index("ix_candidates_field_is_laureate", "field", "is_laureate"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     openalex_id: Mapped[str] = mapped_column(String, unique=True, nullable=False)
@@ -17,6 +19,8 @@ class Candidate(Base):
     country: Mapped[str] = mapped_column(String, nullable=True)
     headshot_url: Mapped[str] = mapped_column(String, nullable=True)
     is_laureate: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Year of the award, used as the historical outcome by backtests.
+    laureate_year: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     feature_snapshots: Mapped[list["FeatureSnapshot"]] = relationship(back_populates="candidate")
     predictions: Mapped[list["Prediction"]] = relationship(back_populates="candidate")
@@ -24,6 +28,9 @@ class Candidate(Base):
 
 class FeatureSnapshot(Base):
     __tablename__ = "feature_snapshots"
+    __table_args__ = (
+        Index("uq_feature_snapshots_candidate_year", "candidate_id", "as_of_year", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     candidate_id: Mapped[int] = mapped_column(ForeignKey("candidates.id"))
@@ -39,6 +46,7 @@ class FeatureSnapshot(Base):
 
 class Prediction(Base):
     __tablename__ = "predictions"
+    __table_args__ = (Index("ix_predictions_candidate_id", "candidate_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     candidate_id: Mapped[int] = mapped_column(ForeignKey("candidates.id"))
@@ -50,8 +58,13 @@ class Prediction(Base):
     shap_values: Mapped[list["ShapAttribution"]] = relationship(back_populates="prediction")
 
 
+# Backs keyset pagination of shortlists on (probability DESC, id).
+Index("ix_predictions_horizon_probability_id", Prediction.horizon, Prediction.probability.desc(), Prediction.id)
+
+
 class ShapAttribution(Base):
     __tablename__ = "shap_values"
+    __table_args__ = (Index("ix_shap_values_prediction_id", "prediction_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     prediction_id: Mapped[int] = mapped_column(ForeignKey("predictions.id"))
@@ -60,3 +73,34 @@ class ShapAttribution(Base):
     shap_value: Mapped[float] = mapped_column(Float, nullable=False)
 
     prediction: Mapped[Prediction] = relationship(back_populates="shap_values")
+
+
+# Feature sources, loaded from the seed provenance file by the ETL and looked up by OpenAlex id.
+class CandidateProvenance(Base):
+    __tablename__ = "provenance_records"
+    __table_args__ = (Index("ix_provenance_records_openalex_id", "openalex_id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    openalex_id: Mapped[str] = mapped_column(String, nullable=False)
+    feature_name: Mapped[str] = mapped_column(String, nullable=False)
+    source: Mapped[str] = mapped_column(String, nullable=False)
+    as_of_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    latency_days: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+# One row per field and held-out year of the rolling-origin backtest; the API aggregates them per field.
+class BacktestMetric(Base):
+    __tablename__ = "backtest_metrics"
+    __table_args__ = (Index("uq_backtest_metrics_field_year", "field", "as_of_year", unique=True),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    field: Mapped[str] = mapped_column(String, nullable=False)
+    as_of_year: Mapped[int] = mapped_column(Integer, nullable=False)
+    training_rows: Mapped[int] = mapped_column(Integer, nullable=False)
+    candidate_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    laureate_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    hits_at_10: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Undefined for years without a laureate among the candidates.
+    average_precision: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    brier_score: Mapped[float] = mapped_column(Float, nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
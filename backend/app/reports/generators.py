@@ -1,93 +1,285 @@
-from pathlib import Path
+"""Shortlist reports, cached per published shortlist and data version.
 
-import pandas as pd
+A report is keyed on the live shortlist version (published by every training
+run that changes predictions), the data version stamped by the ETL (candidate
+names and affiliations appear in the report) and ``(field, horizon, format)``,
+and stored as ``reports/<version>/shortlist_<field>_<horizon>_<digest>.<format>``.  A
+matching file is reused as is; new files are written to a temporary name and
+renamed into place, so a download never reads a half-written report.  Until a
+version is published, reports go to ``reports/unpublished`` and are rebuilt on
+every request.
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+from uuid import uuid4
 
 from app.core.config import get_settings
-from app.core.database import db_session
-from app.models.nobel import Candidate, Prediction
+from app.services.prediction_service import iter_shortlist
+from app.services.shortlist_store import data_version, prune_versions, shortlist_store
 
 settings = get_settings()
 
+REPORTS_DIR = settings.data_dir / "reports"
+UNPUBLISHED = "unpublished"
+REPORT_COLUMNS = ["Rank", "Candidate", "Affiliation", "Probability"]
+CSV_CHUNK_SIZE = 64 * 1024
+MEDIA_TYPES = {"csv": "text/csv", "pdf": "application/pdf"}
+
+
+class ReportArtifact(NamedTuple):
+    field: str
+    horizon: str
+    format: str
+    version: Optional[str]
+    path: Path
+    # Whether a finished report for this published version was on disk when it was located.
+    cached: bool
+
+    @property
+    def filename(self) -> str:
+        return f"shortlist_{self.field}_{self.horizon}.{self.format}"
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.format]
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", value.lower()).strip("_")
+
+
+def report_artifact(field: str, horizon: str, format: str, root: Path = REPORTS_DIR) -> ReportArtifact:
+    """Locate the report for the live shortlist and data versions; it may not have been written yet.
+
+    This reads the shortlist pointer, the data version and the report file from disk, so async callers run it
+    off the event loop.
+    """
+    snapshot = shortlist_store.current()
+    version = snapshot.version if snapshot is not None else None
+    # The digest keeps distinct (field, horizon) pairs apart once slugged into a file name.
+    key = [field, horizon, data_version()]
+    digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()[:12]
+    name = f"shortlist_{_slug(field)}_{_slug(horizon)}_{digest}.{format}"
+    path = root / (version or UNPUBLISHED) / name
+    return ReportArtifact(field, horizon, format, version, path, cached=version is not None and path.exists())
 
-def _shortlist_dataframe(field: str, horizon: str) -> pd.DataFrame:
-    with db_session() as session:
-        query = (
-            session.query(Prediction, Candidate)
-            .join(Candidate, Candidate.id == Prediction.candidate_id)
-            .filter(Candidate.field == field, Prediction.horizon == horizon)
-            .order_by(Prediction.probability.desc())
-        )
-        rows = []
-        for prediction, candidate in query:
-            rows.append(
-                {
-                    "Rank": len(rows) + 1,
-                    "Candidate": candidate.full_name,
-                    "Affiliation": candidate.affiliation,
-                    "Probability": round(prediction.probability, 3),
-                }
-            )
-        return pd.DataFrame(rows)
+
+@contextmanager
+def _atomic_write(artifact: ReportArtifact) -> Iterator[BinaryIO]:
+    """Write to a private temporary file and rename it over ``artifact.path`` on success."""
+    directory = artifact.path.parent
+    if not directory.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        prune_versions(directory.parent, keep=directory.name)
+    temporary = directory / f".{artifact.path.name}.{uuid4().hex}.tmp"
+    try:
+        with temporary.open("wb") as handle:
+            yield handle
+        os.replace(temporary, artifact.path)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+def _shortlist_rows(field: str, horizon: str) -> Iterator[dict]:
+    """Yield report rows in rank order, paging through the shortlist cursor."""
+    for rank, prediction in enumerate(iter_shortlist(field, horizon), start=1):
+        yield {
+            "Rank": rank,
+            "Candidate": prediction.candidate_name,
+            "Affiliation": prediction.affiliation,
+            "Probability": round(prediction.probability, 3),
+        }
+
+
+def stream_csv_report(artifact: ReportArtifact) -> Iterator[bytes]:
+    """Yield the CSV report in chunks as rows come off the cursor, caching it once complete.
+
+    The header is yielded before the first query runs.  Every chunk is also
+    written to the report's temporary file, which only replaces the cached
+    report after the last row; a stream closed early leaves no file behind.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=REPORT_COLUMNS)
+
+    def drain() -> bytes:
+        chunk = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        handle.write(chunk)
+        return chunk
+
+    with _atomic_write(artifact) as handle:
+        writer.writeheader()
+        yield drain()
+        for row in _shortlist_rows(artifact.field, artifact.horizon):
+            writer.writerow(row)
+            if buffer.tell() >= CSV_CHUNK_SIZE:
+                yield drain()
+        if buffer.tell():
+            yield drain()
 
 
 def generate_csv_report(field: str, horizon: str) -> Path:
-    df = _shortlist_dataframe(field, horizon)
-    target = settings.data_dir / "reports" / f"shortlist_{field}_{horizon}.csv"
-    target.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(target, index=False)
-    return target
+    artifact = report_artifact(field, horizon, "csv")
+    if not artifact.cached:
+        for _ in stream_csv_report(artifact):
+            pass
+    return artifact.path
+
+
+def write_pdf_report(artifact: ReportArtifact) -> Path:
+    title = f"Nobel Prediction Shortlist - {artifact.field} ({artifact.horizon})"
+    with _atomic_write(artifact) as handle, StreamingPdfWriter(handle, title=title) as pdf:
+        for row in _shortlist_rows(artifact.field, artifact.horizon):
+            pdf.add_line(f"#{row['Rank']} {row['Candidate']} — {row['Affiliation']} — P(win)={row['Probability']}")
+        if pdf.line_count == 0:
+            pdf.add_line("No predictions available.")
+    return artifact.path
 
 
 def generate_pdf_report(field: str, horizon: str) -> Path:
-    df = _shortlist_dataframe(field, horizon)
-    target = settings.data_dir / "reports" / f"shortlist_{field}_{horizon}.pdf"
-    target.parent.mkdir(parents=True, exist_ok=True)
-    lines = [f"Nobel Prediction Shortlist - {field} ({horizon})", ""]
-    if df.empty:
-        lines.append("No predictions available.")
-    else:
-        for _, row in df.iterrows():
-            lines.append(
-                f"#{int(row['Rank'])} {row['Candidate']} — {row['Affiliation']} — P(win)={row['Probability']}"
-            )
-    _write_simple_pdf(target, lines)
-    return target
-
-
-def _write_simple_pdf(path: Path, lines: list[str]) -> None:
-    def escape(text: str) -> str:
-        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
-
-    stream_lines = ["BT", "/F1 12 Tf"]
-    y = 760
-    for line in lines:
-        stream_lines.append(f"1 0 0 1 50 {y} Tm ({escape(line)}) Tj")
-        y -= 16
-    stream_lines.append("ET")
-    stream_bytes = "\n".join(stream_lines).encode("latin-1", errors="ignore")
-
-    objects = []
-    objects.append(b"1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n")
-    objects.append(b"2 0 obj << /Type /Pages /Kids [3 0 R] /Count 1 >> endobj\n")
-    objects.append(
-        b"3 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >> endobj\n"
-    )
-    objects.append(b"4 0 obj << /Type /Font /Subtype /Type1 /BaseFont /Helvetica >> endobj\n")
-    length_header = f"5 0 obj << /Length {len(stream_bytes)} >> stream\n".encode("latin-1")
-    objects.append(length_header + stream_bytes + b"\nendstream\nendobj\n")
-
-    with path.open("wb") as f:
-        f.write(b"%PDF-1.4\n")
-        offsets = [0]
-        for obj in objects:
-            offsets.append(f.tell())
-            f.write(obj)
-        xref_start = f.tell()
-        f.write(f"xref\n0 {len(objects)+1}\n".encode("latin-1"))
-        f.write(b"0000000000 65535 f \n")
-        for offset in offsets[1:]:
-            f.write(f"{offset:010} 00000 n \n".encode("latin-1"))
-        f.write(b"trailer << /Size 6 /Root 1 0 R >>\n")
-        f.write(b"startxref\n")
-        f.write(f"{xref_start}\n".encode("latin-1"))
-        f.write(b"%%EOF")
+    artifact = report_artifact(field, horizon, "pdf")
+    return artifact.path if artifact.cached else write_pdf_report(artifact)
+
+
+class StreamingPdfWriter:
+    """Write a paginated, text-only PDF to a binary stream as lines arrive.
+
+    The catalog and font objects go out first; each page is written as soon as
+    it fills (its content stream, then the page object), and the byte offset
+    of every object is recorded for the cross-reference table.  The page tree,
+    which lists every page, is written by :meth:`close` together with the
+    xref and trailer.  Only the current page's lines are held in memory, so
+    the cost of an export grows with its page count, not its text.
+
+    ``compress`` Flate-encodes the content streams with ``zlib``.  Text is
+    encoded as WinAnsi (cp1252); characters outside it are replaced with ``?``.
+    """
+
+    PAGE_WIDTH = 612
+    PAGE_HEIGHT = 792
+    LEFT = 50
+    TOP = 760
+    BOTTOM = 50
+    FOOTER = 30
+    FONT_SIZE = 12
+    LEADING = 16
+
+    _CATALOG, _PAGES, _FONT = 1, 2, 3
+
+    def __init__(self, handle: BinaryIO, title: str = "", compress: bool = True):
+        self._handle = handle
+        self._title = title
+        self._compress = compress
+        self._position = 0
+        self._offsets: dict[int, int] = {}
+        self._next_object = self._FONT + 1
+        self._page_objects: list[int] = []
+        self._lines: list[str] = []
+        self._closed = False
+        self.line_count = 0
+        # A comment with bytes above 127 marks the file as binary for transfer tools.
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._write_object(self._CATALOG, f"<< /Type /Catalog /Pages {self._PAGES} 0 R >>".encode("ascii"))
+        self._write_object(
+            self._FONT,
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        )
+
+    @property
+    def lines_per_page(self) -> int:
+        header = 2 if self._title else 0
+        return (self.TOP - self.BOTTOM) // self.LEADING + 1 - header
+
+    def __enter__(self) -> "StreamingPdfWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.close()
+
+    def add_line(self, text: str) -> None:
+        if self._closed:
+            raise ValueError("Cannot add lines to a closed PDF")
+        self._lines.append(text)
+        self.line_count += 1
+        if len(self._lines) == self.lines_per_page:
+            self._flush_page()
+
+    def close(self) -> None:
+        """Write the last page, the page tree, the xref table and the trailer."""
+        if self._closed:
+            return
+        if self._lines or not self._page_objects:
+            self._flush_page()
+        kids = " ".join(f"{number} 0 R" for number in self._page_objects)
+        self._write_object(
+            self._PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_objects)} >>".encode("ascii")
+        )
+        size = self._next_object
+        xref_start = self._position
+        entries = [b"0000000000 65535 f \n"]
+        entries.extend(f"{self._offsets[number]:010} 00000 n \n".encode("ascii") for number in range(1, size))
+        self._write(f"xref\n0 {size}\n".encode("ascii") + b"".join(entries))
+        self._write(
+            f"trailer << /Size {size} /Root {self._CATALOG} 0 R >>\nstartxref\n{xref_start}\n%%EOF\n".encode("ascii")
+        )
+        self._closed = True
+
+    def _write(self, data: bytes) -> None:
+        self._handle.write(data)
+        self._position += len(data)
+
+    def _allocate(self) -> int:
+        number = self._next_object
+        self._next_object += 1
+        return number
+
+    def _write_object(self, number: int, body: bytes) -> None:
+        self._offsets[number] = self._position
+        self._write(f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+    def _flush_page(self) -> None:
+        page_number = len(self._page_objects) + 1
+        y = self.TOP
+        operations = [f"BT /F1 {self.FONT_SIZE} Tf"]
+        if self._title:
+            operations.append(f"1 0 0 1 {self.LEFT} {y} Tm ({_pdf_escape(self._title)}) Tj")
+            y -= 2 * self.LEADING
+        for line in self._lines:
+            operations.append(f"1 0 0 1 {self.LEFT} {y} Tm ({_pdf_escape(line)}) Tj")
+            y -= self.LEADING
+        operations.append(f"1 0 0 1 {self.LEFT} {self.FOOTER} Tm (Page {page_number}) Tj ET")
+        content = "\n".join(operations).encode("cp1252", errors="replace")
+        self._lines.clear()
+
+        filters = ""
+        if self._compress:
+            content = zlib.compress(content)
+            filters = " /Filter /FlateDecode"
+        contents_number, page_object = self._allocate(), self._allocate()
+        self._write_object(
+            contents_number,
+            f"<< /Length {len(content)}{filters} >>\nstream\n".encode("ascii") + content + b"\nendstream",
+        )
+        self._write_object(
+            page_object,
+            (
+                f"<< /Type /Page /Parent {self._PAGES} 0 R /MediaBox [0 0 {self.PAGE_WIDTH} {self.PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 {self._FONT} 0 R >> >> /Contents {contents_number} 0 R >>"
+            ).encode("ascii"),
+        )
+        self._page_objects.append(page_object)
+
+
+def _pdf_escape(text: str) -> str:
+    text = re.sub(r"[\r\n\t]", " ", text)
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
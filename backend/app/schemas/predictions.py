@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import List
+from typing import Dict, List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, confloat
 
 
 class ShapAttributionSchema(BaseModel):
@@ -54,3 +54,15 @@ class ProvenanceRecord(BaseModel):
 class ProvenanceResponse(BaseModel):
     candidate_id: int
     records: List[ProvenanceRecord]
+
+
+class ScoreRequest(BaseModel):
+    field: str
+    # NaN or infinite features would make the probabilities unserializable, so they are rejected with a 422.
+    rows: List[Dict[str, confloat(allow_inf_nan=False)]] = Field(..., min_items=1, max_items=10_000)
+
+
+class ScoreResponse(BaseModel):
+    field: str
+    model_version: str
+    probabilities: List[float]
@@ -1,28 +1,94 @@
 import shutil
 from pathlib import Path
 
-from sqlalchemy import inspect
+from sqlalchemy import exists, inspect, select, text
 
 from app.core.config import get_settings
-from app.core.database import engine
+from app.core.database import db_session, engine
 from app.models.base import Base
-from app.models import nobel  # noqa: F401
+from app.models import jobs, nobel  # noqa: F401
+from app.services.provenance import replace_provenance
 
 settings = get_settings()
 
 
-def bootstrap_state() -> None:
+def bootstrap_state() -> list[Path]:
+    """Prepare the schema and seed directory; returns the copied seed files refreshed from a newer release.
+
+    Seeds are copied once, then only replaced when the packaged file changed
+    after the copy was made, so a local edit to a copy survives.  The caller
+    reruns the ETL when any were refreshed, which backfills their new values.
+    """
     inspector = inspect(engine)
     if inspector.has_table("candidates"):
         columns = {column["name"] for column in inspector.get_columns("candidates")}
         if "is_laureate" not in columns:
             Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    _ensure_columns()
+    _ensure_indexes()
     seed_source = Path(__file__).resolve().parents[1] / "data" / "seed"
     seed_target = settings.data_dir / "seed"
     if not seed_target.exists():
         seed_target.mkdir(parents=True, exist_ok=True)
+    refreshed = []
     for file in seed_source.glob("*.json"):
         target = seed_target / file.name
         if not target.exists():
             shutil.copy(file, target)
+        elif _is_outdated(target, file):
+            shutil.copy(file, target)
+            refreshed.append(target)
+    _ensure_provenance(seed_target / "provenance.json")
+    return refreshed
+
+
+def _is_outdated(copy: Path, source: Path) -> bool:
+    """Whether ``source`` was changed after ``copy`` was made from it."""
+    return source.stat().st_mtime_ns > copy.stat().st_mtime_ns and source.read_bytes() != copy.read_bytes()
+
+
+def _ensure_columns() -> None:
+    """Add nullable model columns missing from tables built by older releases."""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
+def _ensure_indexes() -> None:
+    """Create model indexes missing from databases built by older releases.
+
+    ``create_all`` skips tables that already exist, so indexes added to the
+    models later are created here in place, without dropping any data.
+    """
+    inspector = inspect(engine)
+    existing = {
+        index["name"] for table in Base.metadata.sorted_tables for index in inspector.get_indexes(table.name)
+    }
+    with engine.begin() as connection:
+        if "uq_feature_snapshots_candidate_year" not in existing:
+            # Keep the newest snapshot per (candidate, year) so the unique index can be built.
+            connection.execute(
+                text(
+                    "DELETE FROM feature_snapshots WHERE id NOT IN "
+                    "(SELECT MAX(id) FROM feature_snapshots GROUP BY candidate_id, as_of_year)"
+                )
+            )
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=connection)
+
+
+def _ensure_provenance(provenance_path: Path) -> None:
+    """Fill ``provenance_records`` for databases whose last ETL predates the table."""
+    if not provenance_path.exists():
+        return
+    with db_session() as session:
+        if not session.scalar(select(exists().select_from(nobel.CandidateProvenance))):
+            replace_provenance(session, provenance_path)
@@ -2,6 +2,8 @@ from pathlib import Path
 
 import pandas as pd
 
+from app.services.staging import FEATURE_TABLE_DTYPES, is_columnar
+
 
 REQUIRED_COLUMNS = [
     "openalex_id",
@@ -13,21 +15,64 @@ REQUIRED_COLUMNS = [
     "award_count",
 ]
 
+NON_NEGATIVE_COLUMNS = {"total_citations", "h_index", "award_count"}
+
+
+class _Expectations:
+    """Accumulates the feature-table expectations over streamed column chunks."""
+
+    def __init__(self, columns: list[str]):
+        present = [column for column in REQUIRED_COLUMNS if column in columns]
+        self.not_null = dict.fromkeys(present, True)
+        self.non_negative = {column: True for column in present if column in NON_NEGATIVE_COLUMNS}
+
+    @property
+    def present(self) -> list[str]:
+        return list(self.not_null)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        for column in self.present:
+            if column not in chunk:
+                continue
+            series = chunk[column]
+            self.not_null[column] = self.not_null[column] and series.notnull().all()
+            if column in self.non_negative:
+                self.non_negative[column] = self.non_negative[column] and all(
+                    value >= 0 for value in series if value is not None
+                )
+
+    def result(self) -> dict:
+        results = []
+        success = True
+        for column in REQUIRED_COLUMNS:
+            column_exists = column in self.not_null
+            results.append({"expectation": f"column_exists::{column}", "success": column_exists})
+            success = success and column_exists
+            if column_exists:
+                results.append({"expectation": f"not_null::{column}", "success": self.not_null[column]})
+                success = success and self.not_null[column]
+                if column in self.non_negative:
+                    results.append(
+                        {"expectation": f"non_negative::{column}", "success": self.non_negative[column]}
+                    )
+                    success = success and self.non_negative[column]
+        return {"success": success, "results": results}
+
+
+def validate_feature_table(path: Path, chunksize: int = 50_000) -> dict:
+    """Run the feature-table expectations with bounded memory.
 
-def validate_feature_table(path: Path) -> dict:
-    df = pd.read_csv(path)
-    results = []
-    success = True
-    for column in REQUIRED_COLUMNS:
-        column_exists = column in df.columns
-        results.append({"expectation": f"column_exists::{column}", "success": column_exists})
-        success = success and column_exists
-        if column_exists:
-            not_null = df[column].notnull().all()
-            results.append({"expectation": f"not_null::{column}", "success": not_null})
-            success = success and not_null
-            if column in {"total_citations", "h_index", "award_count"}:
-                non_negative = (df[column] >= 0).all()
-                results.append({"expectation": f"non_negative::{column}", "success": non_negative})
-                success = success and non_negative
-    return {"success": success, "results": results}
+    Columnar tables are checked one column at a time; CSV tables are streamed
+    in ``chunksize`` row chunks.
+    """
+    if is_columnar(path):
+        with pd.ColumnarFile(path) as table:
+            expectations = _Expectations(table.columns)
+            for column in expectations.present:
+                expectations.update(table.read([column]))
+    else:
+        with pd.read_csv(path, dtype=FEATURE_TABLE_DTYPES, chunksize=chunksize) as reader:
+            expectations = _Expectations(reader.columns)
+            for chunk in reader:
+                expectations.update(chunk)
+    return expectations.result()
@@ -0,0 +1,48 @@
+"""Ranking and calibration metrics for backtests.
+
+Each held-out year is evaluated with one sort of its scores and one pass over
+the ranking: hits in the top ``k``, average precision and the Brier score are
+all accumulated as the pass walks down the list.
+"""
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+
+@dataclass(frozen=True)
+class RankingMetrics:
+    candidate_count: int
+    laureate_count: int
+    hits_at_k: int
+    # ``None`` when no candidate won, since precision is undefined without positives.
+    average_precision: Optional[float]
+    brier_score: float
+
+
+def ranking_metrics(probabilities: Sequence[float], labels: Sequence[float], k: int = 10) -> RankingMetrics:
+    """Score one ranking of 0/1 ``labels`` by descending probability.
+
+    Average precision is the step-wise area under the precision-recall curve:
+    the mean, over the positives, of the precision at each positive's rank.
+    Tied probabilities keep their input order.
+    """
+    rows = len(labels)
+    if rows == 0:
+        raise ValueError("Cannot evaluate an empty ranking")
+    order = sorted(range(rows), key=probabilities.__getitem__, reverse=True)
+    positives, hits, precision_sum, squared_error = 0, 0, 0.0, 0.0
+    for rank, index in enumerate(order, start=1):
+        label = labels[index]
+        error = probabilities[index] - label
+        squared_error += error * error
+        if label:
+            positives += 1
+            precision_sum += positives / rank
+            if rank <= k:
+                hits += 1
+    return RankingMetrics(
+        candidate_count=rows,
+        laureate_count=positives,
+        hits_at_k=hits,
+        average_precision=precision_sum / positives if positives else None,
+        brier_score=squared_error / rows,
+    )
@@ -0,0 +1,264 @@
+"""Background queue for ETL and training runs, persisted in the ``training_jobs`` table.
+
+``POST /training/etl`` and ``POST /training/model`` enqueue a job and return
+its id straight away, as does ``POST /training/backtest``.  A single worker
+thread claims queued jobs in creation order and runs them one at a time, so ETL
+upserts and the delete-and-rewrite of predictions never race each other.  A
+request matching a job that is still queued (same kind and parameters) joins
+that job instead of adding a run; a running job is never joined, since it may
+have read its inputs before the request arrived.
+
+Flows report per-field progress through a callback, which the worker stores on
+the job row.  Jobs left ``running`` by a stopped process are queued again when
+the worker starts.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+from sqlalchemy import Row, Select, Update, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import get_settings
+from app.core.database import db_read_session, db_session
+from app.flows.backtest import run_backtest
+from app.flows.etl import run_seed_etl
+from app.flows.modeling import run_model_training
+from app.flows.progress import ProgressCallback
+from app.models.jobs import TrainingJob
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+JobRunner = Callable[[dict, ProgressCallback], dict]
+# Attempts at writing a finished job's outcome, backing off from the poll interval.
+FINISH_ATTEMPTS = 4
+
+
+def _run_etl(params: dict, progress: ProgressCallback) -> dict:
+    return {"run_id": run_seed_etl(progress=progress)}
+
+
+def _run_model(params: dict, progress: ProgressCallback) -> dict:
+    return run_model_training(force=params.get("force", False), progress=progress)
+
+
+def _run_backtest(params: dict, progress: ProgressCallback) -> dict:
+    return run_backtest(progress=progress)
+
+
+JOB_RUNNERS: dict[str, JobRunner] = {"etl": _run_etl, "model": _run_model, "backtest": _run_backtest}
+
+
+def dedupe_key(kind: str, params: dict) -> str:
+    return f"{kind}:{json.dumps(params, sort_keys=True)}"
+
+
+def next_job_statement() -> Select:
+    return (
+        select(TrainingJob.id)
+        .where(TrainingJob.status == "queued")
+        .order_by(TrainingJob.created_at, TrainingJob.id)
+        .limit(1)
+    )
+
+
+def claim_job_statement() -> Update:
+    """Mark the oldest queued job running in one statement, returning it (``None`` when idle)."""
+    return (
+        update(TrainingJob)
+        .where(TrainingJob.id == next_job_statement().scalar_subquery())
+        .values(status="running", started_at=datetime.utcnow(), progress={})
+        .returning(TrainingJob.id, TrainingJob.kind, TrainingJob.params)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _seconds_between(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    return (end - start).total_seconds()
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def serialize_job(job: TrainingJob) -> dict:
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "params": job.params,
+        "status": job.status,
+        "progress": job.progress,
+        "result": job.result,
+        "error": job.error,
+        "created_at": _isoformat(job.created_at),
+        "started_at": _isoformat(job.started_at),
+        "finished_at": _isoformat(job.finished_at),
+        "queued_seconds": _seconds_between(job.created_at, job.started_at),
+        "run_seconds": _seconds_between(job.started_at, job.finished_at),
+    }
+
+
+class JobQueue:
+    def __init__(self, runners: dict[str, JobRunner] = JOB_RUNNERS, poll_interval: float = 2.0) -> None:
+        self._runners = runners
+        self._poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, kind: str, params: Optional[dict] = None) -> tuple[dict, bool]:
+        """Enqueue a job, or join an identical queued one; returns the job and whether it was joined.
+
+        The insert goes first and the partial unique index on queued jobs
+        rejects a duplicate, so two requests can never both enqueue a run.
+        """
+        if kind not in self._runners:
+            raise ValueError(f"Unknown job kind {kind!r}; expected one of {sorted(self._runners)}")
+        params = params or {}
+        key = dedupe_key(kind, params)
+        while True:
+            job = TrainingJob(
+                id=uuid4().hex,
+                kind=kind,
+                params=params,
+                dedupe_key=key,
+                status="queued",
+                progress={},
+                created_at=datetime.utcnow(),
+            )
+            try:
+                with db_session() as session:
+                    session.add(job)
+                    session.flush()
+                    payload = serialize_job(job)
+            except IntegrityError:
+                with db_read_session() as session:
+                    queued = session.scalar(
+                        select(TrainingJob).where(TrainingJob.dedupe_key == key, TrainingJob.status == "queued")
+                    )
+                    if queued is not None:
+                        return serialize_job(queued), True
+                # The queued duplicate was claimed in the meantime; enqueue a fresh run.
+                continue
+            self._wakeup.set()
+            return payload, False
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with db_read_session() as session:
+            job = session.get(TrainingJob, job_id)
+            return serialize_job(job) if job is not None else None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._requeue_interrupted()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._work, name="training-jobs", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker once the job it is running (if any) has finished."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _requeue_interrupted(self) -> None:
+        with db_session() as session:
+            queued_keys = select(TrainingJob.dedupe_key).where(TrainingJob.status == "queued")
+            session.execute(
+                update(TrainingJob)
+                .where(TrainingJob.status == "running", TrainingJob.dedupe_key.not_in(queued_keys))
+                .values(status="queued", started_at=None, progress={})
+            )
+            session.execute(
+                update(TrainingJob)
+                .where(TrainingJob.status == "running")
+                .values(
+                    status="failed",
+                    error="Interrupted by a restart; an identical job is already queued",
+                    finished_at=datetime.utcnow(),
+                )
+            )
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                claimed = self._claim()
+                if claimed is not None:
+                    self._execute(claimed.id, claimed.kind, claimed.params)
+                    continue
+            except Exception:
+                # A database error (e.g. "database is locked") must not end the worker thread.
+                logger.exception("Training job worker failed; retrying in %s s", self._poll_interval)
+                self._stopping.wait(self._poll_interval)
+                continue
+            self._wakeup.wait(self._poll_interval)
+            self._wakeup.clear()
+
+    def _claim(self) -> Optional[Row]:
+        with db_session() as session:
+            return session.execute(claim_job_statement()).first()
+
+    def _execute(self, job_id: str, kind: str, params: dict) -> None:
+        started = time.perf_counter()
+        progress: dict[str, dict] = {}
+
+        def report(field: str, status: str, **details: Any) -> None:
+            progress[field] = {"status": status, "elapsed_seconds": time.perf_counter() - started, **details}
+            try:
+                self._update(job_id, progress=dict(progress))
+            except Exception:
+                # Progress is informational; a failed write must not fail the run reporting it.
+                logger.warning("Could not record progress of training job %s", job_id, exc_info=True)
+
+        try:
+            result = self._runners[kind](params, report)
+        except Exception as exc:
+            logger.exception("Training job %s (%s) failed", job_id, kind)
+            self._finish(job_id, status="failed", error=f"{type(exc).__name__}: {exc}", finished_at=datetime.utcnow())
+        else:
+            self._finish(job_id, status="succeeded", result=result, finished_at=datetime.utcnow())
+
+    def _finish(self, job_id: str, **values: Any) -> None:
+        """Record a job's outcome, retrying with backoff, so it is not left ``running`` until a restart.
+
+        If the outcome still cannot be written, the job is marked failed with a
+        short error instead, in case the outcome itself was what failed to store.
+        """
+        delay = self._poll_interval
+        for attempt in range(1, FINISH_ATTEMPTS + 1):
+            try:
+                self._update(job_id, **values)
+                return
+            except Exception:
+                logger.warning(
+                    "Could not record the outcome of training job %s (attempt %d)", job_id, attempt, exc_info=True
+                )
+            if attempt < FINISH_ATTEMPTS:
+                time.sleep(delay)
+                delay *= 2
+        try:
+            self._update(
+                job_id, status="failed", error="The job's outcome could not be recorded", finished_at=datetime.utcnow()
+            )
+        except Exception:
+            logger.exception("Training job %s is left running; it will be queued again on restart", job_id)
+
+    def _update(self, job_id: str, **values: Any) -> None:
+        with db_session() as session:
+            session.execute(update(TrainingJob).where(TrainingJob.id == job_id).values(**values))
+
+
+job_queue = JobQueue(poll_interval=settings.job_poll_interval_seconds)
@@ -0,0 +1,290 @@
+"""Logistic regression fitted with mini-batch gradient descent on plain Python arrays.
+
+Training only needs ``array``/``math``, so it runs the same under the offline
+pandas/numpy shims as with the real libraries.  Work is done column-wise:
+each feature is one ``array('d')``, and every step is a handful of ``map``
+passes over a batch slice instead of a Python loop per row.
+
+* Features are standardized with the training mean and standard deviation;
+  the fitted model is stored with coefficients mapped back to raw feature
+  units, so it scores unstandardized inputs directly.
+* The L2 penalty applies to the weights, not the intercept.
+* Rows are scrambled once; each epoch then visits the batches in a fresh
+  random order.  The loss on a held-out split (or the training loss, for tiny
+  tables) drives early stopping and is recorded with each epoch's throughput.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import random
+import time
+from array import array
+from dataclasses import asdict, dataclass, field
+from itertools import repeat
+from operator import add, itemgetter, mul, sub
+from typing import Iterable, List, Mapping, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Softplus and sigmoid are evaluated on clamped scores so ``exp`` never overflows.
+_SCORE_LIMIT = 35.0
+_EXP_LIMIT = 700.0
+
+
+@dataclass(frozen=True)
+class TrainingConfig:
+    learning_rate: float = 0.5
+    l2: float = 1e-3
+    batch_size: int = 8_192
+    max_epochs: int = 100
+    patience: int = 2
+    tolerance: float = 1e-4
+    validation_fraction: float = 0.1
+    min_validation_rows: int = 100
+    seed: int = 42
+
+
+@dataclass
+class EpochMetrics:
+    epoch: int
+    loss: float
+    loss_split: str
+    seconds: float
+    rows_per_second: float
+
+
+@dataclass
+class LogisticModel:
+    features: List[str]
+    means: List[float]
+    scales: List[float]
+    weights: List[float]
+    bias: float
+    epochs: List[EpochMetrics] = field(default_factory=list)
+    stopped_early: bool = False
+
+    @property
+    def coefficients(self) -> dict[str, float]:
+        """Weights in raw feature units."""
+        return {name: weight / scale for name, weight, scale in zip(self.features, self.weights, self.scales)}
+
+    @property
+    def intercept(self) -> float:
+        """Intercept in raw feature units."""
+        return self.bias - sum(
+            weight * mean / scale for weight, mean, scale in zip(self.weights, self.means, self.scales)
+        )
+
+    def to_dict(self) -> dict:
+        """Serialize the model, stamped with a ``version`` digest of its content."""
+        payload = {
+            "type": "logistic_regression",
+            "coefficients": self.coefficients,
+            "intercept": self.intercept,
+            "standardization": {
+                "means": dict(zip(self.features, self.means)),
+                "scales": dict(zip(self.features, self.scales)),
+            },
+            "training": {"epochs": [asdict(epoch) for epoch in self.epochs], "stopped_early": self.stopped_early},
+        }
+        payload["version"] = model_version(payload)
+        return payload
+
+    def predict_proba(self, columns: Mapping[str, Sequence[float]]) -> array:
+        standardized = [
+            _standardize(columns[name], mean, scale)
+            for name, mean, scale in zip(self.features, self.means, self.scales)
+        ]
+        return array("d", _sigmoid(_scores(standardized, self.weights, self.bias)))
+
+
+def model_version(model: dict) -> str:
+    """The version stamped by training, or a content digest for models saved without one."""
+    return model.get("version") or hashlib.sha256(json.dumps(model, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _sigmoid(scores: Iterable[float]) -> List[float]:
+    exp = math.exp
+    return [1.0 / (1.0 + exp(-score)) if score > -_SCORE_LIMIT else 0.0 for score in scores]
+
+
+def _mean_log_loss(scores: Sequence[float], labels: Sequence[float]) -> float:
+    """Mean log loss from raw scores: ``softplus(score) - label * score`` per row."""
+    log1p, exp = math.log1p, math.exp
+    softplus = math.fsum([log1p(exp(score)) if score < _SCORE_LIMIT else score for score in scores])
+    return (softplus - math.fsum(map(mul, labels, scores))) / len(labels)
+
+
+def _scrambled_order(rows: int, rng: random.Random) -> List[int]:
+    """Visit every row once with a large coprime stride from a random offset.
+
+    Far cheaper than ``random.shuffle`` on millions of rows, and consecutive
+    positions land far apart, so each mini-batch samples the whole table even
+    when it is sorted (by label, say).
+    """
+    stride = max(1, round(rows * 0.6180339887))
+    while math.gcd(stride, rows) != 1:
+        stride += 1
+    offset = rng.randrange(rows)
+    return [(offset + index * stride) % rows for index in range(rows)]
+
+
+def _gather(values: Sequence[float], order: Sequence[int]) -> array:
+    if len(order) > 1:
+        return array("d", itemgetter(*order)(values))
+    return array("d", (values[index] for index in order))
+
+
+def _standardize(values: Iterable[float], mean: float, scale: float) -> array:
+    return array("d", map(mul, map(sub, values, repeat(mean)), repeat(1.0 / scale)))
+
+
+def _moments(values: Sequence[float]) -> tuple[float, float]:
+    mean = math.fsum(values) / len(values)
+    deviations = list(map(sub, values, repeat(mean)))
+    variance = math.fsum(map(mul, deviations, deviations)) / len(values)
+    # Constant columns keep unit scale, so their weight simply stays at zero.
+    return mean, math.sqrt(variance) or 1.0
+
+
+def _scores(columns: Sequence[Sequence[float]], weights: Sequence[float], bias: float) -> List[float]:
+    scores = [bias] * len(columns[0]) if columns else []
+    for column, weight in zip(columns, weights):
+        scores = list(map(add, scores, map(mul, column, repeat(weight))))
+    return scores
+
+
+def fit_logistic_regression(
+    columns: Mapping[str, Sequence[float]],
+    labels: Sequence[float],
+    config: TrainingConfig = TrainingConfig(),
+) -> LogisticModel:
+    """Fit a regularized logistic regression of ``labels`` (0/1) on the named feature columns."""
+    features = list(columns)
+    rows = len(labels)
+    if rows == 0:
+        raise ValueError("Cannot fit a model on an empty table")
+
+    rng = random.Random(config.seed)
+    order = _scrambled_order(rows, rng)
+    validation_rows = int(rows * config.validation_fraction)
+    if validation_rows < config.min_validation_rows:
+        validation_rows = 0
+    train_order, validation_order = order[validation_rows:], order[:validation_rows]
+
+    means, scales, train_columns, validation_columns = [], [], [], []
+    for name in features:
+        values = columns[name]
+        train_values = _gather(values, train_order)
+        mean, scale = _moments(train_values)
+        means.append(mean)
+        scales.append(scale)
+        train_columns.append(_standardize(train_values, mean, scale))
+        validation_columns.append(_standardize(_gather(values, validation_order), mean, scale))
+    train_labels = _gather(labels, train_order)
+    validation_labels = _gather(labels, validation_order)
+    # Tiny tables have no held-out split; their training loss drives early stopping instead.
+    monitor_columns, monitor_labels, loss_split = (
+        (validation_columns, validation_labels, "validation")
+        if validation_rows
+        else (train_columns, train_labels, "train")
+    )
+
+    model = LogisticModel(features, means, scales, [0.0] * len(features), 0.0)
+    batch_starts = list(range(0, len(train_labels), config.batch_size))
+    decay = 1.0 - config.learning_rate * config.l2
+    best_loss, best_state, stale_epochs = math.inf, (list(model.weights), model.bias), 0
+    for epoch in range(1, config.max_epochs + 1):
+        started = time.perf_counter()
+        rng.shuffle(batch_starts)
+        for start in batch_starts:
+            end = start + config.batch_size
+            batch = [column[start:end] for column in train_columns]
+            batch_labels = train_labels[start:end]
+            errors = list(map(sub, _sigmoid(_scores(batch, model.weights, model.bias)), batch_labels))
+            step = config.learning_rate / len(batch_labels)
+            model.bias -= step * sum(errors)
+            model.weights = [
+                weight * decay - step * sum(map(mul, errors, column)) for weight, column in zip(model.weights, batch)
+            ]
+        seconds = time.perf_counter() - started
+        loss = _mean_log_loss(_scores(monitor_columns, model.weights, model.bias), monitor_labels)
+        metrics = EpochMetrics(
+            epoch=epoch,
+            loss=loss,
+            loss_split=loss_split,
+            seconds=seconds,
+            rows_per_second=len(train_labels) / seconds if seconds > 0 else float(len(train_labels)),
+        )
+        model.epochs.append(metrics)
+        logger.info("epoch %d: %s loss %.5f, %.0f rows/s", epoch, loss_split, loss, metrics.rows_per_second)
+
+        if loss < best_loss - config.tolerance:
+            best_loss, best_state, stale_epochs = loss, (list(model.weights), model.bias), 0
+        else:
+            stale_epochs += 1
+            if stale_epochs >= config.patience:
+                model.stopped_early = True
+                break
+    model.weights, model.bias = best_state
+    return model
+
+
+class CompiledScorer:
+    """A serialized linear-logit model compiled into one scoring function.
+
+    The coefficients are inlined as float literals in a generated function of
+    one argument per feature, so a batch is scored in a single ``map`` over
+    its columns: no per-feature intermediate columns, and the sigmoid is
+    applied in the same call.
+    """
+
+    def __init__(self, model: dict):
+        coefficients = {name: float(value) for name, value in model["coefficients"].items()}
+        intercept = float(model["intercept"])
+        if not coefficients:
+            raise ValueError("Cannot compile a model without features")
+        if not all(map(math.isfinite, [intercept, *coefficients.values()])):
+            raise ValueError("Cannot compile a model with non-finite coefficients")
+        self.features = tuple(coefficients)
+        self.version = model_version(model)
+        self.coefficients = coefficients
+        # Attributions are taken against the training means; models saved without them use zero.
+        means = model.get("standardization", {}).get("means", {})
+        self.background = {name: float(means.get(name, 0.0)) for name in self.features}
+        arguments = [f"x{index}" for index in range(len(self.features))]
+        logit = " + ".join(
+            [repr(intercept)]
+            + [f"{coefficients[name]!r} * {argument}" for name, argument in zip(self.features, arguments)]
+        )
+        # ``min`` caps exp's argument for very negative logits, where the probability is 0 anyway.
+        source = f"lambda {', '.join(arguments)}: 1.0 / (1.0 + exp(min({_EXP_LIMIT!r}, -({logit}))))"
+        self._function = eval(source, {"__builtins__": {}, "exp": math.exp, "min": min})
+
+    def score(self, columns: Mapping[str, Iterable[float]]) -> array:
+        """Return the probability for every row of equally long feature ``columns``."""
+        missing = [name for name in self.features if name not in columns]
+        if missing:
+            raise ValueError(f"Missing feature columns: {', '.join(missing)}")
+        return array("d", map(self._function, *(columns[name] for name in self.features)))
+
+    def explain(self, columns: Mapping[str, Iterable[float]]) -> tuple[dict[str, array], array, dict[str, array]]:
+        """Score ``columns`` and attribute each logit to the features in one pass.
+
+        For a linear logit the exact SHAP value of a feature is
+        ``coefficient * (value - background mean)``; each is computed for the
+        whole column at once.  Returns the feature columns as arrays, the
+        probabilities and the attributions, all row-aligned.
+        """
+        values = {name: array("d", columns[name]) for name in self.features if name in columns}
+        probabilities = self.score(values)
+        attributions = {
+            name: array(
+                "d", map(mul, map(sub, values[name], repeat(self.background[name])), repeat(self.coefficients[name]))
+            )
+            for name in self.features
+        }
+        return values, probabilities, attributions
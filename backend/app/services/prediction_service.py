@@ -1,129 +1,363 @@
+import base64
 import json
-from datetime import datetime
-from typing import List
-
-import pandas as pd
+from dataclasses import dataclass
+from itertools import groupby
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
 
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Row, Select, and_, func, or_, select
+from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.core.database import db_session
-from app.models.nobel import Candidate, FeatureSnapshot, Prediction
+from app.core.concurrency import run_blocking
+from app.core.database import async_db_read_connection, async_db_read_session, async_read_engine, db_read_session
+from app.models.nobel import (
+    BacktestMetric,
+    Candidate,
+    CandidateProvenance,
+    FeatureSnapshot,
+    Prediction,
+    ShapAttribution,
+)
 from app.schemas.predictions import (
     BacktestMetricSchema,
     CandidateDetailSchema,
     PredictionSchema,
     ProvenanceRecord,
     ProvenanceResponse,
+    ScoreResponse,
     ShapAttributionSchema,
 )
+from app.services.scoring import scorer_cache
+from app.utils.file_cache import file_cache
 
 settings = get_settings()
 
+SHORTLIST_LIMIT = 20
+MAX_SHORTLIST_LIMIT = 1_000
 
-class PredictionService:
-    def get_shortlist(self, field: str, horizon: str) -> List[PredictionSchema]:
-        with db_session() as session:
-            query = (
-                session.query(Prediction, Candidate)
-                .join(Candidate, Candidate.id == Prediction.candidate_id)
-                .filter(
-                    Candidate.field == field,
-                    Candidate.is_laureate.is_(False),
-                    Prediction.horizon == horizon,
-                )
-                .order_by(Prediction.probability.desc())
-                .limit(20)
+
+@dataclass
+class ShortlistPage:
+    items: List[PredictionSchema]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(probability: float, prediction_id: int) -> str:
+    """Encode the keyset position after a row as an opaque, URL-safe token."""
+    raw = json.dumps([probability, prediction_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        probability, prediction_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(probability), int(prediction_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid shortlist cursor: {cursor!r}") from exc
+
+
+def shortlist_statement(
+    field: str,
+    horizon: str,
+    limit: int = SHORTLIST_LIMIT,
+    cursor: Optional[str] = None,
+    with_attributions: bool = True,
+) -> Select:
+    """Build the query for one page of a field's ranking, ordered by ``(probability DESC, id)``.
+
+    Pages are keyset-paginated: ``cursor`` is the position after the last row
+    of the previous page, so each page is an index range scan on
+    ``ix_predictions_horizon_probability_id`` however deep it is.  The page's
+    rows are chosen in a subquery and outer-joined to their SHAP rows, so a
+    page costs a single round trip instead of one lazy load per prediction.
+    """
+    top = (
+        select(
+            Prediction.id,
+            Prediction.probability,
+            Prediction.horizon,
+            Prediction.year,
+            Candidate.id.label("candidate_id"),
+            Candidate.full_name,
+            Candidate.affiliation,
+            Candidate.field,
+            Candidate.headshot_url,
+        )
+        .join(Candidate, Candidate.id == Prediction.candidate_id)
+        .where(
+            Candidate.field == field,
+            Candidate.is_laureate.is_(False),
+            Prediction.horizon == horizon,
+        )
+        .order_by(Prediction.probability.desc(), Prediction.id)
+        .limit(limit)
+    )
+    if cursor is not None:
+        after_probability, after_id = decode_cursor(cursor)
+        top = top.where(
+            or_(
+                Prediction.probability < after_probability,
+                and_(Prediction.probability == after_probability, Prediction.id > after_id),
             )
-            results = []
-            for prediction, candidate in query:
-                shap_values = [
+        )
+    if not with_attributions:
+        return top
+    top = top.subquery()
+    return (
+        select(top, ShapAttribution.feature_name, ShapAttribution.feature_value, ShapAttribution.shap_value)
+        .outerjoin(ShapAttribution, ShapAttribution.prediction_id == top.c.id)
+        .order_by(top.c.probability.desc(), top.c.id, ShapAttribution.id)
+    )
+
+
+def candidate_statement(candidate_id: int) -> Select:
+    return select(Candidate).where(Candidate.id == candidate_id)
+
+
+def latest_snapshot_statement(candidate_id: int) -> Select:
+    return (
+        select(FeatureSnapshot)
+        .where(FeatureSnapshot.candidate_id == candidate_id)
+        .order_by(FeatureSnapshot.as_of_year.desc())
+        .limit(1)
+    )
+
+
+def provenance_statement(openalex_id: str) -> Select:
+    return (
+        select(CandidateProvenance)
+        .where(CandidateProvenance.openalex_id == openalex_id)
+        .order_by(CandidateProvenance.id)
+    )
+
+
+def query_shortlist_page(
+    session: Session,
+    field: str,
+    horizon: str,
+    limit: int = SHORTLIST_LIMIT,
+    cursor: Optional[str] = None,
+    with_attributions: bool = True,
+) -> ShortlistPage:
+    """Run :func:`shortlist_statement` and group its rows into a page of predictions."""
+    query = shortlist_statement(field, horizon, limit=limit, cursor=cursor, with_attributions=with_attributions)
+    return _page_from_rows(session.execute(query).all(), limit, with_attributions)
+
+
+def _page_from_rows(rows: Sequence[Row], limit: int, with_attributions: bool) -> ShortlistPage:
+    items = []
+    last = None
+    for _, group in groupby(rows, key=lambda row: row.id):
+        group = list(group)
+        last = group[0]
+        items.append(
+            PredictionSchema(
+                candidate_id=last.candidate_id,
+                candidate_name=last.full_name,
+                affiliation=last.affiliation,
+                field=last.field,
+                headshot_url=last.headshot_url,
+                probability=last.probability,
+                horizon=last.horizon,
+                year=last.year,
+                shap_values=[
                     ShapAttributionSchema(
-                        feature_name=shap.feature_name,
-                        feature_value=shap.feature_value,
-                        shap_value=shap.shap_value,
-                    )
-                    for shap in prediction.shap_values
-                ]
-                results.append(
-                    PredictionSchema(
-                        candidate_id=candidate.id,
-                        candidate_name=candidate.full_name,
-                        affiliation=candidate.affiliation,
-                        field=candidate.field,
-                        headshot_url=candidate.headshot_url,
-                        probability=prediction.probability,
-                        horizon=prediction.horizon,
-                        year=prediction.year,
-                        shap_values=shap_values,
+                        feature_name=row.feature_name,
+                        feature_value=row.feature_value,
+                        shap_value=row.shap_value,
                     )
-                )
-            return results
+                    for row in group
+                    if with_attributions and row.feature_name is not None
+                ],
+            )
+        )
+    next_cursor = encode_cursor(last.probability, last.id) if last is not None and len(items) == limit else None
+    return ShortlistPage(items=items, next_cursor=next_cursor)
 
-    def get_candidate_detail(self, candidate_id: int) -> CandidateDetailSchema | None:
-        with db_session() as session:
-            candidate = session.query(Candidate).filter_by(id=candidate_id).one_or_none()
-            if candidate is None:
-                return None
-            snapshot = (
-                session.query(FeatureSnapshot)
-                .filter_by(candidate_id=candidate.id)
-                .order_by(FeatureSnapshot.as_of_year.desc())
-                .first()
+
+def iter_shortlist(
+    field: str, horizon: str, page_size: int = MAX_SHORTLIST_LIMIT, with_attributions: bool = False
+) -> Iterator[PredictionSchema]:
+    """Yield a field's full ranking page by page, following the shortlist cursor."""
+    cursor = None
+    with db_read_session() as session:
+        while True:
+            page = query_shortlist_page(
+                session, field, horizon, limit=page_size, cursor=cursor, with_attributions=with_attributions
             )
-            if snapshot is None:
-                return None
-            return CandidateDetailSchema(
-                candidate_id=candidate.id,
-                candidate_name=candidate.full_name,
-                affiliation=candidate.affiliation,
-                country=candidate.country,
-                headshot_url=candidate.headshot_url,
-                field=candidate.field,
-                total_citations=snapshot.total_citations,
-                h_index=snapshot.h_index,
-                recent_trend=snapshot.recent_trend,
-                seminal_score=snapshot.seminal_score,
-                award_count=snapshot.award_count,
+            yield from page.items
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+
+def _candidate_detail(
+    candidate: Optional[Candidate], snapshot: Optional[FeatureSnapshot]
+) -> CandidateDetailSchema | None:
+    if candidate is None or snapshot is None:
+        return None
+    return CandidateDetailSchema(
+        candidate_id=candidate.id,
+        candidate_name=candidate.full_name,
+        affiliation=candidate.affiliation,
+        country=candidate.country,
+        headshot_url=candidate.headshot_url,
+        field=candidate.field,
+        total_citations=snapshot.total_citations,
+        h_index=snapshot.h_index,
+        recent_trend=snapshot.recent_trend,
+        seminal_score=snapshot.seminal_score,
+        award_count=snapshot.award_count,
+    )
+
+
+def _provenance_response(candidate: Candidate, entries: Sequence[CandidateProvenance]) -> ProvenanceResponse:
+    return ProvenanceResponse(
+        candidate_id=candidate.id,
+        records=[
+            ProvenanceRecord(
+                feature_name=entry.feature_name,
+                source=entry.source,
+                as_of_date=entry.as_of_date,
+                latency_days=entry.latency_days,
             )
+            for entry in entries
+        ],
+    )
+
+
+def backtest_summary_statement(field: str | None = None) -> Select:
+    """Pool the per-year backtest rows per field, over the years that had a laureate."""
+    query = (
+        select(
+            BacktestMetric.field,
+            (func.sum(BacktestMetric.hits_at_10) * 1.0 / func.sum(BacktestMetric.laureate_count)).label("hit_at_10"),
+            func.avg(BacktestMetric.average_precision).label("auc_pr"),
+            (
+                func.sum(BacktestMetric.brier_score * BacktestMetric.candidate_count)
+                / func.sum(BacktestMetric.candidate_count)
+            ).label("brier_score"),
+            func.min(BacktestMetric.as_of_year).label("first_year"),
+            func.max(BacktestMetric.as_of_year).label("last_year"),
+        )
+        .group_by(BacktestMetric.field)
+        .having(func.sum(BacktestMetric.laureate_count) > 0)
+        .order_by(BacktestMetric.field)
+    )
+    if field:
+        query = query.where(BacktestMetric.field == field)
+    return query
+
+
+def _read_backtests(path: Path) -> List[BacktestMetricSchema]:
+    with path.open("r", encoding="utf-8") as f:
+        rows = json.load(f)
+    return [
+        BacktestMetricSchema(
+            field=row["field"],
+            hit_at_10=row["hit_at_10"],
+            auc_pr=row["auc_pr"],
+            brier_score=row["brier_score"],
+            years_covered=tuple(row["years_covered"]),
+        )
+        for row in rows
+    ]
+
+
+class PredictionService:
+    def get_shortlist(
+        self, field: str, horizon: str, limit: int = SHORTLIST_LIMIT, cursor: Optional[str] = None
+    ) -> ShortlistPage:
+        with db_read_session() as session:
+            return query_shortlist_page(session, field, horizon, limit=limit, cursor=cursor)
+
+    async def get_shortlist_async(
+        self, field: str, horizon: str, limit: int = SHORTLIST_LIMIT, cursor: Optional[str] = None
+    ) -> ShortlistPage:
+        # Without aiosqlite, database reads run on Starlette's thread pool like a sync route, so they
+        # never queue behind report exports on the bounded executor.
+        if async_read_engine is None:
+            return await run_in_threadpool(self.get_shortlist, field, horizon, limit=limit, cursor=cursor)
+        query = shortlist_statement(field, horizon, limit=limit, cursor=cursor)
+        async with async_db_read_connection() as connection:
+            rows = (await connection.execute(query)).all()
+        return _page_from_rows(rows, limit, with_attributions=True)
+
+    def get_candidate_detail(self, candidate_id: int) -> CandidateDetailSchema | None:
+        with db_read_session() as session:
+            candidate = session.scalars(candidate_statement(candidate_id)).one_or_none()
+            snapshot = session.scalars(latest_snapshot_statement(candidate_id)).first() if candidate else None
+        return _candidate_detail(candidate, snapshot)
+
+    async def get_candidate_detail_async(self, candidate_id: int) -> CandidateDetailSchema | None:
+        if async_read_engine is None:
+            return await run_in_threadpool(self.get_candidate_detail, candidate_id)
+        async with async_db_read_session() as session:
+            candidate = (await session.scalars(candidate_statement(candidate_id))).one_or_none()
+            snapshot = (await session.scalars(latest_snapshot_statement(candidate_id))).first() if candidate else None
+        return _candidate_detail(candidate, snapshot)
 
     def get_backtests(self, field: str | None) -> List[BacktestMetricSchema]:
+        """Metrics from the latest backtest run, or the seed figures until one has produced any."""
+        with db_read_session() as session:
+            rows = session.execute(backtest_summary_statement(field)).all()
+        if rows:
+            return [
+                BacktestMetricSchema(
+                    field=row.field,
+                    hit_at_10=row.hit_at_10,
+                    auc_pr=row.auc_pr,
+                    brier_score=row.brier_score,
+                    years_covered=(row.first_year, row.last_year),
+                )
+                for row in rows
+            ]
         backtests_path = settings.data_dir / "seed" / "backtests.json"
-        if not backtests_path.exists():
+        try:
+            metrics = file_cache.load(backtests_path, _read_backtests)
+        except FileNotFoundError:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Backtest metrics are not available yet.",
-            )
-        df = pd.read_json(backtests_path)
-        if field:
-            df = df[df["field"] == field]
-        results = []
-        for row in df.to_dict(orient="records"):
-            results.append(
-                BacktestMetricSchema(
-                    field=row["field"],
-                    hit_at_10=row["hit_at_10"],
-                    auc_pr=row["auc_pr"],
-                    brier_score=row["brier_score"],
-                    years_covered=tuple(row["years_covered"]),
-                )
-            )
-        return results
+            ) from None
+        return [metric for metric in metrics if not field or metric.field == field]
+
+    async def get_backtests_async(self, field: str | None) -> List[BacktestMetricSchema]:
+        return await run_in_threadpool(self.get_backtests, field)
 
     def get_provenance(self, candidate_id: int) -> ProvenanceResponse:
-        with db_session() as session:
-            candidate = session.query(Candidate).filter_by(id=candidate_id).one()
-        provenance_path = settings.data_dir / "seed" / "provenance.json"
-        with provenance_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        records = []
-        for record in data.get(candidate.openalex_id, []):
-            records.append(
-                ProvenanceRecord(
-                    feature_name=record["feature_name"],
-                    source=record["source"],
-                    as_of_date=datetime.fromisoformat(record["as_of_date"]),
-                    latency_days=record["latency_days"],
-                )
+        with db_read_session() as session:
+            candidate = session.scalars(candidate_statement(candidate_id)).one()
+            entries = session.scalars(provenance_statement(candidate.openalex_id)).all()
+        return _provenance_response(candidate, entries)
+
+    async def get_provenance_async(self, candidate_id: int) -> ProvenanceResponse:
+        if async_read_engine is None:
+            return await run_in_threadpool(self.get_provenance, candidate_id)
+        async with async_db_read_session() as session:
+            candidate = (await session.scalars(candidate_statement(candidate_id))).one()
+            entries = (await session.scalars(provenance_statement(candidate.openalex_id))).all()
+        return _provenance_response(candidate, entries)
+
+    def score(self, field: str, rows: List[dict[str, float]]) -> ScoreResponse:
+        """Score what-if feature rows with the field's current model, without touching the database."""
+        try:
+            scorer = scorer_cache.for_field(field)
+        except (FileNotFoundError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail=f"No trained model for field {field!r}"
+            ) from None
+        missing = sorted({name for row in rows for name in scorer.features if name not in row})
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Rows are missing features: {', '.join(missing)}",
             )
-        return ProvenanceResponse(candidate_id=candidate.id, records=records)
+        columns = {name: [row[name] for row in rows] for name in scorer.features}
+        return ScoreResponse(field=field, model_version=scorer.version, probabilities=list(scorer.score(columns)))
+
+    async def score_async(self, field: str, rows: List[dict[str, float]]) -> ScoreResponse:
+        return await run_blocking(self.score, field, rows)
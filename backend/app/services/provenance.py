@@ -0,0 +1,43 @@
+"""Feature provenance, moved from the seed ``provenance.json`` into the ``provenance_records`` table.
+
+The file maps OpenAlex ids to their feature sources.  Loading it into an
+indexed table lets the API answer one candidate's lookup with an index seek
+instead of parsing the whole corpus per request.
+"""
+import json
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from app.models.nobel import CandidateProvenance
+
+PROVENANCE_BATCH_SIZE = 5_000
+
+
+def _provenance_rows(path: Path) -> Iterator[dict]:
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    for openalex_id, records in data.items():
+        for record in records:
+            yield {
+                "openalex_id": openalex_id,
+                "feature_name": record["feature_name"],
+                "source": record["source"],
+                "as_of_date": datetime.fromisoformat(record["as_of_date"]),
+                "latency_days": record["latency_days"],
+            }
+
+
+def replace_provenance(session: Session, path: Path) -> int:
+    """Replace every stored provenance record with the contents of ``path``; returns the rows written."""
+    session.execute(delete(CandidateProvenance))
+    rows = _provenance_rows(path)
+    written = 0
+    while batch := list(islice(rows, PROVENANCE_BATCH_SIZE)):
+        session.execute(insert(CandidateProvenance), batch)
+        written += len(batch)
+    return written
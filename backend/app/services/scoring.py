@@ -0,0 +1,55 @@
+"""Compiled scorers for the trained field models, cached per ``(field, model version)``.
+
+Training stores one model per field as ``<model_dir>/<field>/model.json``.
+The file is parsed once per change (through :data:`file_cache`) and compiled
+once per version, so the training flow and ``POST /predictions/score`` share
+the same scorer until the field is retrained.
+"""
+import json
+import re
+from pathlib import Path
+from threading import Lock
+
+from app.core.config import get_settings
+from app.services.model_engine import CompiledScorer, model_version
+from app.utils.file_cache import file_cache
+
+settings = get_settings()
+
+
+def model_path(field: str) -> Path:
+    slug = field.lower().replace(" ", "_")
+    if not re.fullmatch(r"[a-z0-9_]+", slug):
+        raise ValueError(f"Invalid field name {field!r}")
+    return settings.model_dir / slug / "model.json"
+
+
+def _read_model(path: Path) -> dict:
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ScorerCache:
+    """Compiled scorers keyed on ``(field, model version)``; each field keeps only its latest version."""
+
+    def __init__(self) -> None:
+        self._scorers: dict[tuple[str, str], CompiledScorer] = {}
+        self._lock = Lock()
+
+    def get(self, field: str, model: dict) -> CompiledScorer:
+        key = (field, model_version(model))
+        scorer = self._scorers.get(key)
+        if scorer is None:
+            scorer = CompiledScorer(model)
+            with self._lock:
+                for stale in [cached for cached in self._scorers if cached[0] == field]:
+                    del self._scorers[stale]
+                self._scorers[key] = scorer
+        return scorer
+
+    def for_field(self, field: str) -> CompiledScorer:
+        """Return the scorer for a field's current model; raises ``FileNotFoundError`` if it has none."""
+        return self.get(field, file_cache.load(model_path(field), _read_model))
+
+
+scorer_cache = ScorerCache()
@@ -0,0 +1,223 @@
+"""Materialized shortlist artifacts published by training and served from memory.
+
+Each training run that changes predictions publishes a version directory under
+``shortlists/`` holding one file per ``(field, horizon)``: the first page of
+the shortlist response, already serialized to JSON, with the cursor of the
+page after it recorded in the version manifest.  A ``CURRENT`` pointer file
+names the live version and is replaced atomically, so readers never observe a
+partially written version.
+
+``ShortlistStore`` keeps the live version in memory.  A lookup stats the
+pointer file and, when it changed, loads the new version and swaps it in with a
+single reference assignment; requests are otherwise answered without touching
+the database.
+
+The ETL stamps ``DATA_VERSION`` whenever it rewrites candidate rows, so caches
+built from the database (reports) can tell a data change from a new shortlist.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import NamedTuple, Optional
+from uuid import uuid4
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.core.database import db_read_session
+from app.models.nobel import Candidate, Prediction
+from app.services.prediction_service import query_shortlist_page
+
+settings = get_settings()
+
+SHORTLIST_DIR = settings.model_dir / "shortlists"
+POINTER_NAME = "CURRENT"
+DATA_VERSION_PATH = settings.data_dir / "DATA_VERSION"
+KEEP_VERSIONS = 2
+# Bump when the artifact layout changes; versions in an older format are ignored and republished.
+ARTIFACT_FORMAT = 1
+
+
+def _artifact_name(field: str, horizon: str) -> str:
+    return f"{field.lower().replace(' ', '_')}__{horizon}.json"
+
+
+def new_version() -> str:
+    return f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid4().hex[:8]}"
+
+
+def publish_shortlists(version: str, root: Path = SHORTLIST_DIR) -> Path:
+    """Materialize every ``(field, horizon)`` shortlist as ``version`` and make it current."""
+    target = root / version
+    staging = root / f".{version}.tmp"
+    staging.mkdir(parents=True, exist_ok=True)
+    entries = {}
+    with db_read_session() as session:
+        pairs = session.execute(
+            select(Candidate.field, Prediction.horizon)
+            .join(Prediction, Prediction.candidate_id == Candidate.id)
+            .distinct()
+        ).all()
+        for field, horizon in pairs:
+            page = query_shortlist_page(session, field, horizon)
+            name = _artifact_name(field, horizon)
+            payload = b"[" + b",".join(row.json().encode("utf-8") for row in page.items) + b"]"
+            (staging / name).write_bytes(payload)
+            entries[name] = {
+                "field": field,
+                "horizon": horizon,
+                "rows": len(page.items),
+                "next_cursor": page.next_cursor,
+            }
+    with (staging / "manifest.json").open("w", encoding="utf-8") as f:
+        json.dump({"format": ARTIFACT_FORMAT, "version": version, "entries": entries}, f, indent=2, sort_keys=True)
+    os.replace(staging, target)
+
+    pointer = root / POINTER_NAME
+    temporary = pointer.with_suffix(".tmp")
+    temporary.write_text(version, encoding="utf-8")
+    os.replace(temporary, pointer)
+    prune_versions(root, keep=version)
+    return target
+
+
+def prune_versions(root: Path, keep: str) -> None:
+    """Remove version directories under ``root`` beyond the newest ``KEEP_VERSIONS``, never ``keep``."""
+    versions = sorted(
+        (path for path in root.iterdir() if path.is_dir() and not path.name.startswith(".")),
+        key=lambda path: path.stat().st_mtime_ns,
+    )
+    for path in versions[:-KEEP_VERSIONS]:
+        if path.name != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def record_data_version(path: Path = DATA_VERSION_PATH) -> str:
+    """Stamp a new data version after candidate rows change, replacing the file atomically."""
+    version = new_version()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(version, encoding="utf-8")
+    os.replace(temporary, path)
+    return version
+
+
+def data_version(path: Path = DATA_VERSION_PATH) -> Optional[str]:
+    """Return the last stamped data version, or ``None`` before the first ETL run stamps one."""
+    try:
+        return path.read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _read_manifest(directory: Path) -> Optional[dict]:
+    with (directory / "manifest.json").open("r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return manifest if manifest.get("format") == ARTIFACT_FORMAT else None
+
+
+def current_version(root: Path = SHORTLIST_DIR) -> Optional[str]:
+    """Return the live version, or ``None`` when none is published in the current format."""
+    try:
+        version = (root / POINTER_NAME).read_text(encoding="utf-8").strip()
+        return version if version and _read_manifest(root / version) is not None else None
+    except FileNotFoundError:
+        return None
+
+
+class PublishedShortlist(NamedTuple):
+    version: str
+    payload: bytes
+    next_cursor: Optional[str]
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    version: str
+    stamp: tuple[int, int]
+    pages: dict[tuple[str, str], tuple[bytes, Optional[str]]]
+
+
+class ShortlistStore:
+    """In-memory view of the current shortlist version."""
+
+    def __init__(self, root: Path = SHORTLIST_DIR):
+        self.root = root
+        self._snapshot: Optional[_Snapshot] = None
+        self._lock = Lock()
+
+    def _pointer_stamp(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = (self.root / POINTER_NAME).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino
+
+    def _load(self, stamp: tuple[int, int]) -> Optional[_Snapshot]:
+        try:
+            version = (self.root / POINTER_NAME).read_text(encoding="utf-8").strip()
+            directory = self.root / version
+            manifest = _read_manifest(directory)
+            if manifest is None:
+                return None
+            pages = {
+                (entry["field"], entry["horizon"]): ((directory / name).read_bytes(), entry["next_cursor"])
+                for name, entry in manifest["entries"].items()
+            }
+        except FileNotFoundError:
+            # The version was pruned between reading the pointer and its files; retry on the next lookup.
+            return None
+        return _Snapshot(version=version, stamp=stamp, pages=pages)
+
+    def current(self) -> Optional[_Snapshot]:
+        stamp = self._pointer_stamp()
+        snapshot = self._snapshot
+        if stamp is None:
+            return None
+        if snapshot is not None and snapshot.stamp == stamp:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.stamp != stamp:
+                loaded = self._load(stamp)
+                if loaded is not None:
+                    self._snapshot = loaded
+            return self._snapshot
+
+    def get(self, field: str, horizon: str) -> Optional[PublishedShortlist]:
+        """Return the first page of a shortlist, or ``None`` when nothing is published.
+
+        A published version covers every field and horizon that has
+        predictions, so a pair missing from it has an empty shortlist.
+        """
+        snapshot = self.current()
+        return _published_page(snapshot, field, horizon) if snapshot is not None else None
+
+    async def get_async(self, field: str, horizon: str) -> Optional[PublishedShortlist]:
+        """Async :meth:`get` that never waits on the blocking executor.
+
+        The pointer is stat-ed on the event loop and a cached version is served
+        from memory; only a newly published version is read, on Starlette's
+        thread pool, so shortlist lookups never queue behind report exports.
+        """
+        stamp = self._pointer_stamp()
+        snapshot = self._snapshot
+        if stamp is None:
+            return None
+        if snapshot is None or snapshot.stamp != stamp:
+            return await run_in_threadpool(self.get, field, horizon)
+        return _published_page(snapshot, field, horizon)
+
+
+def _published_page(snapshot: _Snapshot, field: str, horizon: str) -> PublishedShortlist:
+    payload, next_cursor = snapshot.pages.get((field, horizon), (b"[]", None))
+    return PublishedShortlist(snapshot.version, payload, next_cursor)
+
+
+shortlist_store = ShortlistStore()
@@ -0,0 +1,61 @@
+"""Staging feature tables shared by the ETL and modeling flows.
+
+Each field's feature table is written once by the seed ETL and read back by
+data quality and training.  The default on-disk format is the shim's binary
+columnar layout, which loads numeric columns without text parsing; CSV remains
+available through ``Settings.staging_format`` for ad-hoc inspection.
+"""
+from pathlib import Path
+
+import pandas as pd
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+FEATURE_TABLE_DTYPES = {
+    "openalex_id": str,
+    "field": str,
+    "is_laureate": bool,
+    "as_of_year": int,
+    "total_citations": int,
+    "h_index": float,
+    "recent_trend": float,
+    "seminal_score": float,
+    "award_count": int,
+}
+
+STAGING_SUFFIXES = {"columnar": ".npcol", "csv": ".csv"}
+
+
+def staging_suffix(staging_format: str | None = None) -> str:
+    staging_format = staging_format or settings.staging_format
+    try:
+        return STAGING_SUFFIXES[staging_format]
+    except KeyError:
+        raise ValueError(f"Unsupported staging format: {staging_format!r}") from None
+
+
+def feature_table_path(field_slug: str, staging_format: str | None = None) -> Path:
+    return settings.data_dir / "staging" / f"{field_slug}_features{staging_suffix(staging_format)}"
+
+
+def is_columnar(path: Path) -> bool:
+    return path.suffix == STAGING_SUFFIXES["columnar"]
+
+
+def write_feature_table(df: pd.DataFrame, path: Path) -> Path:
+    df = df.astype({column: dtype for column, dtype in FEATURE_TABLE_DTYPES.items() if column in df})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if is_columnar(path):
+        df.to_columnar(path)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def read_feature_table(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    if is_columnar(path):
+        return pd.read_columnar(path, columns=columns)
+    return pd.read_csv(path, dtype=FEATURE_TABLE_DTYPES, usecols=columns)
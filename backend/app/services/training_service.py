@@ -1,5 +1,7 @@
 from app.flows.etl import run_seed_etl
 from app.flows.modeling import run_model_training
+from app.services.job_service import job_queue
+from app.utils.prefect_compat import get_run_log
 
 
 class TrainingService:
@@ -7,6 +9,24 @@ class TrainingService:
         result = run_seed_etl()
         return result
 
-    def train_models(self) -> dict:
-        result = run_model_training()
+    def train_models(self, force: bool = False) -> dict:
+        result = run_model_training(force=force)
         return result
+
+    def enqueue_etl(self) -> tuple[dict, bool]:
+        return job_queue.submit("etl")
+
+    def enqueue_training(self, force: bool = False) -> tuple[dict, bool]:
+        return job_queue.submit("model", {"force": force})
+
+    def enqueue_backtest(self) -> tuple[dict, bool]:
+        return job_queue.submit("backtest")
+
+    def get_job(self, job_id: str) -> dict | None:
+        return job_queue.get(job_id)
+
+    def list_runs(self, limit: int = 20, flow_name: str | None = None) -> list[dict]:
+        run_log = get_run_log()
+        if run_log is None:
+            return []
+        return run_log.latest(limit=limit, flow_name=flow_name)
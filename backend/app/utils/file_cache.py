@@ -0,0 +1,41 @@
+"""Parse-once cache for data files read on request paths."""
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class FileCache:
+    """Cache parsed file contents keyed on ``(path, parser)``.
+
+    An entry is reused while the file's ``(st_mtime_ns, st_size)`` matches the
+    stat taken before it was parsed, and parsed again once either changes.
+    Values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[Path, Callable[[Path], Any]], tuple[tuple[int, int], Any]] = {}
+        self._lock = Lock()
+
+    def load(self, path: Path, parser: Callable[[Path], T]) -> T:
+        """Return ``parser(path)``, parsing only when the file changed; raises ``FileNotFoundError``."""
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (path, parser)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        value = parser(path)
+        with self._lock:
+            self._entries[key] = (stamp, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+file_cache = FileCache()
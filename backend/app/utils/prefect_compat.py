@@ -5,6 +5,23 @@ signature as the Prefect 2.x equivalents that we rely on.  They simply return
 the wrapped function and record a few descriptive attributes so that the rest
 of the application can continue to call the decorated functions directly.
 
+Tasks declared with ``cache_key_fn`` get a real on-disk result cache, mirroring
+Prefect's caching semantics: the key combines the task's identity (module,
+name and source) with the key function's output, results are pickled under the
+configured ``task_cache_dir``, ``cache_expiration`` bounds their age, and the
+directory is kept under ``task_cache_max_bytes`` by evicting the least recently
+used entries.  ``task_input_hash`` hashes file inputs by content, so a task fed
+an unchanged seed or staging file is skipped.
+
+Tasks also expose Prefect's ``submit`` and ``map``, which return futures.  They
+run on the task runner of the enclosing flow (``SequentialTaskRunner``,
+``ConcurrentTaskRunner`` for I/O-bound work, ``ProcessPoolTaskRunner`` for
+CPU-bound work); outside a flow they run inline.
+
+Every flow call is recorded: each task call inside it gets a ``TaskRunRecord``
+(wall and CPU time, peak ``tracemalloc`` allocation, input and output sizes,
+its parent task) and the finished run is appended to a JSON-lines ``RunLog``.
+
 The aim is to avoid a heavy dependency on Prefect while preserving the public
 API expected by the flow modules.  Should the real Prefect package be installed
 later these wrappers can easily be replaced by the genuine decorators without
@@ -13,12 +30,31 @@ changing any call sites.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import contextvars
+import hashlib
+import inspect
+import io
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
 from functools import wraps
-from typing import Any, Callable, Optional, TypeVar, cast
+from pathlib import Path, PurePath
+from threading import Lock
+from typing import Any, Callable, Iterable, Optional, TypeVar, cast
+from uuid import uuid4
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class _WrapperMetadata:
@@ -28,25 +64,606 @@ class _WrapperMetadata:
     kind: str
 
 
+@dataclass
+class TaskRunContext:
+    """Subset of Prefect's ``TaskRunContext`` handed to ``cache_key_fn``."""
+
+    task_name: str
+    task_key: str
+
+
 def _attach_metadata(func: F, *, name: Optional[str], kind: str) -> F:
     metadata = _WrapperMetadata(name=name or func.__name__, kind=kind)
     setattr(func, "_prefect_metadata", metadata)
     return func
 
 
-def task(func: Optional[F] = None, *, name: Optional[str] = None, **_: Any) -> F | Callable[[F], F]:
-    """Return a decorator that simply preserves the wrapped function.
+def _file_digest(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+class _MissingPath(Exception):
+    pass
+
+
+class _InputPickler(pickle.Pickler):
+    """Pickler that replaces paths with their location and content hash."""
+
+    def persistent_id(self, obj: Any) -> Any:
+        if isinstance(obj, PurePath):
+            path = Path(obj)
+            if path.is_file():
+                return ("path", str(path), _file_digest(path))
+            if not path.exists():
+                raise _MissingPath(str(path))
+            return ("path", str(path), None)
+        return None
+
+
+def task_input_hash(context: TaskRunContext, parameters: dict[str, Any]) -> Optional[str]:
+    """Hash a task's bound parameters; files are hashed by content, not by name alone.
+
+    Returns ``None`` (no caching) when a parameter cannot be pickled, or names
+    a path that does not exist: such a task is about to create the file, and a
+    cached result would skip the write.
+    """
+    buffer = io.BytesIO()
+    try:
+        _InputPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(sorted(parameters.items()))
+    except (pickle.PicklingError, TypeError, AttributeError, _MissingPath):
+        return None
+    return hashlib.sha256(buffer.getvalue()).hexdigest()
+
+
+def _task_key(func: Callable[..., Any]) -> str:
+    """Identify a task by module, qualified name and source, so code edits invalidate its cache."""
+    try:
+        source = inspect.getsource(func).encode("utf-8")
+    except (OSError, TypeError):
+        source = func.__code__.co_code
+    digest = hashlib.sha256(source).hexdigest()[:16]
+    return f"{func.__module__}.{func.__qualname__}-{digest}"
+
+
+class ResultCache:
+    """Pickled task results on disk with expiration and size-bounded LRU eviction.
+
+    Entry files are replaced atomically; a hit refreshes the entry's mtime, which
+    is the recency used for eviction.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.pkl"
+
+    def get(self, key: str, expiration: Optional[timedelta]) -> tuple[bool, Any]:
+        path = self._entry_path(key)
+        try:
+            with path.open("rb") as handle:
+                created_at, value = pickle.load(handle)
+        except FileNotFoundError:
+            return False, None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+            path.unlink(missing_ok=True)
+            return False, None
+        if expiration is not None and time.time() - created_at > expiration.total_seconds():
+            path.unlink(missing_ok=True)
+            return False, None
+        os.utime(path)
+        return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            payload = pickle.dumps((time.time(), value), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            logger.warning("Result for %s is not picklable; skipping cache", key)
+            return
+        if len(payload) > self.max_bytes:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(key)
+        temporary = path.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_bytes(payload)
+        os.replace(temporary, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for path in self.directory.glob("*.pkl"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+
+
+_result_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Return the process-wide result cache, or ``None`` when caching is disabled."""
+    global _result_cache
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    if not settings.task_cache_enabled:
+        return None
+    if _result_cache is None:
+        _result_cache = ResultCache(settings.task_cache_dir, settings.task_cache_max_bytes)
+    return _result_cache
+
+
+def _size_of(value: Any) -> Any:
+    """Describe a task input or output by size: rows for frames, items for collections, bytes for files."""
+    if isinstance(value, PurePath):
+        path = Path(value)
+        return {"bytes": path.stat().st_size} if path.is_file() else None
+    if isinstance(value, tuple):
+        return [_size_of(item) for item in value]
+    if hasattr(value, "columns") and hasattr(value, "__len__"):
+        return {"rows": len(value), "columns": len(value.columns)}
+    if isinstance(value, (list, dict, set, frozenset)) or hasattr(value, "tolist"):
+        return {"items": len(value)}
+    return None
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class TaskRunRecord:
+    """Measurements for one task call within a flow run."""
+
+    task_run_id: str
+    task_name: str
+    parent_task_run_id: Optional[str]
+    started_at: str
+    inputs: dict[str, Any] = field(default_factory=dict)
+    output: Any = None
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_memory_bytes: Optional[int] = None
+    cached: bool = False
+    state: str = "running"
+    error: Optional[str] = None
+
+
+class FlowRun:
+    """Task records collected during one flow call; shared by the flow's worker threads."""
+
+    def __init__(self, flow_name: str, trace_memory: bool):
+        self.run_id = uuid4().hex
+        self.flow_name = flow_name
+        self.trace_memory = trace_memory
+        self.tasks: list[TaskRunRecord] = []
+        self._lock = Lock()
+
+    def add(self, records: Iterable[TaskRunRecord]) -> None:
+        with self._lock:
+            self.tasks.extend(records)
+
+
+class _PeakTracker:
+    """Peak traced memory over a span.
+
+    ``tracemalloc`` keeps one process-wide peak, so every span folds the peak
+    seen so far into its parent before resetting it.  Spans running
+    concurrently on other threads share that peak, which makes their figures
+    an upper bound.
+    """
+
+    def __init__(self, parent: Optional["_PeakTracker"]):
+        self.parent = parent
+        current, peak = tracemalloc.get_traced_memory()
+        if parent is not None:
+            parent.peak = max(parent.peak, peak)
+        tracemalloc.reset_peak()
+        self.baseline = self.peak = current
+
+    def close(self) -> int:
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        if self.parent is not None:
+            self.parent.peak = max(self.parent.peak, self.peak)
+        return self.peak - self.baseline
+
+
+@dataclass
+class _Span:
+    task_run_id: Optional[str]
+    memory: Optional[_PeakTracker]
+
+
+class _MemoryTracing:
+    """Reference-counted ``tracemalloc`` start/stop that leaves externally started tracing alone."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._users = 0
+        self._owned = False
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owned = True
+            self._users += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._users -= 1
+            if self._users == 0 and self._owned:
+                tracemalloc.stop()
+                self._owned = False
+
+
+_memory_tracing = _MemoryTracing()
+_active_flow_run: contextvars.ContextVar[Optional[FlowRun]] = contextvars.ContextVar("active_flow_run", default=None)
+_active_span: contextvars.ContextVar[Optional[_Span]] = contextvars.ContextVar("active_span", default=None)
+
+
+def _record_task(
+    flow_run: FlowRun,
+    task_name: str,
+    signature: inspect.Signature,
+    execute: Callable[[tuple, dict[str, Any]], tuple[Any, bool]],
+    args: tuple,
+    kwargs: dict[str, Any],
+) -> Any:
+    try:
+        arguments = signature.bind(*args, **kwargs).arguments
+    except TypeError:
+        arguments = {}
+    parent = _active_span.get()
+    record = TaskRunRecord(
+        task_run_id=uuid4().hex,
+        task_name=task_name,
+        parent_task_run_id=parent.task_run_id if parent is not None else None,
+        started_at=_utcnow(),
+        inputs={name: size for name, value in arguments.items() if (size := _size_of(value)) is not None},
+    )
+    flow_run.add([record])
+    memory = _PeakTracker(parent.memory if parent is not None else None) if tracemalloc.is_tracing() else None
+    token = _active_span.set(_Span(record.task_run_id, memory))
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        result, record.cached = execute(args, kwargs)
+    except BaseException as exc:
+        record.state = "failed"
+        record.error = f"{type(exc).__name__}: {exc}"
+        raise
+    else:
+        record.state = "completed"
+        record.output = _size_of(result)
+        return result
+    finally:
+        record.wall_seconds = time.perf_counter() - wall_start
+        record.cpu_seconds = time.thread_time() - cpu_start
+        if memory is not None:
+            record.peak_memory_bytes = memory.close()
+        _active_span.reset(token)
+
+
+@dataclass
+class _WorkerOutcome:
+    value: Any
+    error: Optional[BaseException]
+    records: list[TaskRunRecord]
+
+
+def _call_in_worker(
+    task_fn: Callable[..., Any],
+    args: tuple,
+    kwargs: dict[str, Any],
+    parent_task_run_id: Optional[str],
+    trace_memory: bool,
+) -> _WorkerOutcome:
+    """Run a task in a pool process, returning its records alongside the result for the parent's flow run."""
+    flow_run = FlowRun("worker", trace_memory)
+    if trace_memory:
+        _memory_tracing.acquire()
+    run_token = _active_flow_run.set(flow_run)
+    span_token = _active_span.set(_Span(parent_task_run_id, None))
+    try:
+        return _WorkerOutcome(task_fn(*args, **kwargs), None, flow_run.tasks)
+    except Exception as exc:  # noqa: BLE001 - re-raised in the parent by _merge_worker_outcome
+        return _WorkerOutcome(None, exc, flow_run.tasks)
+    finally:
+        _active_span.reset(span_token)
+        _active_flow_run.reset(run_token)
+        if trace_memory:
+            _memory_tracing.release()
+
+
+def _merge_worker_outcome(future: Future, flow_run: FlowRun) -> Future:
+    merged: Future = Future()
+
+    def done(completed: Future) -> None:
+        try:
+            outcome = completed.result()
+        except BaseException as exc:  # noqa: BLE001 - surfaced through merged.result()
+            merged.set_exception(exc)
+            return
+        flow_run.add(outcome.records)
+        if outcome.error is not None:
+            merged.set_exception(outcome.error)
+        else:
+            merged.set_result(outcome.value)
+
+    future.add_done_callback(done)
+    return merged
+
+
+class RunLog:
+    """Append-only JSON-lines log of flow runs, rotated to ``<name>.1`` past ``max_bytes``."""
+
+    def __init__(self, path: Path, max_bytes: int, trace_memory: bool = False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.trace_memory = trace_memory
+        self._lock = Lock()
+
+    def append(self, run: dict[str, Any]) -> None:
+        line = json.dumps(run, default=str) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists() and self.path.stat().st_size + len(line) > self.max_bytes:
+                os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+
+    def latest(self, limit: int = 20, flow_name: Optional[str] = None) -> list[dict[str, Any]]:
+        """Return up to ``limit`` recorded runs, newest first."""
+        if not self.path.exists():
+            return []
+        with self.path.open("r", encoding="utf-8") as handle:
+            runs = (json.loads(line) for line in handle if line.strip())
+            matching = (run for run in runs if flow_name is None or run["flow_name"] == flow_name)
+            return list(reversed(deque(matching, maxlen=limit)))
+
+
+_run_log: Optional[RunLog] = None
+
+
+def get_run_log() -> Optional[RunLog]:
+    """Return the process-wide run log, or ``None`` when run recording is disabled."""
+    global _run_log
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    if not settings.run_log_enabled:
+        return None
+    if _run_log is None:
+        _run_log = RunLog(settings.run_log_path, settings.run_log_max_bytes, settings.run_log_trace_memory)
+    return _run_log
+
+
+class TaskRunner:
+    """Executes submitted task calls; each flow run works on its own ``duplicate``."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._executor: Optional[Executor] = None
+
+    def duplicate(self) -> "TaskRunner":
+        return type(self)(max_workers=self.max_workers)
+
+    def _create_executor(self) -> Optional[Executor]:
+        return None
+
+    def submit(self, func: Callable[..., Any], args: tuple, kwargs: dict[str, Any]) -> Future:
+        if self._executor is None:
+            future: Future = Future()
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as exc:  # noqa: BLE001 - surfaced through future.result()
+                future.set_exception(exc)
+            return future
+        return self._executor.submit(func, *args, **kwargs)
+
+    def __enter__(self) -> "TaskRunner":
+        self._executor = self._create_executor()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class SequentialTaskRunner(TaskRunner):
+    """Runs every submitted task inline, one after another."""
+
+
+class ConcurrentTaskRunner(TaskRunner):
+    """Runs submitted tasks on a thread pool; suited to I/O-bound work."""
+
+    def _create_executor(self) -> Executor:
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task-runner")
+
+    def submit(self, func: Callable[..., Any], args: tuple, kwargs: dict[str, Any]) -> Future:
+        if self._executor is None:
+            return super().submit(func, args, kwargs)
+        # Carry the caller's context variables (e.g. the active flow run) into the worker thread.
+        return self._executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+class ProcessPoolTaskRunner(TaskRunner):
+    """Runs submitted tasks in worker processes; suited to CPU-bound work.
+
+    Workers are spawned rather than forked so they never inherit the locks of a
+    threaded parent such as the API server.  Tasks and their arguments must be
+    picklable, i.e. module-level decorated functions.
+    """
+
+    def _create_executor(self) -> Executor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+TASK_RUNNERS: dict[str, type[TaskRunner]] = {
+    "sequential": SequentialTaskRunner,
+    "thread": ConcurrentTaskRunner,
+    "process": ProcessPoolTaskRunner,
+}
+
+
+def task_runner_for(kind: str, max_workers: Optional[int] = None) -> TaskRunner:
+    try:
+        return TASK_RUNNERS[kind](max_workers=max_workers)
+    except KeyError:
+        raise ValueError(f"Unknown task runner {kind!r}; expected one of {sorted(TASK_RUNNERS)}") from None
+
+
+_active_task_runner: contextvars.ContextVar[Optional[TaskRunner]] = contextvars.ContextVar(
+    "active_task_runner", default=None
+)
+
+
+class PrefectFuture:
+    """Handle to a submitted task call, mirroring ``prefect.futures.PrefectFuture``."""
+
+    def __init__(self, future: Future, task_name: str):
+        self._future = future
+        self.task_name = task_name
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self._future.result(timeout=timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        self._future.exception(timeout=timeout)
+
+    def done(self) -> bool:
+        return self._future.done()
+
+
+class unmapped:  # noqa: N801 - mirrors ``prefect.unmapped``
+    """Mark an argument to ``task.map`` as shared by every mapped call."""
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def _resolve(value: Any) -> Any:
+    return value.result() if isinstance(value, PrefectFuture) else value
+
+
+def _submit(task_fn: Callable[..., Any], task_name: str, args: tuple, kwargs: dict[str, Any]) -> PrefectFuture:
+    runner = _active_task_runner.get() or SequentialTaskRunner()
+    args = tuple(_resolve(arg) for arg in args)
+    kwargs = {key: _resolve(value) for key, value in kwargs.items()}
+    flow_run = _active_flow_run.get()
+    if flow_run is not None and isinstance(runner, ProcessPoolTaskRunner):
+        parent = _active_span.get()
+        worker_args = (task_fn, args, kwargs, parent.task_run_id if parent else None, flow_run.trace_memory)
+        future = _merge_worker_outcome(runner.submit(_call_in_worker, worker_args, {}), flow_run)
+        return PrefectFuture(future, task_name)
+    return PrefectFuture(runner.submit(task_fn, args, kwargs), task_name)
+
+
+def _map(
+    task_fn: Callable[..., Any], task_name: str, args: tuple, kwargs: dict[str, Any]
+) -> list[PrefectFuture]:
+    def expand(value: Any) -> Optional[list[Any]]:
+        if isinstance(value, unmapped) or isinstance(value, (str, bytes, PurePath)):
+            return None
+        if isinstance(value, Iterable):
+            return list(value)
+        return None
+
+    expanded_args = [expand(arg) for arg in args]
+    expanded_kwargs = {key: expand(value) for key, value in kwargs.items()}
+    lengths = {len(values) for values in [*expanded_args, *expanded_kwargs.values()] if values is not None}
+    if len(lengths) != 1:
+        raise ValueError(f"{task_name}.map needs iterable arguments of one common length")
+    (length,) = lengths
+
+    def pick(value: Any, values: Optional[list[Any]], index: int) -> Any:
+        if values is not None:
+            return values[index]
+        return value.value if isinstance(value, unmapped) else value
+
+    return [
+        _submit(
+            task_fn,
+            task_name,
+            tuple(pick(arg, values, index) for arg, values in zip(args, expanded_args)),
+            {key: pick(kwargs[key], values, index) for key, values in expanded_kwargs.items()},
+        )
+        for index in range(length)
+    ]
+
+
+def task(
+    func: Optional[F] = None,
+    *,
+    name: Optional[str] = None,
+    cache_key_fn: Optional[Callable[[TaskRunContext, dict[str, Any]], Optional[str]]] = None,
+    cache_expiration: Optional[timedelta] = None,
+    refresh_cache: bool = False,
+    **_: Any,
+) -> F | Callable[[F], F]:
+    """Return a decorator that preserves the wrapped function.
 
     The Prefect ``task`` decorator accepts a large collection of keyword
-    arguments.  We only need to accept the call signature so we swallow extra
-    keyword arguments via ``**_`` and ignore them.
+    arguments.  Caching (``cache_key_fn``, ``cache_expiration`` and
+    ``refresh_cache``) is honoured; other keyword arguments are accepted via
+    ``**_`` and ignored.
     """
 
     def decorator(inner: F) -> F:
+        task_name = name or inner.__name__
+        signature = inspect.signature(inner)
+        task_key: Optional[str] = None
+
+        def execute(args: tuple, kwargs: dict[str, Any]) -> tuple[Any, bool]:
+            """Run the task through the result cache; returns the result and whether it was a cache hit."""
+            nonlocal task_key
+            cache = get_result_cache() if cache_key_fn is not None else None
+            if cache is None:
+                return inner(*args, **kwargs), False
+
+            task_key = task_key or _task_key(inner)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            input_key = cache_key_fn(TaskRunContext(task_name=task_name, task_key=task_key), dict(bound.arguments))
+            if input_key is None:
+                return inner(*args, **kwargs), False
+
+            cache_key = f"{task_key}-{input_key}"
+            if not refresh_cache:
+                hit, value = cache.get(cache_key, cache_expiration)
+                if hit:
+                    logger.debug("Cache hit for task %s", task_name)
+                    return value, True
+            result = inner(*args, **kwargs)
+            cache.set(cache_key, result)
+            return result, False
+
         @wraps(inner)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            return inner(*args, **kwargs)
+            flow_run = _active_flow_run.get()
+            if flow_run is None:
+                return execute(args, kwargs)[0]
+            return _record_task(flow_run, task_name, signature, execute, args, kwargs)
 
+        setattr(wrapper, "submit", lambda *args, **kwargs: _submit(wrapper, task_name, args, kwargs))
+        setattr(wrapper, "map", lambda *args, **kwargs: _map(wrapper, task_name, args, kwargs))
         return _attach_metadata(cast(F, wrapper), name=name, kind="task")
 
     if func is not None:
@@ -54,17 +671,68 @@ def task(func: Optional[F] = None, *, name: Optional[str] = None, **_: Any) -> F
     return decorator
 
 
-def flow(func: Optional[F] = None, *, name: Optional[str] = None, **_: Any) -> F | Callable[[F], F]:
-    """Return a decorator mirroring ``prefect.flow`` for our limited use."""
+def _run_flow(inner: Callable[..., Any], template: Optional[TaskRunner], args: tuple, kwargs: dict[str, Any]) -> Any:
+    with (template or SequentialTaskRunner()).duplicate() as runner:
+        token = _active_task_runner.set(runner)
+        try:
+            return inner(*args, **kwargs)
+        finally:
+            _active_task_runner.reset(token)
+
+
+def flow(
+    func: Optional[F] = None,
+    *,
+    name: Optional[str] = None,
+    task_runner: TaskRunner | Callable[[], TaskRunner] | None = None,
+    **_: Any,
+) -> F | Callable[[F], F]:
+    """Return a decorator mirroring ``prefect.flow`` for our limited use.
+
+    ``task_runner`` (an instance, or a factory called at each run so it can
+    read current settings) backs ``submit``/``map`` calls made inside the flow.
+    When the run log is enabled, the run and its task records are appended to
+    it once the flow returns or raises.
+    """
 
     def decorator(inner: F) -> F:
+        flow_name = name or inner.__name__
+
         @wraps(inner)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            return inner(*args, **kwargs)
+            template = task_runner() if callable(task_runner) else task_runner
+            run_log = get_run_log()
+            if run_log is None:
+                return _run_flow(inner, template, args, kwargs)
+
+            flow_run = FlowRun(flow_name, trace_memory=run_log.trace_memory)
+            run = {"run_id": flow_run.run_id, "flow_name": flow_name, "started_at": _utcnow(), "state": "completed"}
+            if flow_run.trace_memory:
+                _memory_tracing.acquire()
+            memory = _PeakTracker(None) if tracemalloc.is_tracing() else None
+            tokens = (_active_flow_run.set(flow_run), _active_span.set(_Span(None, memory)))
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            try:
+                return _run_flow(inner, template, args, kwargs)
+            except BaseException as exc:
+                run.update(state="failed", error=f"{type(exc).__name__}: {exc}")
+                raise
+            finally:
+                run.update(
+                    finished_at=_utcnow(),
+                    wall_seconds=time.perf_counter() - wall_start,
+                    cpu_seconds=time.process_time() - cpu_start,
+                    peak_memory_bytes=memory.close() if memory is not None else None,
+                    tasks=[asdict(record) for record in flow_run.tasks],
+                )
+                _active_span.reset(tokens[1])
+                _active_flow_run.reset(tokens[0])
+                if flow_run.trace_memory:
+                    _memory_tracing.release()
+                run_log.append(run)
 
         return _attach_metadata(cast(F, wrapper), name=name, kind="flow")
 
     if func is not None:
         return decorator(func)
     return decorator
-
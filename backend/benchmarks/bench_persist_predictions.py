@@ -0,0 +1,126 @@
+"""Benchmark bulk prediction persistence against the original ORM path.
+
+Creates a throwaway SQLite database with ``--rows`` candidates, then writes one
+prediction (plus five SHAP rows) per candidate twice:
+
+* ``orm``: ``session.add`` + ``session.flush`` per prediction, one ORM object
+  per attribution (the pre-bulk ``persist_predictions``),
+* ``bulk``: the current ``persist_predictions`` (pre-allocated ids, batched
+  executemany inserts in one transaction).
+
+Run from ``backend/``::
+
+    python benchmarks/bench_persist_predictions.py --rows 100000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from array import array
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_WORKDIR = Path(tempfile.mkdtemp(prefix="nobel-bench-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_WORKDIR / 'bench.db'}"
+os.environ["DATA_DIR"] = str(_WORKDIR / "data")
+os.environ["MODEL_DIR"] = str(_WORKDIR / "models")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sitecustomize  # noqa: E402,F401
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.database import db_session, engine  # noqa: E402
+from app.flows.modeling import FEATURE_COLUMNS, FieldPredictions, persist_predictions  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.nobel import Candidate, Prediction, ShapAttribution  # noqa: E402
+
+
+def _seed(rows: int) -> list[FieldPredictions]:
+    rng = random.Random(11)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with db_session() as session:
+        session.execute(
+            insert(Candidate),
+            [
+                {
+                    "openalex_id": f"B{index}",
+                    "full_name": f"Candidate {index}",
+                    "field": "Physics",
+                    "affiliation": "Bench University",
+                    "is_laureate": False,
+                }
+                for index in range(rows)
+            ],
+        )
+    return [
+        FieldPredictions(
+            field="Physics",
+            year=2024,
+            openalex_ids=[f"B{index}" for index in range(rows)],
+            probabilities={"one_year": array("d", (rng.random() for _ in range(rows)))},
+            feature_values={
+                feature: array("d", (rng.uniform(0, 100) for _ in range(rows))) for feature in FEATURE_COLUMNS
+            },
+            attributions={feature: array("d", (rng.gauss(0, 1) for _ in range(rows))) for feature in FEATURE_COLUMNS},
+        )
+    ]
+
+
+def persist_predictions_orm(predictions: list[FieldPredictions]) -> None:
+    with db_session() as session:
+        session.query(ShapAttribution).delete()
+        session.query(Prediction).delete()
+        session.flush()
+        candidate_map = {c.openalex_id: c for c in session.query(Candidate).all()}
+        for batch in predictions:
+            probabilities = batch.probabilities["one_year"]
+            for index, openalex_id in enumerate(batch.openalex_ids):
+                candidate = candidate_map.get(openalex_id)
+                if candidate is None or candidate.is_laureate:
+                    continue
+                prediction = Prediction(
+                    candidate_id=candidate.id,
+                    year=batch.year,
+                    horizon="one_year",
+                    probability=probabilities[index],
+                )
+                session.add(prediction)
+                session.flush()
+                for feature in FEATURE_COLUMNS:
+                    session.add(
+                        ShapAttribution(
+                            prediction_id=prediction.id,
+                            feature_name=feature,
+                            feature_value=batch.feature_values[feature][index],
+                            shap_value=batch.attributions[feature][index],
+                        )
+                    )
+
+
+def _time(label: str, func, predictions: list[FieldPredictions]) -> float:
+    start = time.perf_counter()
+    func(predictions)
+    elapsed = time.perf_counter() - start
+    rows = sum(map(len, predictions))
+    print(f"{label:<5} {elapsed:8.2f} s  {rows / elapsed:10.0f} predictions/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    predictions = _seed(args.rows)
+    print(f"predictions={args.rows:,} shap_rows={args.rows * len(FEATURE_COLUMNS):,} db={_WORKDIR}")
+    orm = _time("orm", persist_predictions_orm, predictions)
+    bulk = _time("bulk", persist_predictions, predictions)
+    print(f"speedup x{orm / bulk:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Micro-benchmark for the shim's Series arithmetic kernels.
+
+Compares three ways of computing the five-term weighted sum used by
+``generate_predictions`` over a 1M-row frame:
+
+* ``legacy``: the previous list-copying operators (``_coerce`` + zip generator),
+* ``operators``: the kernel-backed ``Series`` operators,
+* ``eval``: a single fused pass through ``DataFrame.eval``.
+
+Run from ``backend/``::
+
+    python benchmarks/bench_series_kernels.py --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd  # noqa: E402
+
+WEIGHTS = {
+    "total_citations": 0.000012,
+    "h_index": 0.002,
+    "recent_trend": 0.15,
+    "seminal_score": 0.08,
+    "award_count": 0.03,
+}
+
+
+def _legacy_coerce(left: list, other) -> list:
+    # Mirrors the pre-kernel ``Series._coerce``: the other operand is always
+    # copied, or materialized as ``[scalar] * n``.
+    return list(other) if isinstance(other, list) else [other] * len(left)
+
+
+def run_legacy(columns: dict[str, list]) -> list:
+    total: list | None = None
+    for feature, weight in WEIGHTS.items():
+        left = columns[feature]
+        term = list(a * b for a, b in zip(left, _legacy_coerce(left, weight)))
+        total = term if total is None else list(a + b for a, b in zip(total, _legacy_coerce(total, term)))
+    return total or []
+
+
+def run_operators(df: pd.DataFrame) -> pd.Series:
+    return (
+        WEIGHTS["total_citations"] * df["total_citations"]
+        + WEIGHTS["h_index"] * df["h_index"]
+        + WEIGHTS["recent_trend"] * df["recent_trend"]
+        + WEIGHTS["seminal_score"] * df["seminal_score"]
+        + WEIGHTS["award_count"] * df["award_count"]
+    )
+
+
+def run_eval(df: pd.DataFrame) -> pd.Series:
+    return df.eval(" + ".join(f"{weight!r} * {feature}" for feature, weight in WEIGHTS.items()))
+
+
+def _time(label: str, func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<10} {best * 1000:10.1f} ms")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    columns = {
+        "total_citations": [rng.randint(0, 200_000) for _ in range(args.rows)],
+        "h_index": [rng.uniform(0, 150) for _ in range(args.rows)],
+        "recent_trend": [rng.uniform(-1, 1) for _ in range(args.rows)],
+        "seminal_score": [rng.random() for _ in range(args.rows)],
+        "award_count": [rng.randint(0, 12) for _ in range(args.rows)],
+    }
+    df = pd.DataFrame(columns)
+
+    print(f"rows={args.rows:,} repeat={args.repeat} (best of)")
+    legacy = _time("legacy", lambda: run_legacy(columns), args.repeat)
+    operators = _time("operators", lambda: run_operators(df), args.repeat)
+    fused = _time("eval", lambda: run_eval(df), args.repeat)
+    print(f"speedup    operators x{legacy / operators:.2f}, eval x{legacy / fused:.2f}")
+
+    expected = run_legacy(columns)
+    assert all(abs(a - b) < 1e-9 for a, b in zip(expected, run_eval(df)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""In-process load test of the shortlist endpoint, sync routes against async routes.
+
+Builds a throwaway database from the seed data, then drives two apps with
+``--clients`` concurrent shortlist clients while ``--exporters`` clients keep
+requesting PDF exports:
+
+* ``sync``: the previous ``def`` routes, run on Starlette's shared thread pool
+  with the sync engine (exports and shortlists compete for the same threads),
+* ``async``: the current ``async def`` routes, which run shortlist queries on
+  Starlette's thread pool (or, with ``--async-reads``, through the
+  ``aiosqlite`` engine) and exports on the separate bounded blocking executor.
+
+Shortlist requests pass ``limit`` so they hit the database rather than the
+published in-memory artifact.  Reports p50/p99 shortlist latency and the
+throughput of both request kinds per mode.  Clients and server share one
+interpreter, so the figures show how requests are scheduled against each
+other, not multi-core scaling.
+
+Run from ``backend/``::
+
+    python benchmarks/load_test_shortlist.py --clients 200 --requests 20
+    python benchmarks/load_test_shortlist.py --clients 200 --requests 20 --async-reads
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_WORKDIR = Path(tempfile.mkdtemp(prefix="nobel-load-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_WORKDIR / 'load.db'}"
+os.environ["DATA_DIR"] = str(_WORKDIR / "data")
+os.environ["MODEL_DIR"] = str(_WORKDIR / "models")
+os.environ["RUN_LOG_ENABLED"] = "false"
+# The async engine is built when the app is imported, so the flag is read up front.
+if "--async-reads" in sys.argv:
+    os.environ["ASYNC_READS_ENABLED"] = "true"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import sitecustomize  # noqa: E402,F401
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import FileResponse  # noqa: E402
+
+from app.api.v1.predictions import shortlist as async_shortlist  # noqa: E402
+from app.api.v1.reports import shortlist_pdf as async_shortlist_pdf  # noqa: E402
+from app.core.concurrency import shutdown_executor  # noqa: E402
+from app.core.database import async_read_engine  # noqa: E402
+from app.flows.etl import run_seed_etl  # noqa: E402
+from app.flows.modeling import run_model_training  # noqa: E402
+from app.reports.generators import generate_pdf_report  # noqa: E402
+from app.services.bootstrap import bootstrap_state  # noqa: E402
+from app.services.prediction_service import PredictionService  # noqa: E402
+
+FIELD = "Literature"
+
+
+def build_sync_app() -> FastAPI:
+    app = FastAPI()
+    service = PredictionService()
+
+    @app.get("/shortlist")
+    def shortlist(field: str, horizon: str = "one_year", limit: int = 20):
+        return service.get_shortlist(field=field, horizon=horizon, limit=limit).items
+
+    @app.get("/shortlist.pdf")
+    def shortlist_pdf(field: str, horizon: str = "one_year"):
+        path = generate_pdf_report(field=field, horizon=horizon)
+        return FileResponse(path=path, media_type="application/pdf", filename=path.name)
+
+    return app
+
+
+def build_async_app() -> FastAPI:
+    app = FastAPI()
+    app.add_api_route("/shortlist", async_shortlist, methods=["GET"])
+    app.add_api_route("/shortlist.pdf", async_shortlist_pdf, methods=["GET"])
+    return app
+
+
+async def _run(app: FastAPI, clients: int, requests: int, exporters: int) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    exports: list[int] = []
+    done = asyncio.Event()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(app=app, base_url="http://load", limits=limits) as client:
+
+        async def shortlist_client() -> None:
+            for _ in range(requests):
+                started = time.perf_counter()
+                response = await client.get("/shortlist", params={"field": FIELD, "limit": 50})
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        async def exporter() -> None:
+            while not done.is_set():
+                (await client.get("/shortlist.pdf", params={"field": FIELD})).raise_for_status()
+                exports.append(1)
+
+        export_tasks = [asyncio.create_task(exporter()) for _ in range(exporters)]
+        await asyncio.gather(*(shortlist_client() for _ in range(clients)))
+        done.set()
+        await asyncio.gather(*export_tasks)
+    return latencies, len(exports)
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percentile) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20, help="shortlist requests per client")
+    parser.add_argument("--exporters", type=int, default=20, help="concurrent PDF export clients")
+    parser.add_argument("--async-reads", action="store_true", help="read shortlists through aiosqlite")
+    args = parser.parse_args()
+
+    bootstrap_state()
+    run_seed_etl()
+    run_model_training()
+
+    async def run_all() -> None:
+        print(f"clients={args.clients} requests/client={args.requests} exporters={args.exporters}")
+        for mode, app in (("sync", build_sync_app()), ("async", build_async_app())):
+            started = time.perf_counter()
+            latencies, exports = await _run(app, args.clients, args.requests, args.exporters)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{mode:<6} p50 {_percentile(latencies, 50) * 1000:8.1f} ms"
+                f"   p99 {_percentile(latencies, 99) * 1000:8.1f} ms"
+                f"   {len(latencies) / elapsed:6.0f} shortlists/s   {exports / elapsed:6.0f} exports/s"
+            )
+        if async_read_engine is not None:
+            await async_read_engine.dispose()
+
+    asyncio.run(run_all())
+    shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
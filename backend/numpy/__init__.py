@@ -3,10 +3,11 @@ from __future__ import annotations
 
 import math
 import random as _random
+from array import array
 from types import SimpleNamespace
 from typing import Sequence
 
-from pandas import Series
+from pandas import Series, _pack
 
 
 class _Generator:
@@ -23,12 +24,10 @@ random = SimpleNamespace(default_rng=default_rng)
 
 
 def exp(values: Sequence[float] | Series) -> Series:
-    if isinstance(values, Series):
-        source = values.tolist()
-    else:
-        source = list(values)
-    return Series(math.exp(value) for value in source)
+    source = values._values if isinstance(values, Series) else values
+    return Series._from_buffer(array("d", map(math.exp, source)), shared=False)
 
 
 def full(size: int, fill_value: float) -> Series:
-    return Series(fill_value for _ in range(size))
+    # Packed like a frame column: ints stay ints ('q'), floats are 'd', anything else a list.
+    return Series._from_buffer(_pack([fill_value]) * size, shared=False)
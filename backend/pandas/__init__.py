@@ -3,16 +3,47 @@
 This module provides the limited functionality required by the NobelPrediction
 backend without depending on the external pandas package. It supports the
 DataFrame operations that the ETL, modeling, and reporting flows rely on.
+
+Frames are stored column-wise: each column is a single buffer (a typed
+``array`` for all-int or all-float data, a plain list otherwise, so values
+keep their Python type).  Column
+access hands out the buffer without copying, boolean masks compress every
+column in one pass, and rows are only materialized by ``to_dict``, which, like pandas' record input,
+leaves out the keys a source record did not have.  Buffers
+are never mutated in place once shared; a ``Series`` copies its buffer before
+the first item assignment so frames and their copies stay independent.
+
+Arithmetic runs through small kernels: scalar operands are broadcast inside a
+generated comprehension instead of being materialized, column operands go
+through a C-level ``map``, and ``eval``/``DataFrame.eval`` fuse a whole
+expression into a single pass.  Kernel results are plain lists; they are packed
+into ``array('d')``/``array('q')`` once, when assigned into a frame.
+
+Besides CSV and JSON, frames round-trip through a small binary columnar format
+(``DataFrame.to_columnar``/``read_columnar``) whose numeric columns are raw
+array buffers loaded from a memory map without any text parsing.
 """
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import compress, islice, repeat, zip_longest
 from pathlib import Path
-from typing import Any, Iterable, Iterator, List, Sequence
+from typing import Any, Callable, Iterable, Iterator, Mapping, MutableSequence, Sequence, Sized
+import ast
+import builtins
 import csv
 import json
+import math
+import mmap
+import operator
+import os
+import struct
+import sys
 
 Scalar = float | int | str | bool | None
+Buffer = MutableSequence[Any]
 
 
 def _coerce_numeric(value: str | None) -> Scalar:
@@ -31,22 +62,215 @@ def _coerce_numeric(value: str | None) -> Scalar:
         return value
 
 
+def _pack(values: list[Any]) -> Buffer:
+    """Store all-int or all-float data in a typed array, anything else (mixed ints and floats too) as a list."""
+    if not values:
+        return values
+    kinds = set(map(type, values))
+    try:
+        if kinds == {float}:
+            return array("d", values)
+        if kinds == {int}:
+            return array("q", values)
+    except OverflowError:
+        pass
+    return values
+
+
+def _copy_buffer(buffer: Buffer) -> Buffer:
+    if isinstance(buffer, array):
+        return array(buffer.typecode, buffer)
+    return list(buffer)
+
+
+def _select(buffer: Buffer, mask: Sequence[Any]) -> Buffer:
+    if isinstance(buffer, array):
+        return array(buffer.typecode, compress(buffer, mask))
+    return list(compress(buffer, mask))
+
+
+# ---------------------------------------------------------------------------
+# Kernels
+# ---------------------------------------------------------------------------
+
+
+class _Broadcast:
+    """A scalar operand repeated ``length`` times without materializing a list."""
+
+    __slots__ = ("value", "length")
+
+    def __init__(self, value: Any, length: int):
+        self.value = value
+        self.length = length
+
+    def __iter__(self) -> Iterator[Any]:
+        return repeat(self.value, self.length)
+
+    def __len__(self) -> int:
+        return self.length
+
+
+_SYMBOLS = {
+    operator.add: "+",
+    operator.sub: "-",
+    operator.mul: "*",
+    operator.truediv: "/",
+    operator.eq: "==",
+    operator.ne: "!=",
+    operator.ge: ">=",
+    operator.gt: ">",
+    operator.le: "<=",
+    operator.lt: "<",
+}
+
+
+@lru_cache(maxsize=None)
+def _scalar_kernel(op: Callable[[Any, Any], Any], reflected: bool) -> Callable[[Iterable[Any], Any], list[Any]]:
+    """Build ``[x <op> s for x in xs]`` as a comprehension so no call is made per element."""
+    symbol = _SYMBOLS[op]
+    body = f"s {symbol} x" if reflected else f"x {symbol} s"
+    return builtins.eval(f"lambda xs, s: [{body} for x in xs]", {"__builtins__": {}})
+
+
+def _operands(series: "Series", other: Any, op: Callable[..., Any]) -> tuple[Any, Any]:
+    left = series._values
+    if isinstance(other, Series):
+        if len(other) != len(left):
+            raise ValueError("Series length mismatch")
+        return left, other._values
+    if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+        if len(other) != len(left):
+            raise ValueError("Sequence length mismatch")
+        return left, other
+    if isinstance(other, (int, float, bool)):
+        return left, _Broadcast(other, len(left))
+    raise TypeError(f"Unsupported operand type for {op.__name__}: {type(other)!r}")
+
+
+def _apply(op: Callable[[Any, Any], Any], left: Any, right: Any, reflected: bool = False) -> list[Any]:
+    """Run a binary kernel; scalars take the comprehension path, columns a C-level ``map``."""
+    if isinstance(right, _Broadcast):
+        return _scalar_kernel(op, reflected)(left, right.value)
+    if reflected:
+        left, right = right, left
+    return list(map(op, left, right))
+
+
+_EVAL_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "exp": math.exp,
+    "log": math.log,
+    "sqrt": math.sqrt,
+    "abs": abs,
+    "min": min,
+    "max": max,
+}
+_EVAL_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.BoolOp,
+    ast.Compare,
+    ast.IfExp,
+    ast.Call,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.operator,
+    ast.unaryop,
+    ast.boolop,
+    ast.cmpop,
+)
+
+
+@lru_cache(maxsize=256)
+def _compile_expression(expression: str) -> tuple[Callable[..., Any], tuple[str, ...]]:
+    """Compile ``expression`` into a row kernel taking one argument per referenced name."""
+    tree = ast.parse(f"({expression})", mode="eval")
+    names: dict[str, None] = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, _EVAL_NODES):
+            raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in _EVAL_FUNCTIONS or node.keywords:
+                raise ValueError(f"Unsupported function call in expression: {ast.unparse(node.func)}")
+        elif isinstance(node, ast.Name) and node.id not in _EVAL_FUNCTIONS:
+            names[node.id] = None
+    arguments = tuple(names)
+    source = f"lambda {', '.join(arguments)}: ({expression})"
+    kernel = builtins.eval(compile(source, "<pandas.eval>", "eval"), {"__builtins__": {}, **_EVAL_FUNCTIONS})
+    return kernel, arguments
+
+
+def _resolve_operand(name: str, data: Any, scalars: Mapping[str, Any]) -> Any:
+    if name in scalars:
+        return scalars[name]
+    if isinstance(data, DataFrame):
+        if name in data._data:
+            return data._data[name]
+    elif data is not None and name in data:
+        value = data[name]
+        return value._values if isinstance(value, Series) else value
+    raise KeyError(f"name {name!r} is not defined")
+
+
+def eval(expression: str, data: "DataFrame | Mapping[str, Any] | None" = None, **scalars: Any) -> "Series":
+    """Evaluate an arithmetic expression over columns in one fused pass.
+
+    ``"0.2 * x + 0.5 * y - c"`` is compiled once into a row kernel and mapped
+    over the column buffers, so no intermediate ``Series`` are allocated.
+    Names resolve to keyword scalars first, then to columns of ``data`` (a
+    ``DataFrame`` or a mapping of ``Series``/sequences/scalars).  ``exp``,
+    ``log``, ``sqrt``, ``abs``, ``min`` and ``max`` are available as functions.
+    """
+    expression = expression.strip()
+    kernel, arguments = _compile_expression(expression)
+    operands = [_resolve_operand(name, data, scalars) for name in arguments]
+    lengths = {len(operand) for operand in operands if isinstance(operand, Sized) and not isinstance(operand, str)}
+    if len(lengths) > 1:
+        raise ValueError("Operand length mismatch")
+    if lengths:
+        length = lengths.pop()
+    elif isinstance(data, DataFrame):
+        length = len(data)
+    else:
+        length = 1
+    operands = [
+        operand if isinstance(operand, Sized) and not isinstance(operand, str) else _Broadcast(operand, length)
+        for operand in operands
+    ]
+    if not operands:
+        return Series._from_buffer([kernel()] * length, shared=False)
+    return Series._from_buffer(list(map(kernel, *operands)), shared=False)
+
+
+def _cast_buffer(buffer: Buffer, dtype: type) -> Buffer:
+    if dtype is float:
+        try:
+            return array("d", map(float, buffer))
+        except TypeError:
+            return [None if value is None else float(value) for value in buffer]
+    if dtype is int:
+        try:
+            return array("q", map(int, buffer))
+        except (TypeError, OverflowError):
+            return [None if value is None else int(value) for value in buffer]
+    if dtype is bool:
+        return [None if value is None else bool(value) for value in buffer]
+    return [None if value is None else str(value) for value in buffer]
+
+
 class Series:
     def __init__(self, values: Iterable[Scalar]):
-        self._values: List[Scalar] = list(values)
-
-    def _coerce(self, other: Any, op: str) -> List[Scalar]:
-        if isinstance(other, Series):
-            if len(other) != len(self):
-                raise ValueError("Series length mismatch")
-            return list(other._values)
-        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
-            if len(other) != len(self):
-                raise ValueError("Sequence length mismatch")
-            return list(other)
-        if isinstance(other, (int, float, bool)):
-            return [other] * len(self)
-        raise TypeError(f"Unsupported operand type for {op}: {type(other)!r}")
+        self._values: Buffer = _pack(list(values))
+        self._shared = False
+
+    @classmethod
+    def _from_buffer(cls, buffer: Buffer, shared: bool = True) -> "Series":
+        """Wrap an existing column buffer without copying it."""
+        series = cls.__new__(cls)
+        series._values = buffer
+        series._shared = shared
+        return series
 
     def __len__(self) -> int:
         return len(self._values)
@@ -58,78 +282,95 @@ class Series:
         return self._values[index]
 
     def __setitem__(self, index: int, value: Scalar) -> None:
-        self._values[index] = value
+        if self._shared:
+            self._values = _copy_buffer(self._values)
+            self._shared = False
+        try:
+            self._values[index] = value
+        except TypeError:
+            # The value does not fit the typed array (e.g. ``None`` in a float column).
+            self._values = list(self._values)
+            self._values[index] = value
 
     def __repr__(self) -> str:
-        return f"Series({self._values!r})"
+        return f"Series({list(self._values)!r})"
+
+    def _binary(self, other: Any, op: Callable[[Any, Any], Any], reflected: bool = False) -> "Series":
+        left, right = _operands(self, other, op)
+        return Series._from_buffer(_apply(op, left, right, reflected), shared=False)
 
     def __add__(self, other: Any) -> "Series":
-        values = self._coerce(other, "+")
-        return Series(a + b for a, b in zip(self._values, values))
+        return self._binary(other, operator.add)
 
     def __radd__(self, other: Any) -> "Series":
-        return self.__add__(other)
+        return self._binary(other, operator.add, reflected=True)
 
     def __sub__(self, other: Any) -> "Series":
-        values = self._coerce(other, "-")
-        return Series(a - b for a, b in zip(self._values, values))
+        return self._binary(other, operator.sub)
 
     def __rsub__(self, other: Any) -> "Series":
-        values = self._coerce(other, "-")
-        return Series(b - a for a, b in zip(self._values, values))
+        return self._binary(other, operator.sub, reflected=True)
 
     def __mul__(self, other: Any) -> "Series":
-        values = self._coerce(other, "*")
-        return Series(a * b for a, b in zip(self._values, values))
+        return self._binary(other, operator.mul)
 
     def __rmul__(self, other: Any) -> "Series":
-        return self.__mul__(other)
+        return self._binary(other, operator.mul, reflected=True)
 
     def __truediv__(self, other: Any) -> "Series":
-        values = self._coerce(other, "/")
-        return Series(a / b for a, b in zip(self._values, values))
+        return self._binary(other, operator.truediv)
 
     def __rtruediv__(self, other: Any) -> "Series":
-        values = self._coerce(other, "/")
-        return Series(b / a for a, b in zip(self._values, values))
+        return self._binary(other, operator.truediv, reflected=True)
 
     def __neg__(self) -> "Series":
-        return Series(-value for value in self._values)
+        return Series._from_buffer(list(map(operator.neg, self._values)), shared=False)
 
     def __iadd__(self, other: Any) -> "Series":
         result = self.__add__(other)
         self._values = result._values
+        self._shared = False
         return self
 
     def __isub__(self, other: Any) -> "Series":
         result = self.__sub__(other)
         self._values = result._values
+        self._shared = False
         return self
 
     def __eq__(self, other: Any) -> "Series":  # type: ignore[override]
-        values = self._coerce(other, "==")
-        return Series(a == b for a, b in zip(self._values, values))
+        return self._binary(other, operator.eq)
 
     def __ne__(self, other: Any) -> "Series":  # type: ignore[override]
-        values = self._coerce(other, "!=")
-        return Series(a != b for a, b in zip(self._values, values))
+        return self._binary(other, operator.ne)
 
     def __ge__(self, other: Any) -> "Series":
-        values = self._coerce(other, ">=")
-        return Series(a >= b for a, b in zip(self._values, values))
+        return self._binary(other, operator.ge)
+
+    def __gt__(self, other: Any) -> "Series":
+        return self._binary(other, operator.gt)
+
+    def __le__(self, other: Any) -> "Series":
+        return self._binary(other, operator.le)
+
+    def __lt__(self, other: Any) -> "Series":
+        return self._binary(other, operator.lt)
 
     def unique(self) -> list[Scalar]:
-        seen: list[Scalar] = []
-        for value in self._values:
-            if value not in seen:
-                seen.append(value)
-        return seen
+        try:
+            return list(dict.fromkeys(self._values))
+        except TypeError:
+            seen: list[Scalar] = []
+            for value in self._values:
+                if value not in seen:
+                    seen.append(value)
+            return seen
 
     def notnull(self) -> "Series":
         return Series(value is not None for value in self._values)
 
     def all(self) -> bool:
-        return all(bool(value) for value in self._values)
+        return all(self._values)
 
     def tolist(self) -> list[Scalar]:
         return list(self._values)
@@ -137,64 +378,110 @@ class Series:
 
 @dataclass
 class _RowView:
-    data: dict[str, Scalar]
+    """Lazy view of a single row; values are read from the column buffers on access."""
+
+    frame: "DataFrame"
+    position: int
 
     def __getitem__(self, key: str) -> Scalar:
-        return self.data[key]
+        if self.position in self.frame._absent.get(key, ()):
+            raise KeyError(key)
+        return self.frame._data[key][self.position]
 
 
 class DataFrame:
-    def __init__(self, rows: Iterable[dict[str, Scalar]]):
-        self._rows: List[dict[str, Scalar]] = [dict(row) for row in rows]
-        columns: list[str] = []
-        for row in self._rows:
-            for key in row.keys():
-                if key not in columns:
-                    columns.append(key)
-        self._columns = columns
+    def __init__(self, data: Iterable[dict[str, Scalar]] | Mapping[str, Iterable[Scalar]] | None = None):
+        # Positions, per column, of the source records that lacked the key.
+        self._absent: dict[str, frozenset[int]] = {}
+        if data is None:
+            self._data: dict[str, Buffer] = {}
+            self._length = 0
+        elif isinstance(data, Mapping):
+            columns = {key: _pack(list(values)) for key, values in data.items()}
+            lengths = {len(values) for values in columns.values()}
+            if len(lengths) > 1:
+                raise ValueError("All columns must have the same length")
+            self._data = columns
+            self._length = lengths.pop() if lengths else 0
+        else:
+            rows = data if isinstance(data, list) else list(data)
+            names = dict.fromkeys(key for row in rows for key in row)
+            self._data = {name: _pack([row.get(name) for row in rows]) for name in names}
+            self._length = len(rows)
+            for name in names:
+                missing = frozenset(position for position, row in enumerate(rows) if name not in row)
+                if missing:
+                    self._absent[name] = missing
+
+    @classmethod
+    def _from_columns(
+        cls, data: dict[str, Buffer], length: int, absent: Mapping[str, frozenset[int]] | None = None
+    ) -> "DataFrame":
+        """Build a frame around existing column buffers without copying them."""
+        frame = cls.__new__(cls)
+        frame._data = data
+        frame._length = length
+        frame._absent = dict(absent) if absent else {}
+        return frame
 
     def __len__(self) -> int:
-        return len(self._rows)
+        return self._length
 
     def __iter__(self) -> Iterator[str]:
-        return iter(self._columns)
+        return iter(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
 
     @property
     def columns(self) -> list[str]:
-        return list(self._columns)
+        return list(self._data)
 
     @property
     def empty(self) -> bool:
-        return not self._rows
+        return self._length == 0
 
     def copy(self) -> "DataFrame":
-        return DataFrame(self._rows)
+        # Buffers are never mutated in place once shared, so a copy only needs
+        # its own column mapping.
+        return DataFrame._from_columns(dict(self._data), self._length, self._absent)
 
     def __getitem__(self, key: Any) -> Any:
-        if isinstance(key, Series):
-            mask = [bool(value) for value in key]
-            filtered = [row for row, keep in zip(self._rows, mask) if keep]
-            return DataFrame(filtered)
-        if isinstance(key, list) and key and isinstance(key[0], bool):
-            mask = [bool(value) for value in key]
-            filtered = [row for row, keep in zip(self._rows, mask) if keep]
-            return DataFrame(filtered)
+        if isinstance(key, Series) or (isinstance(key, list) and key and isinstance(key[0], bool)):
+            mask = key._values if isinstance(key, Series) else key
+            if len(mask) != self._length:
+                raise ValueError("Boolean mask length does not match DataFrame")
+            data = {name: _select(buffer, mask) for name, buffer in self._data.items()}
+            absent = {}
+            if self._absent:
+                kept = list(compress(range(self._length), mask))
+                for name, positions in self._absent.items():
+                    remaining = frozenset(index for index, position in enumerate(kept) if position in positions)
+                    if remaining:
+                        absent[name] = remaining
+            return DataFrame._from_columns(data, sum(1 for keep in mask if keep), absent)
         if isinstance(key, str):
-            values = [row.get(key) for row in self._rows]
-            return Series(values)
+            return Series._from_buffer(self._data[key])
+        if isinstance(key, list) and all(isinstance(name, str) for name in key):
+            absent = {name: self._absent[name] for name in key if name in self._absent}
+            return DataFrame._from_columns({name: self._data[name] for name in key}, self._length, absent)
         raise TypeError("Unsupported key type for DataFrame")
 
     def __setitem__(self, key: str, values: Any) -> None:
         if isinstance(values, (int, float, str, bool)) or values is None:
-            values_list = [values] * len(self._rows)
+            buffer = _pack([values]) * self._length if self._length else []
+        elif isinstance(values, Series):
+            buffer = values._values if isinstance(values._values, array) else _pack(values._values)
+            if buffer is values._values:
+                values._shared = True
         else:
-            values_list = list(values)
-        if len(values_list) != len(self._rows):
+            buffer = _pack(list(values))
+        if self._data and len(buffer) != self._length:
             raise ValueError("Length of values does not match DataFrame")
-        for row, value in zip(self._rows, values_list):
-            row[key] = value
-        if key not in self._columns:
-            self._columns.append(key)
+        if not self._data:
+            self._length = len(buffer)
+        self._data[key] = buffer
+        self._absent.pop(key, None)
 
     def to_csv(self, path: Path | str, index: bool = False) -> None:
         if index:
@@ -202,28 +489,354 @@ class DataFrame:
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
         with path.open("w", newline="", encoding="utf-8") as handle:
-            writer = csv.DictWriter(handle, fieldnames=self._columns)
-            writer.writeheader()
-            for row in self._rows:
-                writer.writerow({column: row.get(column) for column in self._columns})
+            writer = csv.writer(handle)
+            writer.writerow(self._data.keys())
+            writer.writerows(zip(*self._data.values()))
+
+    def to_columnar(self, path: Path | str) -> None:
+        """Write the frame in the binary columnar format read by :func:`read_columnar`."""
+        _write_columnar(self, Path(path))
 
     def to_dict(self, orient: str = "records") -> list[dict[str, Scalar]]:
         if orient != "records":
             raise NotImplementedError("Only records orient is supported")
-        return [dict(row) for row in self._rows]
+        if not self._data:
+            return [{} for _ in range(self._length)]
+        names = list(self._data)
+        records = [dict(zip(names, row)) for row in zip(*self._data.values())]
+        for name, positions in self._absent.items():
+            for position in positions:
+                del records[position][name]
+        return records
+
+    def astype(self, dtype: "DtypeArg") -> "DataFrame":
+        """Return a frame whose columns are cast to ``float``/``int``/``bool``/``str``."""
+        if isinstance(dtype, Mapping):
+            targets = {name: _resolve_dtype(value) for name, value in dtype.items()}
+        else:
+            targets = dict.fromkeys(self._data, _resolve_dtype(dtype))
+        data = dict(self._data)
+        for name, target in targets.items():
+            data[name] = _cast_buffer(self._data[name], target)
+        return DataFrame._from_columns(data, self._length, self._absent)
+
+    def eval(self, expression: str, **scalars: Any) -> Series:
+        """Evaluate ``expression`` over this frame's columns; see :func:`eval`."""
+        return eval(expression, self, **scalars)
 
     def iterrows(self) -> Iterator[tuple[int, _RowView]]:
-        for index, row in enumerate(self._rows):
-            yield index, _RowView(dict(row))
-def read_csv(path: Path | str) -> DataFrame:
-    path = Path(path)
-    with path.open(newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        records = []
-        for raw_row in reader:
-            row = {key: _coerce_numeric(value) for key, value in raw_row.items()}
-            records.append(row)
-    return DataFrame(records)
+        for position in range(self._length):
+            yield position, _RowView(self, position)
+
+
+# ---------------------------------------------------------------------------
+# CSV input
+# ---------------------------------------------------------------------------
+
+DtypeArg = type | str | Mapping[str, type | str] | None
+
+_DTYPE_ALIASES: dict[str, type] = {
+    "float": float,
+    "float64": float,
+    "int": int,
+    "int64": int,
+    "bool": bool,
+    "boolean": bool,
+    "str": str,
+    "string": str,
+    "object": str,
+}
+_TRUE_STRINGS = frozenset({"True", "true", "TRUE", "1"})
+_FALSE_STRINGS = frozenset({"False", "false", "FALSE", "0"})
+_READ_BLOCK_ROWS = 65_536
+
+
+def _resolve_dtype(dtype: type | str) -> type:
+    if isinstance(dtype, str):
+        try:
+            return _DTYPE_ALIASES[dtype]
+        except KeyError:
+            raise TypeError(f"Unsupported dtype: {dtype!r}") from None
+    if dtype not in (float, int, bool, str):
+        raise TypeError(f"Unsupported dtype: {dtype!r}")
+    return dtype
+
+
+def _to_float(value: str | None) -> float | None:
+    return float(value) if value else None
+
+
+def _to_int(value: str | None) -> int | None:
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _to_bool(value: str | None) -> bool | None:
+    if value in _TRUE_STRINGS:
+        return True
+    if value in _FALSE_STRINGS:
+        return False
+    if not value:
+        return None
+    raise ValueError(f"could not convert string to bool: {value!r}")
+
+
+def _convert_column(raw: Sequence[str | None], dtype: type | None) -> Buffer:
+    """Convert one column of raw CSV cells; typed columns skip per-cell type guessing."""
+    if dtype is float:
+        try:
+            return array("d", map(float, raw))
+        except (TypeError, ValueError):
+            return _pack(list(map(_to_float, raw)))
+    if dtype is int:
+        try:
+            return array("q", map(int, raw))
+        except (TypeError, ValueError, OverflowError):
+            return _pack(list(map(_to_int, raw)))
+    if dtype is bool:
+        return list(map(_to_bool, raw))
+    if dtype is str:
+        return [value or None for value in raw]
+    return _pack(list(map(_coerce_numeric, raw)))
+
+
+def _concat_buffers(parts: list[Buffer]) -> Buffer:
+    if len(parts) == 1:
+        return parts[0]
+    if all(isinstance(part, array) for part in parts) and len({part.typecode for part in parts}) == 1:
+        merged: Buffer = array(parts[0].typecode)
+    else:
+        merged = []
+    for part in parts:
+        merged.extend(part)
+    return merged
+
+
+class TextFileReader:
+    """Iterator over a CSV file yielding ``DataFrame`` chunks of at most ``chunksize`` rows.
+
+    The header is parsed on construction, so ``columns`` is available before the
+    first chunk is read.  Use as a context manager (or exhaust it) to release
+    the file handle.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        chunksize: int,
+        dtype: DtypeArg = None,
+        usecols: Sequence[str] | None = None,
+    ):
+        if chunksize < 1:
+            raise ValueError("chunksize must be a positive integer")
+        self.chunksize = chunksize
+        self._handle = Path(path).open(newline="", encoding="utf-8")
+        self._reader = csv.reader(self._handle)
+        header = next(self._reader, None) or []
+        if usecols is not None:
+            missing = [name for name in usecols if name not in header]
+            if missing:
+                self.close()
+                raise ValueError(f"Usecols do not match columns, columns expected but not found: {missing}")
+            wanted = set(usecols)
+            positions = [position for position, name in enumerate(header) if name in wanted]
+        else:
+            positions = list(range(len(header)))
+        if dtype is None or isinstance(dtype, Mapping):
+            mapping = {name: _resolve_dtype(value) for name, value in (dtype or {}).items()}
+            types = [mapping.get(header[position]) for position in positions]
+        else:
+            types = [_resolve_dtype(dtype)] * len(positions)
+        self.columns = [header[position] for position in positions]
+        self._plan = list(zip(self.columns, positions, types))
+
+    def __iter__(self) -> "TextFileReader":
+        return self
+
+    def __next__(self) -> DataFrame:
+        rows = list(islice(self._reader, self.chunksize)) if not self._handle.closed else []
+        if not rows:
+            self.close()
+            raise StopIteration
+        # Transposing with zip_longest keeps short rows aligned (missing cells become None).
+        cells = list(zip_longest(*rows))
+        blank = (None,) * len(rows)
+        data = {
+            name: _convert_column(cells[position] if position < len(cells) else blank, dtype)
+            for name, position, dtype in self._plan
+        }
+        return DataFrame._from_columns(data, len(rows))
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "TextFileReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def read_csv(
+    path: Path | str,
+    dtype: DtypeArg = None,
+    usecols: Sequence[str] | None = None,
+    chunksize: int | None = None,
+) -> DataFrame | TextFileReader:
+    """Read a CSV file into a ``DataFrame``.
+
+    ``dtype`` maps column names (or all columns) to ``float``/``int``/``bool``/
+    ``str`` (or their pandas names such as ``"float64"``); typed columns are
+    converted column-wise without per-cell type guessing, and empty cells become
+    ``None``.  Untyped columns keep the legacy numeric inference.  ``usecols``
+    restricts parsing to the named columns.  With ``chunksize`` a
+    ``TextFileReader`` is returned that yields frames of at most that many rows.
+    """
+    reader = TextFileReader(path, chunksize or _READ_BLOCK_ROWS, dtype=dtype, usecols=usecols)
+    if chunksize is not None:
+        return reader
+    with reader:
+        chunks = list(reader)
+        if not chunks:
+            return DataFrame._from_columns({name: [] for name in reader.columns}, 0)
+    data = {name: _concat_buffers([chunk._data[name] for chunk in chunks]) for name in reader.columns}
+    return DataFrame._from_columns(data, sum(len(chunk) for chunk in chunks))
+
+
+# ---------------------------------------------------------------------------
+# Binary columnar storage
+# ---------------------------------------------------------------------------
+#
+# Layout: 8-byte magic, little-endian uint64 header length, a JSON header
+# ``{"version", "rows", "byteorder", "columns": [{"name", "dtype", "offset",
+# "nbytes"}]}`` padded so the data section starts on an 8-byte boundary, then
+# one contiguous, 8-byte aligned buffer per column.  ``float64``/``int64``
+# columns are raw ``array`` bytes, ``bool`` columns one byte per value, and any
+# other column (strings, values with ``None``) a compact JSON list.
+
+COLUMNAR_MAGIC = b"NPCOL\x00\x01\n"
+_COLUMNAR_VERSION = 1
+_HEADER_LENGTH = struct.Struct("<Q")
+_ALIGNMENT = 8
+_TYPECODE_DTYPES = {"d": "float64", "q": "int64"}
+_DTYPE_TYPECODES = {dtype: typecode for typecode, dtype in _TYPECODE_DTYPES.items()}
+
+
+def _padding(size: int) -> int:
+    return -size % _ALIGNMENT
+
+
+def _encode_column(buffer: Buffer) -> tuple[str, bytes]:
+    if isinstance(buffer, array) and buffer.typecode in _TYPECODE_DTYPES:
+        return _TYPECODE_DTYPES[buffer.typecode], buffer.tobytes()
+    if buffer and set(map(type, buffer)) == {bool}:
+        return "bool", bytes(buffer)
+    return "object", json.dumps(list(buffer), separators=(",", ":")).encode("utf-8")
+
+
+def _write_columnar(frame: DataFrame, path: Path) -> None:
+    encoded = [(name, *_encode_column(buffer)) for name, buffer in frame._data.items()]
+    columns = []
+    offset = 0
+    for name, dtype, payload in encoded:
+        columns.append({"name": name, "dtype": dtype, "offset": offset, "nbytes": len(payload)})
+        offset += len(payload) + _padding(len(payload))
+    header = json.dumps(
+        {
+            "version": _COLUMNAR_VERSION,
+            "rows": len(frame),
+            "byteorder": sys.byteorder,
+            "columns": columns,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    header += b" " * _padding(len(COLUMNAR_MAGIC) + _HEADER_LENGTH.size + len(header))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with temporary.open("wb") as handle:
+        handle.write(COLUMNAR_MAGIC)
+        handle.write(_HEADER_LENGTH.pack(len(header)))
+        handle.write(header)
+        for _, _, payload in encoded:
+            handle.write(payload)
+            handle.write(b"\x00" * _padding(len(payload)))
+    os.replace(temporary, path)
+
+
+class ColumnarFile:
+    """Memory-mapped reader for files written by ``DataFrame.to_columnar``.
+
+    Only the header is parsed on open; ``read`` copies the requested column
+    buffers straight out of the map, so unselected columns are never touched.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._handle = self.path.open("rb")
+        try:
+            self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._handle.close()
+            raise ValueError(f"{self.path} is not a columnar table") from None
+        prefix = len(COLUMNAR_MAGIC) + _HEADER_LENGTH.size
+        if self._map[: len(COLUMNAR_MAGIC)] != COLUMNAR_MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a columnar table")
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._map, len(COLUMNAR_MAGIC))
+        header = json.loads(self._map[prefix : prefix + header_length])
+        if header["version"] != _COLUMNAR_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported columnar format version: {header['version']}")
+        self._data_start = prefix + header_length
+        self._swap = header["byteorder"] != sys.byteorder
+        self._columns = {column["name"]: column for column in header["columns"]}
+        self.rows: int = header["rows"]
+        self.columns = list(self._columns)
+
+    def read(self, columns: Sequence[str] | None = None) -> DataFrame:
+        names = self.columns if columns is None else list(columns)
+        missing = [name for name in names if name not in self._columns]
+        if missing:
+            raise KeyError(f"Columns not found in {self.path.name}: {missing}")
+        data = {name: self._read_column(self._columns[name]) for name in names}
+        return DataFrame._from_columns(data, self.rows)
+
+    def _read_column(self, meta: dict[str, Any]) -> Buffer:
+        start = self._data_start + meta["offset"]
+        end = start + meta["nbytes"]
+        with memoryview(self._map) as view, view[start:end] as payload:
+            typecode = _DTYPE_TYPECODES.get(meta["dtype"])
+            if typecode is not None:
+                buffer = array(typecode)
+                buffer.frombytes(payload)
+                if self._swap:
+                    buffer.byteswap()
+                return buffer
+            if meta["dtype"] == "bool":
+                return list(map(bool, payload))
+            return json.loads(payload.tobytes())
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+        self._handle.close()
+
+    def __enter__(self) -> "ColumnarFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def read_columnar(path: Path | str, columns: Sequence[str] | None = None) -> DataFrame:
+    """Load a table written by ``DataFrame.to_columnar``, optionally only some columns."""
+    with ColumnarFile(path) as table:
+        return table.read(columns)
 
 
 def read_json(path: Path | str) -> DataFrame:
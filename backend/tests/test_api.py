@@ -1,9 +1,25 @@
 import sitecustomize  # noqa: F401
 
+import json
+import math
+import threading
+import time
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 
+from app.core.concurrency import _get_executor
+from app.core.config import get_settings
+from app.core.database import db_read_session, engine, read_engine
+from app.flows.backtest import persist_backtest_metrics
 from app.main import app
+from app.models.nobel import Candidate
+from app.reports.generators import report_artifact
+from app.services.prediction_service import PredictionService
+from app.services.model_engine import model_version
+from app.services.scoring import model_path
+from app.services.shortlist_store import record_data_version
 from app.services.training_service import TrainingService
 
 
@@ -36,6 +52,26 @@ def test_shortlist_endpoint(client: TestClient, field: str):
     assert payload[0]["candidate_name"]
 
 
+def test_every_configured_horizon_is_served(client: TestClient):
+    by_horizon = {
+        horizon: {
+            entry["candidate_id"]: entry
+            for entry in client.get(
+                "/api/v1/predictions/shortlist", params={"field": "Literature", "horizon": horizon, "limit": 1000}
+            ).json()
+        }
+        for horizon in get_settings().prediction_horizons
+    }
+    one_year = by_horizon["one_year"]
+    assert one_year and all(entries.keys() == one_year.keys() for entries in by_horizon.values())
+    for candidate_id, entry in one_year.items():
+        p = entry["probability"]
+        assert by_horizon["three_year"][candidate_id]["probability"] == pytest.approx(1 - (1 - p) ** 3)
+        assert by_horizon["five_year"][candidate_id]["probability"] == pytest.approx(1 - (1 - p) ** 5)
+        # Attributions explain the shared logit, so they are identical across horizons.
+        assert by_horizon["five_year"][candidate_id]["shap_values"] == entry["shap_values"]
+
+
 @pytest.mark.parametrize(
     "field,laureate",
     [
@@ -56,12 +92,138 @@ def test_shortlist_excludes_laureates(client: TestClient, field: str, laureate:
     assert not disallowed, f"{laureate} should not appear in shortlist for {field}"
 
 
+@pytest.fixture()
+def statements() -> list:
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    for bound in {engine, read_engine}:
+        event.listen(bound, "before_cursor_execute", record)
+    yield executed
+    for bound in {engine, read_engine}:
+        event.remove(bound, "before_cursor_execute", record)
+
+
+def test_shortlist_query_uses_a_single_statement(client: TestClient, statements: list):
+    shortlist = PredictionService().get_shortlist(field="Physics", horizon="one_year").items
+    assert shortlist and all(len(entry.shap_values) == 5 for entry in shortlist)
+    assert len(statements) == 1, statements
+
+
+def test_shortlist_is_served_from_the_published_version(client: TestClient, statements: list):
+    params = {"field": "Physics", "horizon": "one_year"}
+    response = client.get("/api/v1/predictions/shortlist", params=params)
+    assert response.status_code == 200
+    assert response.json() == [entry.dict() for entry in PredictionService().get_shortlist(**params).items]
+    etag = response.headers["etag"]
+    statements.clear()
+
+    response = client.get("/api/v1/predictions/shortlist", params=params, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert client.get("/api/v1/predictions/shortlist", params=params).headers["etag"] == etag
+    assert statements == []
+
+
+def test_shortlist_cursor_pages_through_the_ranking(client: TestClient):
+    params = {"field": "Literature", "horizon": "one_year"}
+    full = client.get("/api/v1/predictions/shortlist", params={**params, "limit": 1000}).json()
+    assert len(full) > 1
+
+    pages, cursor = [], None
+    while True:
+        response = client.get(
+            "/api/v1/predictions/shortlist", params={**params, "limit": 1, **({"cursor": cursor} if cursor else {})}
+        )
+        assert response.status_code == 200
+        pages.extend(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert pages == full
+    assert [entry["probability"] for entry in pages] == sorted((e["probability"] for e in pages), reverse=True)
+
+    response = client.get("/api/v1/predictions/shortlist", params={**params, "cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_published_shortlist_does_not_wait_on_busy_exports(client: TestClient):
+    params = {"field": "Physics", "horizon": "one_year"}
+    assert client.get("/api/v1/predictions/shortlist", params=params).headers.get("ETag")
+    release = threading.Event()
+    busy = [_get_executor().submit(release.wait, 10) for _ in range(get_settings().blocking_executor_workers)]
+    try:
+        started = time.perf_counter()
+        response = client.get("/api/v1/predictions/shortlist", params=params)
+        elapsed = time.perf_counter() - started
+    finally:
+        release.set()
+        for future in busy:
+            future.result()
+    assert response.status_code == 200 and response.headers.get("ETag")
+    assert elapsed < 1.0
+
+
+def test_candidate_detail_and_provenance(client: TestClient):
+    candidate_id = client.get(
+        "/api/v1/predictions/shortlist", params={"field": "Physics", "horizon": "one_year"}
+    ).json()[0]["candidate_id"]
+
+    detail = client.get(f"/api/v1/predictions/candidates/{candidate_id}")
+    assert detail.status_code == 200
+    assert detail.json()["field"] == "Physics"
+    provenance = client.get(f"/api/v1/predictions/provenance/{candidate_id}")
+    assert provenance.status_code == 200
+    with db_read_session() as session:
+        openalex_id = session.get(Candidate, candidate_id).openalex_id
+    seed = json.loads((get_settings().data_dir / "seed" / "provenance.json").read_text(encoding="utf-8"))
+    assert [record["feature_name"] for record in provenance.json()["records"]] == [
+        record["feature_name"] for record in seed[openalex_id]
+    ]
+    assert client.get("/api/v1/predictions/candidates/999999").status_code == 404
+
+
+def test_score_endpoint_uses_the_current_model(client: TestClient):
+    model = json.loads(model_path("Physics").read_text())
+    zeros = {name: 0.0 for name in model["coefficients"]}
+    response = client.post("/api/v1/predictions/score", json={"field": "Physics", "rows": [zeros, zeros]})
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["model_version"] == model_version(model)
+    assert payload["probabilities"] == pytest.approx([1 / (1 + math.exp(-model["intercept"]))] * 2)
+
+    missing = client.post("/api/v1/predictions/score", json={"field": "Physics", "rows": [{"h_index": 1.0}]})
+    assert missing.status_code == 422
+    for field in ("Astrology", "../secrets"):
+        assert client.post("/api/v1/predictions/score", json={"field": field, "rows": [zeros]}).status_code == 404
+
+
+@pytest.mark.parametrize("value", ["NaN", "Infinity", "-Infinity"])
+def test_score_endpoint_rejects_non_finite_features(client: TestClient, value: str):
+    model = json.loads(model_path("Physics").read_text())
+    row = ", ".join(f'"{name}": {value}' for name in model["coefficients"])
+    response = client.post(
+        "/api/v1/predictions/score",
+        content=f'{{"field": "Physics", "rows": [{{{row}}}]}}',
+        headers={"content-type": "application/json"},
+    )
+    assert response.status_code == 422
+
+    huge = {name: 1e308 for name in model["coefficients"]}
+    response = client.post("/api/v1/predictions/score", json={"field": "Physics", "rows": [huge]})
+    assert response.status_code == 200
+    assert all(0.0 <= probability <= 1.0 for probability in response.json()["probabilities"])
+
+
 def test_reports_generation(client: TestClient, tmp_path):
     response = client.get(
         "/api/v1/reports/shortlist.csv", params={"field": "Physics", "horizon": "one_year"}
     )
     assert response.status_code == 200
     assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="shortlist_Physics_one_year.csv"' in response.headers["content-disposition"]
+    assert response.text.splitlines()[0] == "Rank,Candidate,Affiliation,Probability"
 
     response = client.get(
         "/api/v1/reports/shortlist.pdf", params={"field": "Physics", "horizon": "one_year"}
@@ -70,6 +232,34 @@ def test_reports_generation(client: TestClient, tmp_path):
     assert response.headers["content-type"].startswith("application/pdf")
 
 
+@pytest.mark.parametrize("format", ["csv", "pdf"])
+def test_reports_are_reused_for_the_published_version(client: TestClient, statements: list, format: str):
+    params = {"field": "Literature", "horizon": "one_year"}
+    first = client.get(f"/api/v1/reports/shortlist.{format}", params=params)
+    assert first.status_code == 200
+    artifact = report_artifact("Literature", "one_year", format)
+    assert artifact.cached and artifact.path.parent.name == artifact.version
+    assert not list(artifact.path.parent.glob("*.tmp"))
+    statements.clear()
+
+    second = client.get(f"/api/v1/reports/shortlist.{format}", params=params)
+    assert second.content == first.content == artifact.path.read_bytes()
+    assert statements == []
+
+
+def test_reports_are_rebuilt_after_a_data_change(client: TestClient):
+    params = {"field": "Literature", "horizon": "one_year"}
+    assert client.get("/api/v1/reports/shortlist.csv", params=params).status_code == 200
+    before = report_artifact("Literature", "one_year", "csv")
+    assert before.cached
+
+    record_data_version()
+    after = report_artifact("Literature", "one_year", "csv")
+    assert after.version == before.version and after.path != before.path and not after.cached
+    assert client.get("/api/v1/reports/shortlist.csv", params=params).status_code == 200
+    assert report_artifact("Literature", "one_year", "csv").cached
+
+
 def test_backtests_bootstrapped(client: TestClient):
     response = client.get("/api/v1/predictions/backtests")
     assert response.status_code == 200
@@ -78,14 +268,115 @@ def test_backtests_bootstrapped(client: TestClient):
     assert payload
 
 
+def test_backtest_metrics_are_pooled_per_field(client: TestClient):
+    rows = [
+        {"field": "Physics", "as_of_year": 2019, "training_rows": 90, "candidate_count": 30, "laureate_count": 1,
+         "hits_at_10": 1, "average_precision": 0.5, "brier_score": 0.02},
+        {"field": "Physics", "as_of_year": 2020, "training_rows": 120, "candidate_count": 10, "laureate_count": 1,
+         "hits_at_10": 0, "average_precision": 0.1, "brier_score": 0.1},
+        {"field": "Physics", "as_of_year": 2021, "training_rows": 130, "candidate_count": 10, "laureate_count": 0,
+         "hits_at_10": 0, "average_precision": None, "brier_score": 0.0},
+    ]
+    persist_backtest_metrics(rows)
+    try:
+        (metric,) = client.get("/api/v1/predictions/backtests", params={"field": "Physics"}).json()
+        assert metric["hit_at_10"] == pytest.approx(0.5)
+        assert metric["auc_pr"] == pytest.approx(0.3)
+        assert metric["brier_score"] == pytest.approx((30 * 0.02 + 10 * 0.1) / 50)
+        assert metric["years_covered"] == [2019, 2021]
+    finally:
+        persist_backtest_metrics([])
+
+
+def test_backtest_job_falls_back_to_seed_metrics(client: TestClient):
+    response = client.post("/api/v1/training/backtest")
+    assert response.status_code == 202
+    job = _wait_for_job(client, response.json()["job_id"])
+    assert job["status"] == "succeeded", job["error"]
+    # The seed snapshots cover a single year, so there is nothing to hold out yet.
+    assert job["result"]["metric_rows"] == 0
+    seeded = client.get("/api/v1/predictions/backtests", params={"field": "Physics"}).json()
+    assert seeded and seeded[0]["years_covered"] == [2000, 2020]
+
+
+def _wait_for_job(client: TestClient, job_id: str, timeout: float = 30.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get(f"/api/v1/training/jobs/{job_id}")
+        assert response.status_code == 200
+        job = response.json()
+        if job["status"] in ("succeeded", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
 def test_train_model_endpoint(client: TestClient):
     response = client.post("/api/v1/training/model")
-    assert response.status_code == 200
+    assert response.status_code == 202
+    accepted = response.json()
+    assert accepted["status"] in ("queued", "running")
 
-    payload = response.json()
-    assert payload["status"] == "trained"
-    details = payload["details"]
-    assert set(details.keys()) == {"model_paths", "prediction_count", "run_id"}
+    job = _wait_for_job(client, accepted["job_id"])
+    assert job["status"] == "succeeded", job["error"]
+    assert job["run_seconds"] >= 0
+    details = job["result"]
+    assert set(details.keys()) == {"model_paths", "prediction_count", "skipped_fields", "run_id"}
     assert isinstance(details["model_paths"], dict)
     assert isinstance(details["prediction_count"], int)
     assert isinstance(details["run_id"], str)
+    # Nothing changed since the fixture trained, so every field is skipped.
+    assert sorted(details["skipped_fields"]) == sorted(details["model_paths"])
+    assert details["prediction_count"] == 0
+    assert {progress["status"] for progress in job["progress"].values()} == {"skipped"}
+
+
+def test_train_model_force_retrains_every_field(client: TestClient):
+    params = {"field": "Physics", "horizon": "one_year"}
+    previous_etag = client.get("/api/v1/predictions/shortlist", params=params).headers["etag"]
+    response = client.post("/api/v1/training/model", params={"force": True})
+    assert response.status_code == 202
+    job = _wait_for_job(client, response.json()["job_id"])
+    assert job["status"] == "succeeded", job["error"]
+    assert {progress["status"] for progress in job["progress"].values()} == {"persisted"}
+    details = job["result"]
+    assert details["skipped_fields"] == []
+    assert details["prediction_count"] > 0
+    # The retrain published a new shortlist version.
+    assert client.get("/api/v1/predictions/shortlist", params=params).headers["etag"] != previous_etag
+
+
+def test_etl_job_reports_progress_per_field(client: TestClient):
+    response = client.post("/api/v1/training/etl")
+    assert response.status_code == 202
+    job = _wait_for_job(client, response.json()["job_id"])
+    assert job["status"] == "succeeded", job["error"]
+    assert job["result"]["run_id"].startswith("seed-etl-")
+    assert set(job["progress"]) == {"Physics", "Chemistry", "Medicine", "Literature", "Peace", "Economics"}
+    assert all(progress["status"] == "loaded" for progress in job["progress"].values())
+
+
+def test_etl_republishes_the_shortlist(client: TestClient):
+    params = {"field": "Physics", "horizon": "one_year"}
+    previous_etag = client.get("/api/v1/predictions/shortlist", params=params).headers["etag"]
+    job = _wait_for_job(client, client.post("/api/v1/training/etl").json()["job_id"])
+    assert job["status"] == "succeeded", job["error"]
+    # Candidate rows may have changed without a retrain, so cached pages must not be revalidated.
+    assert client.get("/api/v1/predictions/shortlist", params=params).headers["etag"] != previous_etag
+
+
+def test_unknown_training_job_is_404(client: TestClient):
+    assert client.get("/api/v1/training/jobs/missing").status_code == 404
+
+
+def test_training_runs_record_nested_task_metrics(client: TestClient):
+    response = client.get("/api/v1/training/runs", params={"flow_name": "baseline_model_training", "limit": 1})
+    assert response.status_code == 200
+    (run,) = response.json()
+    assert run["state"] == "completed"
+    assert run["wall_seconds"] > 0
+
+    tasks = {record["task_run_id"]: record for record in run["tasks"]}
+    loads = [record for record in tasks.values() if record["task_name"] == "load_feature_table"]
+    assert loads and all(record["output"]["rows"] > 0 for record in loads)
+    assert all(tasks[record["parent_task_run_id"]]["task_name"] == "train_field" for record in loads)
+    assert any(record["task_name"] == "persist_predictions" for record in tasks.values())
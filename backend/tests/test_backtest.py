@@ -0,0 +1,83 @@
+import random
+from array import array
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.flows.backtest import FieldHistory, backtest_year, history_statement
+from app.flows.modeling import FEATURE_COLUMNS
+from app.models import jobs, nobel  # noqa: F401
+from app.models.base import Base
+from app.models.nobel import Candidate, FeatureSnapshot
+from app.services.evaluation import ranking_metrics
+
+
+def test_ranking_metrics_walk_one_ranking():
+    metrics = ranking_metrics([0.1, 0.8, 0.7, 0.9], [1, 1, 0, 0], k=2)
+    # Ranked 0.9, 0.8, 0.7, 0.1: laureates sit at ranks 2 and 4.
+    assert (metrics.candidate_count, metrics.laureate_count, metrics.hits_at_k) == (4, 2, 1)
+    assert metrics.average_precision == pytest.approx((1 / 2 + 2 / 4) / 2)
+    assert metrics.brier_score == pytest.approx((0.81 + 0.04 + 0.49 + 0.81) / 4)
+
+    no_laureates = ranking_metrics([0.2, 0.1], [0, 0])
+    assert no_laureates.average_precision is None and no_laureates.hits_at_k == 0
+    with pytest.raises(ValueError):
+        ranking_metrics([], [])
+
+
+def _history(years: range, candidates: int) -> FieldHistory:
+    rng = random.Random(2)
+    rows = [(year, index) for year in years for index in range(candidates)]
+    # Each year the strongest remaining candidate wins.
+    return FieldHistory(
+        field="Physics",
+        years=array("l", (year for year, _ in rows)),
+        labels=array("d", (float(index == year - years.start) for year, index in rows)),
+        features={
+            name: array("d", (candidates - index + rng.random() for _, index in rows)) for name in FEATURE_COLUMNS
+        },
+    )
+
+
+def test_backtest_year_trains_on_earlier_years_only():
+    history = _history(range(2000, 2004), candidates=50)
+
+    assert backtest_year(2000, [history.until(2000)]) == []
+    (result,) = backtest_year(2002, [history.until(2002)])
+    assert result["field"] == "Physics" and result["as_of_year"] == 2002
+    assert result["training_rows"] == 100
+    assert (result["candidate_count"], result["laureate_count"]) == (50, 1)
+    assert result["hits_at_10"] == 1
+    assert 0 < result["brier_score"] < 1
+
+
+def test_history_keeps_snapshots_with_known_outcomes():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    features = {name: 1 for name in FEATURE_COLUMNS}
+    with Session(engine) as session, session.begin():
+        session.execute(
+            insert(Candidate),
+            [
+                {"id": 1, "openalex_id": "W1", "full_name": "Open", "field": "Physics", "affiliation": "U"},
+                {"id": 2, "openalex_id": "W2", "full_name": "Winner", "field": "Physics", "affiliation": "U",
+                 "is_laureate": True, "laureate_year": 2021},
+                {"id": 3, "openalex_id": "W3", "full_name": "Undated", "field": "Physics", "affiliation": "U",
+                 "is_laureate": True},
+            ],
+        )
+        session.execute(
+            insert(FeatureSnapshot),
+            [
+                {"candidate_id": candidate_id, "as_of_year": year, **features}
+                for candidate_id in (1, 2, 3)
+                for year in (2020, 2021, 2022)
+            ],
+        )
+    with engine.connect() as connection:
+        rows = [(row.as_of_year, row.laureate_year) for row in connection.execute(history_statement())]
+    # Snapshots after an award, and laureates without an award year, have no usable outcome.
+    assert sorted(rows, key=lambda row: (row[0], row[1] or 0)) == [
+        (2020, None), (2020, 2021), (2021, None), (2021, 2021), (2022, None)
+    ]
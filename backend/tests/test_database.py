@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import Settings
+from app.core.database import build_async_read_engine, build_engine
+
+
+@pytest.fixture()
+def engines(tmp_path):
+    url = f"sqlite:///{tmp_path / 'tuned.db'}"
+    writer = build_engine(url, settings=Settings(storage_profile="tuned"))
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        connection.execute(text("INSERT INTO items (name) VALUES ('first')"))
+    reader = build_engine(url, settings=Settings(storage_profile="tuned"), read_only=True)
+    yield writer, reader
+    reader.dispose()
+    writer.dispose()
+
+
+def test_tuned_profile_applies_pragmas(engines):
+    writer, reader = engines
+    with writer.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert connection.exec_driver_sql("PRAGMA temp_store").scalar() == 2  # MEMORY
+    with reader.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5_000
+        with pytest.raises(OperationalError):
+            connection.execute(text("INSERT INTO items (name) VALUES ('blocked')"))
+
+
+def test_readers_see_the_last_commit_while_a_write_is_open(engines):
+    writer, reader = engines
+    with writer.connect() as write_connection:
+        transaction = write_connection.begin()
+        write_connection.execute(text("DELETE FROM items"))
+        write_connection.execute(text("INSERT INTO items (name) VALUES ('second')"))
+
+        with reader.connect() as read_connection:
+            assert read_connection.execute(text("SELECT name FROM items")).scalars().all() == ["first"]
+
+        transaction.commit()
+    with reader.connect() as read_connection:
+        assert read_connection.execute(text("SELECT name FROM items")).scalars().all() == ["second"]
+
+
+def test_async_reads_are_opt_in(tmp_path):
+    url = f"sqlite:///{tmp_path / 'tuned.db'}"
+    assert build_async_read_engine(url, settings=Settings()) is None
+    assert build_async_read_engine("sqlite://", settings=Settings(async_reads_enabled=True)) is None
+    engine = build_async_read_engine(url, settings=Settings(async_reads_enabled=True))
+    assert engine is not None and engine.url.drivername == "sqlite+aiosqlite"
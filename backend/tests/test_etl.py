@@ -0,0 +1,85 @@
+import sitecustomize  # noqa: F401
+
+import json
+import os
+
+import pytest
+from sqlalchemy import create_engine, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import db_session
+from app.flows.etl import _upsert_on_conflict, _upsert_prefetched, run_seed_etl
+from app.models.base import Base
+from app.models.nobel import Candidate, FeatureSnapshot
+from app.services.bootstrap import bootstrap_state
+from app.services.staging import feature_table_path
+
+settings = get_settings()
+
+
+def _record(openalex_id: str, citations: int) -> dict:
+    return {
+        "openalex_id": openalex_id,
+        "full_name": f"Candidate {openalex_id}",
+        "field": "Physics",
+        "affiliation": "Somewhere",
+        "features": {
+            "as_of_year": 2024,
+            "total_citations": citations,
+            "h_index": 10,
+            "recent_trend": 0.1,
+            "seminal_score": 0.5,
+            "award_count": 1,
+        },
+    }
+
+
+@pytest.mark.parametrize("upsert_batch", [_upsert_on_conflict, _upsert_prefetched])
+def test_bulk_upsert_is_idempotent(upsert_batch):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        upsert_batch(session, [_record("X1", 100), _record("X2", 200)])
+        upsert_batch(session, [_record("X2", 250), _record("X3", 300)])
+        session.commit()
+
+        assert session.scalar(select(func.count()).select_from(Candidate)) == 3
+        assert session.scalar(select(func.count()).select_from(FeatureSnapshot)) == 3
+        citations = session.scalar(
+            select(FeatureSnapshot.total_citations)
+            .join(Candidate, Candidate.id == FeatureSnapshot.candidate_id)
+            .where(Candidate.openalex_id == "X2")
+        )
+        assert citations == 250
+
+
+def test_etl_restages_a_deleted_feature_table():
+    bootstrap_state()
+    run_seed_etl()
+    table_path = feature_table_path("physics")
+    table_path.unlink()
+    run_seed_etl()
+    assert table_path.exists()
+
+
+def test_bootstrap_refreshes_outdated_seed_copies():
+    bootstrap_state()
+    copy = settings.data_dir / "seed" / "physics_candidates.json"
+    records = json.loads(copy.read_text(encoding="utf-8"))
+    laureate = next(record for record in records if record.get("laureate_year"))
+    # A copy made by an older release, before the seeds carried award years.
+    copy.write_text(json.dumps([{**record, "laureate_year": None} for record in records]), encoding="utf-8")
+    os.utime(copy, ns=(0, 0))
+    with db_session() as session:
+        session.execute(update(Candidate).values(laureate_year=None))
+
+    assert bootstrap_state() == [copy]
+    assert json.loads(copy.read_text(encoding="utf-8")) == records
+    assert bootstrap_state() == []
+    run_seed_etl()
+    with db_session() as session:
+        year = session.scalar(
+            select(Candidate.laureate_year).where(Candidate.openalex_id == laureate["openalex_id"])
+        )
+    assert year == laureate["laureate_year"]
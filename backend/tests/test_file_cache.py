@@ -0,0 +1,27 @@
+import os
+
+from app.utils.file_cache import FileCache
+
+
+def test_file_cache_parses_once_until_the_file_changes(tmp_path):
+    path = tmp_path / "metrics.json"
+    path.write_text("[1]", encoding="utf-8")
+    parsed = []
+
+    def parser(target):
+        parsed.append(target)
+        return target.read_text(encoding="utf-8")
+
+    cache = FileCache()
+    assert cache.load(path, parser) == "[1]"
+    assert cache.load(path, parser) == "[1]"
+    assert len(parsed) == 1
+
+    path.write_text("[1, 2]", encoding="utf-8")
+    assert cache.load(path, parser) == "[1, 2]"
+    # Same size, new mtime.
+    path.write_text("[3, 4]", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.load(path, parser) == "[3, 4]"
+    assert len(parsed) == 3
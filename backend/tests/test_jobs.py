@@ -0,0 +1,142 @@
+import sitecustomize  # noqa: F401
+
+import threading
+import time
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.services.bootstrap import bootstrap_state
+from app.services.job_service import JobQueue
+
+
+@pytest.fixture()
+def release():
+    bootstrap_state()
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def _echo_runner(release: threading.Event):
+    def run(params: dict, progress) -> dict:
+        progress("Physics", "started")
+        release.wait(10)
+        progress("Physics", "finished", rows=1)
+        return {"params": params}
+
+    return run
+
+
+def _wait(queue: JobQueue, job_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while (job := queue.get(job_id))["status"] not in ("succeeded", "failed") and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return job
+
+
+def test_identical_queued_requests_join_one_job(release):
+    queue = JobQueue(runners={"echo": _echo_runner(release)}, poll_interval=0.05)
+    params, other_params = {"run": uuid4().hex}, {"run": uuid4().hex}
+    first, first_joined = queue.submit("echo", params)
+    second, second_joined = queue.submit("echo", params)
+    other, _ = queue.submit("echo", other_params)
+    assert (first_joined, second_joined) == (False, True)
+    assert second["job_id"] == first["job_id"]
+    assert other["job_id"] != first["job_id"]
+
+    queue.start()
+    try:
+        while queue.get(first["job_id"])["status"] != "running":
+            time.sleep(0.02)
+        # A running job may have read its inputs already, so a new request queues another run.
+        third, third_joined = queue.submit("echo", params)
+        assert not third_joined and third["job_id"] != first["job_id"]
+        release.set()
+
+        job = _wait(queue, first["job_id"])
+        assert job["status"] == "succeeded"
+        assert job["result"] == {"params": params}
+        assert job["progress"]["Physics"]["status"] == "finished"
+        assert job["progress"]["Physics"]["rows"] == 1
+        assert job["queued_seconds"] >= 0 and job["run_seconds"] >= 0
+        assert _wait(queue, other["job_id"])["status"] == "succeeded"
+        assert _wait(queue, third["job_id"])["status"] == "succeeded"
+    finally:
+        queue.stop()
+
+
+def test_jobs_interrupted_by_a_restart_run_again(release):
+    release.set()
+    queue = JobQueue(runners={"echo": _echo_runner(release)}, poll_interval=0.05)
+    job, _ = queue.submit("echo", {"run": uuid4().hex})
+    # Simulate a process that stopped while the job was running.
+    queue._update(job["job_id"], status="running", progress={"Physics": {"status": "started"}})
+
+    queue.start()
+    try:
+        assert _wait(queue, job["job_id"])["status"] == "succeeded"
+    finally:
+        queue.stop()
+
+
+def test_failed_jobs_record_the_error(release):
+    def fail(params: dict, progress) -> dict:
+        raise RuntimeError("boom")
+
+    queue = JobQueue(runners={"fail": fail}, poll_interval=0.05)
+    job, _ = queue.submit("fail")
+    queue.start()
+    try:
+        finished = _wait(queue, job["job_id"])
+    finally:
+        queue.stop()
+    assert finished["status"] == "failed"
+    assert finished["error"] == "RuntimeError: boom"
+
+
+def test_worker_survives_database_errors(release, monkeypatch):
+    release.set()
+    queue = JobQueue(runners={"echo": _echo_runner(release)}, poll_interval=0.05)
+    job, _ = queue.submit("echo", {"run": uuid4().hex})
+    claim = queue._claim
+    failures = []
+
+    def flaky_claim():
+        if not failures:
+            failures.append(1)
+            raise OperationalError("UPDATE training_jobs", {}, Exception("database is locked"))
+        return claim()
+
+    monkeypatch.setattr(queue, "_claim", flaky_claim)
+    queue.start()
+    try:
+        assert _wait(queue, job["job_id"])["status"] == "succeeded"
+    finally:
+        queue.stop()
+    assert failures == [1]
+
+
+@pytest.mark.parametrize("failing_write", ["progress", "status"])
+def test_jobs_finish_when_a_job_row_write_fails(release, monkeypatch, failing_write):
+    release.set()
+    queue = JobQueue(runners={"echo": _echo_runner(release)}, poll_interval=0.05)
+    job, _ = queue.submit("echo", {"run": uuid4().hex})
+    update = queue._update
+    failures = []
+
+    def flaky_update(job_id: str, **values):
+        if failing_write in values and not failures:
+            failures.append(values)
+            raise OperationalError("UPDATE training_jobs", {}, Exception("database is locked"))
+        return update(job_id, **values)
+
+    monkeypatch.setattr(queue, "_update", flaky_update)
+    queue.start()
+    try:
+        finished = _wait(queue, job["job_id"])
+    finally:
+        queue.stop()
+    assert len(failures) == 1
+    assert finished["status"] == "succeeded" and finished["finished_at"] is not None
@@ -0,0 +1,129 @@
+import math
+import random
+from array import array
+
+import pandas as pd
+import pytest
+
+from app.flows import modeling
+from app.services.model_engine import CompiledScorer, TrainingConfig, fit_logistic_regression
+from app.utils import prefect_compat
+
+TRUE_COEFFICIENTS = {"citations": 0.0004, "trend": 6.0, "awards": -0.3}
+TRUE_INTERCEPT = -2.0
+
+
+def _synthetic(rows: int, seed: int = 3) -> tuple[dict[str, array], array]:
+    rng = random.Random(seed)
+    columns = {
+        "citations": array("d", (rng.uniform(0, 10_000) for _ in range(rows))),
+        "trend": array("d", (rng.gauss(0.1, 0.3) for _ in range(rows))),
+        "awards": array("d", (rng.randint(0, 8) for _ in range(rows))),
+    }
+    labels = array("d")
+    for index in range(rows):
+        score = TRUE_INTERCEPT + sum(weight * columns[name][index] for name, weight in TRUE_COEFFICIENTS.items())
+        labels.append(1.0 if rng.random() < 1 / (1 + math.exp(-score)) else 0.0)
+    # Sorted by label, so mini-batches only mix classes if rows are scrambled.
+    order = sorted(range(rows), key=labels.__getitem__)
+    return {name: array("d", (column[index] for index in order)) for name, column in columns.items()}, array(
+        "d", (labels[index] for index in order)
+    )
+
+
+def test_fit_recovers_coefficients_in_raw_units():
+    columns, labels = _synthetic(40_000)
+    model = fit_logistic_regression(columns, labels, TrainingConfig(l2=0.0))
+
+    for name, expected in TRUE_COEFFICIENTS.items():
+        assert model.coefficients[name] == pytest.approx(expected, rel=0.15)
+    assert model.intercept == pytest.approx(TRUE_INTERCEPT, rel=0.15)
+    assert model.stopped_early and len(model.epochs) < TrainingConfig().max_epochs
+    assert all(epoch.loss_split == "validation" and epoch.rows_per_second > 0 for epoch in model.epochs)
+
+    # Scoring standardized inputs and the raw-unit coefficients agree.
+    row = {name: [column[0]] for name, column in columns.items()}
+    raw_score = model.intercept + sum(model.coefficients[name] * row[name][0] for name in row)
+    assert model.predict_proba(row)[0] == pytest.approx(1 / (1 + math.exp(-raw_score)))
+
+
+def test_l2_shrinks_weights():
+    columns, labels = _synthetic(5_000)
+    loose = fit_logistic_regression(columns, labels, TrainingConfig(l2=0.0))
+    strict = fit_logistic_regression(columns, labels, TrainingConfig(l2=0.5))
+    assert sum(map(abs, strict.weights)) < sum(map(abs, loose.weights))
+
+
+def test_tiny_tables_train_on_the_training_loss():
+    model = fit_logistic_regression(
+        {"citations": [100.0, 200.0, 300.0], "awards": [1.0, 1.0, 1.0]}, [0.0, 0.0, 1.0]
+    )
+    assert {epoch.loss_split for epoch in model.epochs} == {"train"}
+    assert model.coefficients["citations"] > 0
+    # A constant column carries no signal.
+    assert model.coefficients["awards"] == 0.0
+    serialized = model.to_dict()
+    assert serialized["type"] == "logistic_regression" and serialized["training"]["epochs"]
+
+
+def test_fit_rejects_an_empty_table():
+    with pytest.raises(ValueError):
+        fit_logistic_regression({"citations": []}, [])
+
+
+def test_compiled_scorer_matches_the_fitted_model():
+    columns, labels = _synthetic(2_000)
+    model = fit_logistic_regression(columns, labels)
+    serialized = model.to_dict()
+    scorer = CompiledScorer(serialized)
+
+    assert scorer.features == tuple(columns) and scorer.version == serialized["version"]
+    assert list(scorer.score(columns)) == pytest.approx(list(model.predict_proba(columns)))
+    # Extreme logits saturate instead of overflowing.
+    assert list(scorer.score({"citations": [-1e9], "trend": [0.0], "awards": [0.0]})) == pytest.approx([0.0])
+    with pytest.raises(ValueError):
+        scorer.score({"citations": [1.0]})
+
+
+def test_attributions_are_exact_linear_shap_values():
+    columns, labels = _synthetic(2_000)
+    model = fit_logistic_regression(columns, labels).to_dict()
+    scorer = CompiledScorer(model)
+    values, probabilities, attributions = scorer.explain(columns)
+
+    background = model["standardization"]["means"]
+    base_logit = model["intercept"] + sum(model["coefficients"][name] * background[name] for name in background)
+    assert list(probabilities) == pytest.approx(list(scorer.score(columns)))
+    for index in (0, 999, 1_999):
+        # The attributions add up to the row's logit minus the logit at the background mean.
+        logit = math.log(probabilities[index] / (1 - probabilities[index]))
+        assert sum(attributions[name][index] for name in scorer.features) == pytest.approx(logit - base_logit)
+        assert values["trend"][index] == columns["trend"][index]
+
+
+def test_trained_models_are_refitted_when_the_trainer_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(prefect_compat, "_result_cache", prefect_compat.ResultCache(tmp_path, max_bytes=10**7))
+    fits = []
+
+    def counting_fit(*args):
+        fits.append(args[-1])
+        return fit_logistic_regression(*args)
+
+    monkeypatch.setattr(modeling, "fit_logistic_regression", counting_fit)
+    rng = random.Random(1)
+    table = pd.DataFrame(
+        [
+            {**{name: rng.random() for name in modeling.FEATURE_COLUMNS}, "is_laureate": index % 5 == 0}
+            for index in range(50)
+        ]
+    )
+
+    modeling.train_logistic_model(table)
+    modeling.train_logistic_model(table)
+    assert len(fits) == 1
+
+    monkeypatch.setattr(modeling, "TRAINER_VERSION", "logistic-test")
+    modeling.train_logistic_model(table)
+    monkeypatch.setattr(modeling, "TRAINING_CONFIG", TrainingConfig(max_epochs=3))
+    modeling.train_logistic_model(table)
+    assert len(fits) == 3 and fits[-1].max_epochs == 3
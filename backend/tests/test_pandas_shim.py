@@ -0,0 +1,102 @@
+from array import array
+
+import pandas as pd
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {"name": "a", "score": 1.5, "count": 3},
+            {"name": "b", "score": 2.5, "count": 4},
+            {"name": "c", "score": 3.5, "count": 5, "extra": True},
+        ]
+    )
+
+
+def test_columns_are_stored_as_typed_buffers():
+    df = _frame()
+    assert df.columns == ["name", "score", "count", "extra"]
+    assert isinstance(df._data["score"], array) and df._data["score"].typecode == "d"
+    assert isinstance(df._data["count"], array) and df._data["count"].typecode == "q"
+    assert df["score"]._values is df._data["score"]
+    assert df["extra"].tolist() == [None, None, True]
+
+
+def test_mask_and_copy_do_not_leak_mutations():
+    df = _frame()
+    filtered = df[df["count"] >= 4]
+    assert len(filtered) == 2
+    assert filtered["name"].tolist() == ["b", "c"]
+
+    clone = df.copy()
+    series = clone["score"]
+    series[0] = 10.0
+    clone["score"] = series
+    assert df["score"].tolist() == [1.5, 2.5, 3.5]
+    assert clone["score"].tolist() == [10.0, 2.5, 3.5]
+
+
+def test_rows_are_materialized_only_on_export():
+    df = _frame()
+    df["flag"] = "x"
+    records = df.to_dict(orient="records")
+    # Like pandas' record input, keys a source record lacked are left out again.
+    assert records[1] == {"name": "b", "score": 2.5, "count": 4, "flag": "x"}
+    assert records[2]["extra"] is True
+    assert df[df["count"] >= 4].to_dict()[0] == {"name": "b", "score": 2.5, "count": 4, "flag": "x"}
+    rows = [row["name"] for _, row in df.iterrows()]
+    assert rows == ["a", "b", "c"]
+
+
+def test_int_columns_round_trip_unchanged():
+    df = pd.DataFrame([{"count": 3, "mixed": 1}, {"count": 4, "mixed": 2.5}])
+    assert df._data["count"].typecode == "q"
+    records = df.to_dict()
+    assert records == [{"count": 3, "mixed": 1}, {"count": 4, "mixed": 2.5}]
+    assert [type(record["count"]) for record in records] == [int, int]
+    assert type(records[0]["mixed"]) is int
+
+
+def test_kernels_broadcast_scalars_and_fuse_expressions():
+    df = _frame()
+    scaled = df["count"] * 0.5 + 1
+    assert scaled.tolist() == [2.5, 3.0, 3.5]
+    df["scaled"] = scaled
+    assert df._data["scaled"].typecode == "d"
+    assert (2 - df["count"]).tolist() == [-1, -2, -3]
+
+    fused = df.eval("score * w + count", w=2)
+    assert fused.tolist() == [6.0, 9.0, 12.0]
+    assert pd.eval("x / 2", {"x": df["count"]}).tolist() == [1.5, 2.0, 2.5]
+
+
+def test_read_csv_with_schema_usecols_and_chunks(tmp_path):
+    path = tmp_path / "table.csv"
+    path.write_text("id,score,count,flag\na,1.5,3,True\nb,,4,False\nc,3.5,5,\n", encoding="utf-8")
+
+    df = pd.read_csv(path, dtype={"score": float, "count": "int64", "flag": bool}, usecols=["count", "score", "flag"])
+    assert df.columns == ["score", "count", "flag"]
+    assert df["score"].tolist() == [1.5, None, 3.5]
+    assert df._data["count"].typecode == "q"
+    assert df["flag"].tolist() == [True, False, None]
+
+    with pd.read_csv(path, dtype={"count": int}, chunksize=2) as reader:
+        assert reader.columns == ["id", "score", "count", "flag"]
+        sizes = [len(chunk) for chunk in reader]
+    assert sizes == [2, 1]
+
+
+def test_columnar_round_trip_keeps_typed_buffers(tmp_path):
+    path = tmp_path / "table.npcol"
+    _frame().to_columnar(path)
+
+    restored = pd.read_columnar(path)
+    # Like a CSV file, the table stores every column of every row; missing keys come back as None.
+    assert restored.to_dict(orient="records") == [
+        {"extra": None, **record} for record in _frame().to_dict(orient="records")
+    ]
+    assert restored._data["score"].typecode == "d"
+    assert restored._data["count"].typecode == "q"
+
+    subset = pd.read_columnar(path, columns=["count"])
+    assert subset.columns == ["count"] and len(subset) == 3
@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+from datetime import timedelta
+
+import pytest
+
+from app.core.config import Settings
+from app.utils import prefect_compat
+from app.flows.etl import load_seed_candidates
+from app.utils.prefect_compat import (
+    ConcurrentTaskRunner,
+    ProcessPoolTaskRunner,
+    ResultCache,
+    flow,
+    task,
+    task_input_hash,
+    task_runner_for,
+    unmapped,
+)
+
+
+@pytest.fixture()
+def cache(tmp_path, monkeypatch) -> ResultCache:
+    result_cache = ResultCache(tmp_path / "cache", max_bytes=10_000)
+    monkeypatch.setattr(prefect_compat, "_result_cache", result_cache)
+    return result_cache
+
+
+def test_cached_task_rehashes_file_inputs_by_content(cache, tmp_path):
+    calls = []
+
+    @task(cache_key_fn=task_input_hash, cache_expiration=timedelta(hours=1))
+    def read_size(path):
+        calls.append(path)
+        return len(path.read_text())
+
+    source = tmp_path / "seed.json"
+    source.write_text("[1, 2]")
+    assert read_size(source) == 6
+    assert read_size(source) == 6
+    assert len(calls) == 1
+
+    source.write_text("[1, 2, 3]")
+    assert read_size(source) == 9
+    assert len(calls) == 2
+
+
+def test_tasks_given_a_missing_path_are_not_cached(cache, tmp_path):
+    calls = []
+
+    @task(cache_key_fn=task_input_hash, cache_expiration=timedelta(hours=1))
+    def write(path):
+        calls.append(path)
+        path.write_text("staged")
+        return path
+
+    target = tmp_path / "table.npcol"
+    write(target)
+    target.unlink()
+    write(target)
+    assert len(calls) == 2 and target.read_text() == "staged"
+
+
+def test_result_cache_expires_and_evicts_least_recently_used(cache):
+    cache.set("expired", "value")
+    assert cache.get("expired", timedelta(seconds=-1)) == (False, None)
+
+    cache.set("a", "x" * 4_000)
+    cache.set("b", "y" * 4_000)
+    os.utime(cache._entry_path("a"), (1_000, 1_000))
+    os.utime(cache._entry_path("b"), (2_000, 2_000))
+    assert cache.get("a", None)[0]
+    cache.set("c", "z" * 4_000)
+    assert cache.get("a", None)[0]
+    assert cache.get("b", None) == (False, None)
+
+
+def test_map_runs_on_the_flow_task_runner_and_keeps_order():
+    threads = set()
+
+    @task
+    def scale(value, factor):
+        threads.add(threading.current_thread().name)
+        return value * factor
+
+    @flow(task_runner=ConcurrentTaskRunner(max_workers=4))
+    def run():
+        return [future.result() for future in scale.map(range(8), unmapped(3))]
+
+    assert run() == [value * 3 for value in range(8)]
+    assert all(name.startswith("task-runner") for name in threads)
+    assert scale.submit(2, 5).result() == 10
+
+
+def test_process_pool_runner_executes_module_level_tasks(tmp_path, monkeypatch):
+    monkeypatch.setenv("TASK_CACHE_ENABLED", "false")
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"seed_{index}.json"
+        path.write_text(json.dumps([{"index": index}]))
+        paths.append(path)
+
+    @flow(task_runner=ProcessPoolTaskRunner(max_workers=2))
+    def run():
+        return [future.result() for future in load_seed_candidates.map(paths)]
+
+    assert run() == [[{"index": 0}], [{"index": 1}], [{"index": 2}]]
+
+
+def test_training_defaults_to_processes_and_etl_to_threads(monkeypatch):
+    monkeypatch.delenv("TRAINING_TASK_RUNNER", raising=False)
+    monkeypatch.delenv("ETL_TASK_RUNNER", raising=False)
+    settings = Settings()
+    assert isinstance(task_runner_for(settings.training_task_runner), ProcessPoolTaskRunner)
+    assert isinstance(task_runner_for(settings.etl_task_runner), ConcurrentTaskRunner)
@@ -0,0 +1,55 @@
+import re
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.flows.etl import candidate_ids_statement, snapshot_ids_statement
+from app.flows.modeling import prediction_delete_statements
+from app.models import jobs, nobel  # noqa: F401
+from app.models.base import Base
+from app.services.job_service import next_job_statement
+from app.services.prediction_service import (
+    backtest_summary_statement,
+    candidate_statement,
+    encode_cursor,
+    latest_snapshot_statement,
+    provenance_statement,
+    shortlist_statement,
+)
+
+TABLES = set(Base.metadata.tables)
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+STATEMENTS = {
+    "shortlist": shortlist_statement("Physics", "one_year"),
+    "shortlist_next_page": shortlist_statement("Physics", "one_year", cursor=encode_cursor(0.5, 10)),
+    "report_page": shortlist_statement("Physics", "one_year", limit=1000, with_attributions=False),
+    "candidate": candidate_statement(1),
+    "latest_snapshot": latest_snapshot_statement(1),
+    "provenance": provenance_statement("W1"),
+    "etl_candidate_ids": candidate_ids_statement(["W1", "W2"]),
+    "etl_snapshot_ids": snapshot_ids_statement([(1, 2024), (2, 2024)]),
+    "next_training_job": next_job_statement(),
+    "backtest_summary": backtest_summary_statement("Physics"),
+    **{
+        f"scoped_delete_{index}": statement
+        for index, statement in enumerate(prediction_delete_statements(["Physics", "Peace"]))
+    },
+}
+
+
+@pytest.mark.parametrize("name", sorted(STATEMENTS))
+def test_service_queries_do_not_scan_tables(engine, name):
+    sql = str(STATEMENTS[name].compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as connection:
+        plan = [row.detail for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+    scans = [detail for detail in plan if (match := FULL_SCAN.match(detail)) and match.group(1) in TABLES]
+    assert not scans, f"{name} scans {scans}:\n" + "\n".join(plan)
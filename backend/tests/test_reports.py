@@ -0,0 +1,89 @@
+import io
+import re
+import tracemalloc
+import zlib
+
+import pytest
+
+from app.reports.generators import StreamingPdfWriter
+
+OBJECT = re.compile(rb"(\d+) 0 obj\n")
+
+
+def _parse(pdf: bytes) -> tuple[dict[int, bytes], dict[int, int]]:
+    """Check the xref table against the file and return object bodies and offsets by number."""
+    assert pdf.startswith(b"%PDF-1.4\n") and pdf.endswith(b"%%EOF\n")
+    xref_start = int(pdf.rsplit(b"startxref\n", 1)[1].split(b"\n", 1)[0])
+    assert pdf[xref_start:].startswith(b"xref\n")
+    header, *entries = pdf[xref_start:].split(b"trailer", 1)[0].splitlines()[1:]
+    first, size = map(int, header.split())
+    assert (first, size) == (0, len(entries))
+    offsets = {number: int(entry[:10]) for number, entry in enumerate(entries) if number}
+    objects = {}
+    for number, offset in offsets.items():
+        match = OBJECT.match(pdf, offset)
+        assert match and int(match.group(1)) == number
+        objects[number] = pdf[match.end() : pdf.index(b"\nendobj\n", offset)]
+    return objects, offsets
+
+
+def _page_texts(objects: dict[int, bytes], compressed: bool) -> list[bytes]:
+    pages = re.search(rb"/Kids \[([^\]]*)\] /Count (\d+)", objects[2])
+    kids = [int(number) for number in re.findall(rb"(\d+) 0 R", pages.group(1))]
+    assert len(kids) == int(pages.group(2))
+    texts = []
+    for kid in kids:
+        contents = int(re.search(rb"/Contents (\d+) 0 R", objects[kid]).group(1))
+        dictionary, stream = objects[contents].split(b"\nstream\n", 1)
+        stream = stream.removesuffix(b"\nendstream")
+        assert int(re.search(rb"/Length (\d+)", dictionary).group(1)) == len(stream)
+        texts.append(zlib.decompress(stream) if compressed else stream)
+    return texts
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_pdf_writer_paginates_and_records_offsets(compress: bool):
+    buffer = io.BytesIO()
+    with StreamingPdfWriter(buffer, title="Shortlist (Physics)", compress=compress) as pdf:
+        per_page = pdf.lines_per_page
+        for index in range(per_page * 2 + 5):
+            pdf.add_line(f"#{index + 1} Candidate {index} — Lab")
+
+    objects, _ = _parse(buffer.getvalue())
+    texts = _page_texts(objects, compress)
+    assert len(texts) == 3
+    assert all(b"(Shortlist \\(Physics\\)) Tj" in text for text in texts)
+    assert texts[0].count(b" Tm (#") == per_page and texts[2].count(b" Tm (#") == 5
+    assert b"(#1 Candidate 0 \x97 Lab) Tj" in texts[0]
+    assert b"(Page 3) Tj" in texts[2]
+    # Every line stays inside the page.
+    positions = [int(y) for text in texts for y in re.findall(rb"1 0 0 1 50 (\d+) Tm", text)]
+    assert min(positions) >= StreamingPdfWriter.FOOTER and max(positions) <= StreamingPdfWriter.TOP
+
+
+def test_pdf_writer_emits_one_page_when_empty():
+    buffer = io.BytesIO()
+    StreamingPdfWriter(buffer).close()
+    objects, _ = _parse(buffer.getvalue())
+    assert len(_page_texts(objects, compressed=True)) == 1
+
+
+class _Sink(io.RawIOBase):
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        return len(data)
+
+
+def test_pdf_writer_memory_does_not_grow_with_the_text():
+    tracemalloc.start()
+    try:
+        with StreamingPdfWriter(_Sink(), title="Shortlist") as pdf:
+            for index in range(100_000):
+                pdf.add_line(f"#{index + 1} {'Candidate name ' * 4} — {'Affiliation ' * 4} — P(win)=0.123")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # About 14 MB of text; only per-page state and offsets are kept.
+    assert peak < 2 * 1024 * 1024